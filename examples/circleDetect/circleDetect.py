@@ -1,4 +1,5 @@
 from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+from lib_rover.rover_lib.modules.vision.circleTracker import CircleTracker
 from lib_rover.rover_lib.modules.camera.webcam import Webcam
 from lib_rover.rover_lib.modules.camera.cameraModule import CameraModule
 import cv2 as openCv
@@ -30,15 +31,6 @@ def circleVoting(hough, contorno):
     # Se a discordancia for alta, retorna o metodo mais seguro
     return contorno
     
-def inInterval(last, current, LIMIAR):
-    # a e b são tuplas/listas (x, y, r)
-    if current is None:
-        return False
-    for i in range(3):
-        if abs(last[i] - current[i]) > LIMIAR:
-            return False
-    return True
-
 def smoothDetect():
     HEIGHT = 640
     WIDTH = 640
@@ -49,11 +41,8 @@ def smoothDetect():
     except:
         camera = Webcam(HEIGHT, WIDTH)
 
-    circleHistory = None  # média acumulada
-    cont = 0
-    LIMIAR = 20  # tolerância para considerar mesma bola
     NO_DET_LIMIT = 20  # número máximo de frames sem detecção
-    noDetCounter = 0
+    tracker = CircleTracker(max_misses=NO_DET_LIMIT)  # filtro de Kalman sobre (x, y, r)
     
     while True:
         frame = camera.get_frame()
@@ -73,31 +62,12 @@ def smoothDetect():
         else:
             det = None
 
-        if det is not None:
-            noDetCounter = 0  # reset contador de frames sem detecção
-
-            if circleHistory is None or not inInterval(det, circleHistory, LIMIAR):
-                circleHistory = list(det)  # converte tupla para lista
-                cont = 1
-            else:
-                # acumula valores
-                circleHistory[0] += det[0]
-                circleHistory[1] += det[1]
-                circleHistory[2] += det[2]
-                cont += 1
-        else:
-            noDetCounter += 1
-            # se muitos frames sem detecção, zera histórico
-            if noDetCounter >= NO_DET_LIMIT:
-                circleHistory = None
-                cont = 0
+        # estimativa filtrada, None depois de NO_DET_LIMIT frames sem detecção
+        circle = tracker.update(det)
 
         txt = "Nenhum circulo detectado"
-        if circleHistory and cont > 0:
-            # calcula média real
-            x = circleHistory[0] // cont
-            y = circleHistory[1] // cont
-            r = circleHistory[2] // cont
+        if circle is not None:
+            x, y, r = circle
             openCv.circle(frame, (x, y), r, (0, 255, 0), 3)
             openCv.circle(frame, (x, y), 3, (0, 255, 255), -1)
             txt = f"X={x}  Y={y}  R={r}"
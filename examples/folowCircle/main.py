@@ -1,10 +1,13 @@
 from lib_rover.rover_lib.modules.movement.robot import Robot
 from lib_rover.rover_lib.utils.config_manager import Config
 from lib_rover.rover_lib.modules.processing.processing_image import ProcessingImage
+from lib_rover.rover_lib.modules.processing.frameContext import FrameContext
 from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+from lib_rover.rover_lib.modules.vision.circleSearch import CircleSearchWindow
+from lib_rover.rover_lib.modules.vision.circleTracker import CircleTracker
 from lib_rover.rover_lib.modules.camera.cameraModule import CameraModule
 from lib_rover.rover_lib.modules.camera.webcam import Webcam
-from ..circleDetect.circleDetect import circleVoting, inInterval
+from ..circleDetect.circleDetect import circleVoting
 import time
 import cv2 as openCv
 
@@ -25,11 +28,8 @@ if __name__ == "__main__":
     except:
         picam = Webcam(HEIGHT, WIDTH)
 
-    circleHistory = None  # média acumulada, para suavizar as mudanças de posição do circulo
-    counterHistory = 0 # Quantidade de frames acumulados
-    LIMIAR = 40  # tolerância para considerar mesma circuferencia
     NO_DET_LIMIT = 10  # número máximo de frames sem detecção
-    noDetCounter = 0 # contador para quantidade de frames sem detecção
+    tracker = CircleTracker(max_misses=NO_DET_LIMIT) # Suaviza e prevê a posição do circulo (filtro de Kalman)
 
     # Carrega configuração da gpio
     pins_motors = Config.get("gpio")
@@ -42,12 +42,18 @@ if __name__ == "__main__":
     # Centro do frame no eixo x
     x_center = WIDTH // 2
 
+    ctx = FrameContext() # Representações do frame reaproveitadas pela segmentação
+    search = CircleSearchWindow(tracker, (WIDTH, HEIGHT)) # Com a bola travada, procura só em volta da posição prevista
+
     # Loop principal de movimento
     while True:
         frame = picam.get_frame() # carrega frame
-        mask = ProcessingImage.color_dual_segmentation(frame) # Aplica segmentação
-        hough, _ = VisionModule.houghCircleDetect(mask) # Detecção via houghTransform
-        contorno = VisionModule.circleCannyDetect(mask) # Detecção, por meio das bordas e circularidade
+        ctx.update(frame)
+        mask = ProcessingImage.color_dual_segmentation(frame, ctx=ctx) # Aplica segmentação
+        tracker.predict() # Posição prevista da bola neste frame (filtro de Kalman)
+        roi = search.roi() # Recorte em volta da previsão, ou None para o frame inteiro
+        hough, _ = VisionModule.houghCircleDetect(mask, roi=roi) # Detecção via houghTransform
+        contorno = VisionModule.circleCannyDetect(mask, roi=roi) # Detecção, por meio das bordas e circularidade
 
         # escolhe a melhor detecção entre hough e canny
         if hough is not None and contorno is not None:
@@ -59,32 +65,15 @@ if __name__ == "__main__":
         else:
             det = None
 
-        if det is not None:
-            noDetCounter = 0  # reset contador de frames sem detecção
-
-            # Verifica a discrepancia na posição do circulo atual com os alteriores
-            if circleHistory is None or not inInterval(det, circleHistory, LIMIAR):
-                circleHistory = list(det) # Pega os dados do circulo
-                counterHistory = 1
-            else: # Incrementa a media acumulativa
-                circleHistory[0] += det[0]
-                circleHistory[1] += det[1]
-                circleHistory[2] += det[2]
-                counterHistory += 1
-                
-            last_circle = circleHistory # captura o ultimo ciculo
-
-        else:
-            noDetCounter += 1
-            if noDetCounter >= NO_DET_LIMIT:
-                circleHistory = None
-                counterHistory = 0
+        # Estimativa filtrada; sem detecção fica só a previsão, e detecções longe dela (outra bola, reflexo)
+        # contam como falha
+        circle = tracker.correct(det)
+        if circle is not None:
+            last_circle = circle # captura o ultimo ciculo
 
         txt = "Nenhum circulo detectado"
-        if circleHistory and counterHistory > 0:
-            x = circleHistory[0] // counterHistory
-            y = circleHistory[1] // counterHistory
-            r = circleHistory[2] // counterHistory
+        if circle is not None:
+            x, y, r = circle
             openCv.circle(frame, (x, y), r, (0, 255, 0), 3)
             openCv.circle(frame, (x, y), 3, (0, 255, 255), -1)
             txt = f"X={x}  Y={y}  R={r}"
@@ -99,7 +88,7 @@ if __name__ == "__main__":
         # calcula a quantidade de vermelho na cena
         red_area = openCv.countNonZero(mask)
 
-        if circleHistory is None:
+        if circle is None:
             print(f"Area vermelha: {red_area}")
             if red_area >= RED_THRES_LOW and RED_THRES_UPPER > red_area: # Chegou perto o suficiente da bola
                 robot.stop()
@@ -114,7 +103,7 @@ if __name__ == "__main__":
                 robot.move(-60, 60)  # rotaciona procurando um círculo
 
         else:
-            x, y, r = circleHistory
+            x, y, r = circle
             if x > x_center + CENTER_THRES:
                 robot.move(60, -60)
             elif x < x_center - CENTER_THRES:
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import cv2
+import numpy as np
+from ...utils.npcache import load_or_build
+
+# Diretório padrão do cache dos mapas de correção em disco
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "rover_lib", "undistort")
+
+# Versão do formato dos mapas (muda a chave do cache quando a construção muda)
+_MAPS_VERSION = 1
+
+
+class CameraCalibration:
+    """
+    Parâmetros intrínsecos (matriz K) e coeficientes de distorção da lente, obtidos uma única vez, offline,
+    a partir de fotos de um tabuleiro de xadrez (ver scripts_tests/camera/calibrar_camera.py).
+    """
+
+    def __init__(self, camera_matrix, dist_coeffs, resolution, rms=None):
+        """
+        Args:
+            camera_matrix (numpy array): Matriz intrínseca K (3x3).
+            dist_coeffs (numpy array): Coeficientes de distorção (k1, k2, p1, p2, k3, ...).
+            resolution (tuple): Resolução (largura, altura) das imagens da calibração.
+            rms (float, optional): Erro de reprojeção da calibração em pixels. Defaults to None.
+        """
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64).reshape(3, 3)
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64).ravel()
+        self.resolution = (int(resolution[0]), int(resolution[1]))
+        self.rms = rms
+
+    @classmethod
+    def from_checkerboard(cls, images, pattern_size=(9, 6), square_size=0.025):
+        """
+        Calibra a câmera com fotos de um tabuleiro de xadrez em posições e inclinações variadas.
+
+        Args:
+            images (list): Imagens BGR ou caminhos de arquivo, todas com a mesma resolução.
+            pattern_size (tuple, optional): Cantos internos do tabuleiro (colunas, linhas). Defaults to (9, 6).
+            square_size (float, optional): Lado de um quadrado em metros. Defaults to 0.025.
+
+        Returns:
+            CameraCalibration: Calibração obtida.
+        """
+        # Coordenadas dos cantos no plano do tabuleiro
+        board = np.zeros((pattern_size[0] * pattern_size[1], 3), np.float32)
+        board[:, :2] = np.mgrid[0:pattern_size[0], 0:pattern_size[1]].T.reshape(-1, 2) * square_size
+
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+        object_points, image_points = [], []
+        resolution = None
+
+        for image in images:
+            if isinstance(image, (str, os.PathLike)):
+                image = cv2.imread(str(image))
+                if image is None:
+                    continue
+
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+            size = (gray.shape[1], gray.shape[0])
+            if resolution is None:
+                resolution = size
+            elif size != resolution:
+                raise ValueError(f"Imagem {size[0]}x{size[1]} diferente das anteriores ({resolution[0]}x{resolution[1]})")
+
+            found, corners = cv2.findChessboardCorners(gray, pattern_size)
+            if not found:
+                continue
+
+            corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
+            object_points.append(board)
+            image_points.append(corners)
+
+        if len(image_points) < 3:
+            raise ValueError(f"Tabuleiro encontrado em {len(image_points)} imagens, são necessárias pelo menos 3")
+
+        rms, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(object_points, image_points, resolution, None, None)
+        return cls(camera_matrix, dist_coeffs, resolution, rms)
+
+    @classmethod
+    def load(cls, path):
+        """Carrega uma calibração salva com save."""
+        with np.load(path) as data:
+            rms = float(data["rms"]) if "rms" in data else None
+            return cls(data["camera_matrix"], data["dist_coeffs"], tuple(data["resolution"]), rms)
+
+    def save(self, path):
+        """Salva a calibração em um arquivo .npz."""
+        extra = {} if self.rms is None else {"rms": self.rms}
+        np.savez(path, camera_matrix=self.camera_matrix, dist_coeffs=self.dist_coeffs,
+                 resolution=np.array(self.resolution), **extra)
+
+    def scaled(self, resolution):
+        """
+        Retorna a calibração para outra resolução do mesmo sensor (mesmo campo de visão, ex: 1280x960 -> 640x480).
+        A distorção, em coordenadas normalizadas, não muda.
+        """
+        resolution = (int(resolution[0]), int(resolution[1]))
+        if resolution == self.resolution:
+            return self
+
+        sx = resolution[0] / self.resolution[0]
+        sy = resolution[1] / self.resolution[1]
+        camera_matrix = self.camera_matrix.copy()
+        camera_matrix[0] *= sx
+        camera_matrix[1] *= sy
+        return CameraCalibration(camera_matrix, self.dist_coeffs, resolution, self.rms)
+
+
+class Undistorter:
+    """
+    Corrige a distorção da lente com um único remap por frame.
+
+    As tabelas do remap (CV_16SC2, ponto fixo) são calculadas uma vez por resolução e guardadas em um .npz
+    no cache; nas execuções seguintes são apenas carregadas. Opcionalmente só as linhas a partir de
+    roi_start_y são geradas, para quem usa apenas a faixa inferior da imagem.
+    """
+
+    def __init__(self, calibration, resolution, alpha=0.0, roi_start_y=0, input_start_y=0, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Args:
+            calibration (CameraCalibration | str): Calibração ou caminho do .npz salvo com CameraCalibration.save.
+            resolution (tuple): Resolução (largura, altura) do frame completo.
+            alpha (float, optional): 0 recorta as bordas sem imagem após a correção, 1 mantém todos os pixels da
+                                     imagem original. Defaults to 0.0.
+            roi_start_y (int, optional): Primeira linha (do frame completo) gerada na saída. Defaults to 0.
+            input_start_y (int, optional): Primeira linha do frame completo presente na entrada, quando a câmera
+                                           já entrega só uma faixa (recorte no sensor). Defaults to 0.
+            cache_dir (str, optional): Diretório do cache das tabelas. None desabilita o cache.
+                                       Defaults to ~/.cache/rover_lib/undistort.
+        """
+        if not isinstance(calibration, CameraCalibration):
+            calibration = CameraCalibration.load(calibration)
+
+        self.resolution = (int(resolution[0]), int(resolution[1]))
+        self.calibration = calibration.scaled(self.resolution)
+        self.alpha = float(alpha)
+        self.roi_start_y = int(roi_start_y)
+        self.input_start_y = int(input_start_y)
+
+        # Matriz da imagem corrigida (usar com a BirdEyeView sem calibração, pois a distorção já foi removida)
+        self.new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(
+            self.calibration.camera_matrix, self.calibration.dist_coeffs, self.resolution, self.alpha
+        )
+
+        self.map1, self.map2 = self._load_or_build(cache_dir)
+        self._output = None
+
+    def cache_key(self):
+        """Nome do arquivo das tabelas: resolução, faixa e hash da calibração."""
+        digest = hashlib.sha1()
+        digest.update(repr((_MAPS_VERSION, self.alpha)).encode())
+        digest.update(self.calibration.camera_matrix.tobytes())
+        digest.update(self.calibration.dist_coeffs.tobytes())
+        width, height = self.resolution
+        return f"{width}x{height}_{self.roi_start_y}_{self.input_start_y}_{digest.hexdigest()[:16]}"
+
+    def _load_or_build(self, cache_dir):
+        """Carrega as tabelas do cache em disco ou as calcula (e grava no cache)"""
+        path = None if cache_dir is None else os.path.join(cache_dir, f"{self.cache_key()}.npz")
+        return load_or_build(path, self.build_maps, lambda maps: len(maps) == 2)
+
+    def build_maps(self):
+        """
+        Calcula as tabelas do remap.
+
+        Returns:
+            tuple: (map1, map2) nos formatos CV_16SC2 e CV_16UC1, com as linhas de roi_start_y em diante
+                   e coordenadas de origem relativas à faixa de entrada.
+        """
+        map_x, map_y = cv2.initUndistortRectifyMap(
+            self.calibration.camera_matrix, self.calibration.dist_coeffs, None,
+            self.new_camera_matrix, self.resolution, cv2.CV_32FC1
+        )
+
+        map_x = map_x[self.roi_start_y:]
+        map_y = map_y[self.roi_start_y:] - self.input_start_y
+
+        return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+    def input_top(self):
+        """Primeira linha do frame completo lida pelo remap: a faixa de entrada precisa começar nela ou antes."""
+        return max(0, int(self.map1[..., 1].min()) + self.input_start_y)
+
+    def set_input_start(self, input_start_y):
+        """
+        Ajusta as tabelas para uma entrada que começa na linha input_start_y do frame completo, sem recalculá-las.
+
+        Args:
+            input_start_y (int): Nova primeira linha do frame completo presente na entrada.
+        """
+        input_start_y = int(input_start_y)
+        self.map1[..., 1] -= input_start_y - self.input_start_y
+        self.input_start_y = input_start_y
+
+    def apply(self, frame, dst=None, reuse=True):
+        """
+        Corrige a distorção do frame.
+
+        Args:
+            frame (numpy array): Frame completo, ou a faixa a partir de input_start_y.
+            dst (numpy array, optional): Buffer de saída, usado se tiver o formato certo. Defaults to None.
+            reuse (bool, optional): Sem dst compatível, escreve em um buffer interno reaproveitado (válido até a
+                                    próxima chamada) em vez de alocar um novo. Defaults to True.
+
+        Returns:
+            numpy array: Frame corrigido, com as linhas a partir de roi_start_y.
+        """
+        shape = self.map1.shape[:2] + frame.shape[2:]
+        if dst is None or dst.shape != shape or dst.dtype != frame.dtype:
+            if not reuse:
+                dst = np.empty(shape, dtype=frame.dtype)
+            else:
+                if self._output is None or self._output.shape != shape or self._output.dtype != frame.dtype:
+                    self._output = np.empty(shape, dtype=frame.dtype)
+                dst = self._output
+
+        cv2.remap(frame, self.map1, self.map2, cv2.INTER_LINEAR, dst=dst, borderMode=cv2.BORDER_CONSTANT)
+        return dst
@@ -1,6 +1,11 @@
+import time
 import cv2
 import numpy as np
 from ...utils.config_manager import Config
+from .calibration import Undistorter
+from .frameGrabber import FrameGrabber
+from .frameMeta import FrameMeta
+from .mockCamera import MockPicamera2
 
 try:
     # Tenta importar a biblioteca picamera2, específica da Raspberry Pi
@@ -8,24 +13,7 @@ try:
 except (ImportError, ModuleNotFoundError):
     print("Aviso: picamera2 não detectado. Usando mock para desenvolvimento.")
     # Mock da classe Picamera2 para desenvolvimento em outros sistemas
-    class Picamera2:
-        def __init__(self):
-            self.is_mock = True
-
-        def configure(self, config): pass
-        def start(self): pass
-        def capture_array(self, name="main"):
-            # Retorna uma imagem de teste (um gradiente cinza)
-            # Cria um array 3D (altura, largura, canais)
-            height, width = 480, 640
-            # Cria um gradiente simples para simular uma imagem
-            img = np.zeros((height, width, 3), dtype=np.uint8)
-            for i in range(height):
-                img[i, :, 0] = int(255 * (i / height)) # Canal Azul (simulação)
-                img[i, :, 1] = int(255 * (1 - (i / height))) # Canal Verde (simulação)
-                img[i, :, 2] = 100 # Canal Vermelho (constante)
-            return img
-        def stop(self): pass
+    Picamera2 = MockPicamera2
 
 # Carrega configuração da câmera
 CAMERA_RESOLUTION = tuple(Config.get("camera")["resolution"])
@@ -37,59 +25,320 @@ class CameraModule:
     Módulo para gerenciar a câmera do Rover, capturar e fornecer frames
     para o módulo de visão computacional.
     """
-    def __init__(self, height, width, analogic=1.5, exposure = 30000, lighConfig=False):
-        """Inicializa e configura a câmera."""
-        self.picam2 = Picamera2()
+    def __init__(self, height, width, analogic=1.5, exposure = 30000, lighConfig=False, threaded=False, lores_size=None, simulated=False, scene=None, frame_bus=None, roi=None, calibration=None):
+        """
+        Inicializa e configura a câmera.
+
+        Args:
+            calibration (CameraCalibration | str, optional): Calibração da lente (ou caminho do .npz). Os frames do
+                                                            stream principal são entregues sem distorção, com as
+                                                            tabelas de remap pré-calculadas em cache (Undistorter).
+                                                            Defaults to None.
+            roi (float, optional): Captura apenas a faixa inferior da imagem, a partir desta fração da altura
+                                   (ex: 0.8 mantém os 20% de baixo). O recorte é feito no sensor/ISP pelo controle
+                                   ScalerCrop, reduzindo a altura dos streams de saída e o volume de dados por frame.
+                                   Sem suporte a ScalerCrop, a faixa é recortada do frame por uma view.
+                                   Defaults to None.
+            frame_bus (FramePublisher, optional): Barramento em memória compartilhada onde cada frame BGR
+                                                  capturado é publicado para outros processos, criado com o
+                                                  formato frame_shape (a faixa, quando há roi). Defaults to None.
+            simulated (bool, optional): Usa a câmera simulada (MockPicamera2) no lugar do sensor real. Sem a
+                                        picamera2 instalada e sem este parâmetro, a inicialização falha com
+                                        ModuleNotFoundError. Defaults to False.
+            scene (SyntheticScene, optional): Cena da câmera simulada, implica simulated=True. Defaults to None.
+            lores_size (tuple, optional): Habilita o stream de baixa resolução em YUV420 com o tamanho
+                                          (largura, altura), ex: (320, 240). Com ele ativo, a visão pode
+                                          trabalhar nos planos Y/U/V de get_lores e o stream principal só é
+                                          lido quando get_frame é chamado. Defaults to None.
+            threaded (bool, optional): Captura os frames em uma thread dedicada. get_frame passa a retornar
+                                       o frame mais recente sem esperar a leitura do sensor. Defaults to False.
+        """
+        if simulated or scene is not None:
+            self.picam2 = MockPicamera2(scene)
+        else:
+            self.picam2 = Picamera2()
+
         self.is_mock = hasattr(self.picam2, 'is_mock')
+        self.grabber = None
+        self._seq = 0
+        self.frame_bus = frame_bus
+        self.lores_size = tuple(lores_size) if lores_size is not None else None
+
+        if self.is_mock and not (simulated or scene is not None):
+            raise ModuleNotFoundError("Não foi possivel importa o modulo Picamera2")
+
+        # A picamera2 recebe o tamanho como (largura, altura)
+        main_size = (height, width)
+
+        self.roi = roi
+        self.roi_offset = 0  # Linhas do frame completo acima da faixa capturada
+        self._crop_rows = 0  # Linhas a descartar por software quando não há ScalerCrop
+        self._lores_crop_rows = 0  # Linhas do stream lores acima da faixa, descartadas por software
+        full_width, full_height = main_size
+        controls = {}
+
+        if roi is not None:
+            self.roi_offset = full_height - self._band_height(full_height, roi)
+
+        # Formato dos frames entregues por get_frame: a faixa quando há roi
+        self.frame_shape = (full_height - self.roi_offset, full_width, 3)
+        if frame_bus is not None and tuple(frame_bus.shape) != self.frame_shape:
+            raise ValueError(f"O barramento tem formato {tuple(frame_bus.shape)}, os frames têm {self.frame_shape}")
+
+        # Correção da lente: tabelas do frame completo, gerando só a faixa capturada quando há roi
+        self.undistorter = None
+        if calibration is not None:
+            self.undistorter = Undistorter(calibration, main_size, roi_start_y=self.roi_offset)
 
-        if not self.is_mock:
-            # Configuração real da câmera se não for o mock
-            # Usamos o modo 'preview' para processamento em tempo real
-            config = self.picam2.create_preview_configuration(
-                main=
+        if roi is not None:
+            # Com a correção da lente, o remap da faixa busca pixels acima dela (curvatura da distorção):
+            # o recorte no sensor começa na linha mais alta usada pelas tabelas, e não em roi_offset
+            capture_roi = roi
+            if self.undistorter is not None:
+                capture_start = self.undistorter.input_top() & ~1
+                if capture_start < self.roi_offset:
+                    capture_roi = capture_start / full_height
+
+            scaler_crop = self._scaler_crop(capture_roi)
+
+            if scaler_crop is not None:
+                # O ISP entrega somente a faixa, com a mesma escala horizontal e vertical
+                controls["ScalerCrop"] = scaler_crop
+                band_height = self._band_height(full_height, capture_roi)
+                main_size = (full_width, band_height)
+                if self.undistorter is not None:
+                    self.undistorter.set_input_start(full_height - band_height)
+                if self.lores_size is not None:
+                    # O lores não passa pela correção, as linhas acima da faixa são descartadas em get_lores
+                    lores_band = self._band_height(self.lores_size[1], capture_roi)
+                    self._lores_crop_rows = lores_band - self._band_height(self.lores_size[1], roi)
+                    self.lores_size = (self.lores_size[0], lores_band)
+            else:
+                self._crop_rows = self.roi_offset
+                if self.lores_size is not None:
+                    self._lores_crop_rows = self.lores_size[1] - self._band_height(self.lores_size[1], roi)
+
+        # Usamos o modo 'preview' para processamento em tempo real
+        streams = {
+            "main": {"size": main_size, "format": "RGB888"},
+        }
+
+        if self.lores_size is not None:
+            # Stream de baixa resolução, processado pelo ISP em paralelo ao principal
+            streams["lores"] = {"size": self.lores_size, "format": "YUV420"}
+
+        if controls:
+            streams["controls"] = controls
+
+        config = self.picam2.create_preview_configuration(**streams)
+    
+        #  Configuração de iluminação
+        if lighConfig:
+            self.picam2.set_controls(
                 {
-                    "size": (height, width), "format": "RGB888"
-                },
-                # lores={"size": (320, 240), "format": "YUV420"}, # Stream de baixa resolução opcional
+                "AnalogueGain": 1.5,   # controla amplificação do sensor, analogic < 1 = mais escuro
+                "ExposureTime": 30000, # em microssegundos, menor = mais escuro
+                }
             )
-        
-            #  Configuração de iluminação
-            if lighConfig:
-                self.picam2.set_controls(
-                    {
-                    "AnalogueGain": 1.5,   # controla amplificação do sensor, analogic < 1 = mais escuro
-                    "ExposureTime": 30000, # em microssegundos, menor = mais escuro
-                    }
-                )
-            self.picam2.configure(config)
-            self.picam2.start()
-            print("Câmera real (picamera2) inicializada.")
+        self.picam2.configure(config)
+        self.picam2.start()
+
+        if self.is_mock:
+            print("Câmera simulada inicializada.")
         else:
-            raise ModuleNotFoundError("Não foi possivel importa o modulo Picamera2")
-            # # Configuração do mock
-            # self.picam2.configure(None)
-            # self.picam2.start()
-            # print("Câmera mock inicializada.")
+            print("Câmera real (picamera2) inicializada.")
+
+        if threaded:
+            # A leitura do sensor passa a ocorrer em paralelo ao processamento.
+            # Com o stream lores ativo, a thread mantém o lores e o principal é lido sob demanda
+            capture = self._read_lores if self.lores_size is not None else self._read_main
+            self.grabber = FrameGrabber(capture, name="CameraModuleGrabber")
+            self.grabber.start()
+
+    @staticmethod
+    def _band_height(height, roi):
+        """Altura (par) da faixa inferior que começa na fração roi da altura"""
+        return max(2, int(round(height * (1 - roi) / 2)) * 2)
+
+    def _scaler_crop(self, roi):
+        """
+        Calcula o retângulo ScalerCrop (coordenadas do sensor) da faixa inferior da imagem.
+        Retorna None se a câmera não informa a área máxima de recorte.
+        """
+        properties = getattr(self.picam2, "camera_properties", None) or {}
+        maximum = properties.get("ScalerCropMaximum")
+        if maximum is None:
+            return None
+
+        x, y, w, h = maximum
+        top = int(h * roi) & ~1
+        return (x, y + top, w, h - top)
+
+    def _capture_request(self, name):
+        """
+        Captura um frame do stream name junto com os metadados do request.
+
+        Retorna:
+            tuple: (array, FrameMeta)
+        """
+        request = self.picam2.capture_request()
+        received = time.monotonic()  # Antes da cópia do buffer, que faz parte da idade do frame
+        try:
+            array = request.make_array(name)
+            metadata = request.get_metadata()
+        finally:
+            request.release()
+
+        self._seq += 1
+        sensor_timestamp = metadata.get("SensorTimestamp")
+        if sensor_timestamp is not None:
+            sensor_timestamp /= 1e9
+
+        # O SensorTimestamp da libcamera (início da exposição) usa o mesmo relógio do time.monotonic();
+        # fora de uma janela plausível o relógio é outro e vale o instante de chegada do request
+        captured = received
+        if sensor_timestamp is not None and received - 1.0 <= sensor_timestamp <= received:
+            captured = sensor_timestamp
+
+        meta = FrameMeta(
+            self._seq,
+            captured,
+            sensor_timestamp=sensor_timestamp,
+            exposure=metadata.get("ExposureTime"),
+            gain=metadata.get("AnalogueGain"),
+        )
+        return array, meta
+
+    def _read_main(self, out=None):
+        """
+        Lê um frame do stream principal.
+
+        No formato "RGB888" da picamera2 (e do mock) os pixels já estão na ordem [B, G, R] em memória, a ordem
+        esperada pelo OpenCV, então o buffer do ISP é entregue sem conversão de cor.
+
+        Args:
+            out (numpy array, optional): Buffer onde o frame corrigido (calibration) é escrito, se compatível.
+
+        Retorna:
+            tuple: (frame, FrameMeta) com o frame no formato BGR.
+        """
+        frame_bgr, meta = self._capture_request("main")
+
+        if self.undistorter is not None:
+            # Gera direto a faixa de interesse (dispensa o recorte por software). Quando a thread captura o stream
+            # principal, escreve no slot do buffer triplo; senão, no buffer reaproveitado do Undistorter
+            main_threaded = self.grabber is not None and self.lores_size is None
+            frame_bgr = self.undistorter.apply(frame_bgr, dst=out, reuse=not main_threaded)
+        elif self._crop_rows:
+            frame_bgr = frame_bgr[self._crop_rows:]  # O array é novo a cada captura, a view basta
+
+        if self.frame_bus is not None:
+            self.frame_bus.publish(frame_bgr, meta.timestamp)
+            
+        return frame_bgr, meta
+
+    def _read_lores(self, out=None):
+        """
+        Lê o buffer YUV420 do stream de baixa resolução.
+
+        Retorna:
+            tuple: (buffer, FrameMeta), buffer planar (altura * 3 / 2, largura) com os planos Y, U e V em sequência.
+        """
+        return self._capture_request("lores")
 
     def get_frame(self):
         """
         Captura um único frame da câmera.
 
+        No modo com thread, retorna sem bloquear o frame mais recente, que permanece
+        válido até a próxima chamada.
+
         Retorna:
             np.array: O frame capturado como um array NumPy no formato BGR.
         """
-        # A picamera2 captura em formato RGB por padrão
-        frame_rgb = self.picam2.capture_array("main")
-        
-        # Se for o mock, o frame já está em RGB (simulado)
-        if self.is_mock:
-            # O mock retorna um array 3D (H, W, 3) em RGB
-            frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+        return self.get_frame_with_meta()[0]
+
+    def get_frame_with_meta(self):
+        """
+        Captura um frame junto com seus metadados (sequência, instante de captura, exposição e ganho).
+
+        Retorna:
+            tuple: (frame, FrameMeta) com o frame no formato BGR.
+        """
+        if self.grabber is not None and self.lores_size is None:
+            return self.grabber.get_frame_with_meta()
+
+        return self._read_main()
+
+    def has_lores(self):
+        """Indica se o stream de baixa resolução está habilitado."""
+        return self.lores_size is not None
+
+    def get_lores(self):
+        """
+        Captura um frame do stream de baixa resolução.
+
+        Retorna:
+            tuple: (y, u, v) views sem cópia dos planos do frame YUV420. O plano Y tem a resolução
+                   do stream lores e os planos U e V metade da largura e da altura.
+        """
+        return self.get_lores_with_meta()[0]
+
+    def get_lores_with_meta(self):
+        """
+        Captura um frame do stream de baixa resolução junto com seus metadados.
+
+        Retorna:
+            tuple: ((y, u, v), FrameMeta)
+        """
+        if self.lores_size is None:
+            raise RuntimeError("Stream lores não habilitado, use CameraModule(..., lores_size=(320, 240))")
+
+        if self.grabber is not None:
+            buffer, meta = self.grabber.get_frame_with_meta()
         else:
-            # A picamera2 retorna em RGB, precisamos converter para BGR para o OpenCV
-            frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-            
-        return frame_bgr
+            buffer, meta = self._read_lores()
+
+        y, u, v = self.split_yuv420(buffer, self.lores_size[0], self.lores_size[1])
+
+        if self._lores_crop_rows:
+            # Recorte por software: mesma fração das linhas em cada plano
+            top = self._lores_crop_rows
+            y, u, v = y[top:], u[top // 2:], v[top // 2:]
+
+        return (y, u, v), meta
+
+    @staticmethod
+    def split_yuv420(buffer, width, height):
+        """
+        Separa um buffer YUV420 planar (I420) em views dos planos Y, U e V.
+
+        Args:
+            buffer (numpy array): Buffer (altura * 3 / 2, stride) retornado pela picamera2.
+            width (int): Largura útil da imagem.
+            height (int): Altura da imagem.
+
+        Retorna:
+            tuple: (y, u, v) sem cópia de dados.
+        """
+        stride = buffer.shape[1]
+        y = buffer[:height, :width]
+
+        # Os planos de crominância ocupam height // 4 linhas cada, com stride // 2 pixels por linha
+        chroma = buffer[height:height + height // 2].reshape(2, height // 2, stride // 2)
+        u = chroma[0, :, :width // 2]
+        v = chroma[1, :, :width // 2]
+
+        return y, u, v
+
+    def get_capture_stats(self):
+        """
+        Retorna os contadores da captura em thread (frames descartados, idade do frame, etc.).
+        Retorna None se a câmera não estiver no modo com thread.
+        """
+        if self.grabber is None:
+            return None
+        return self.grabber.get_stats()
 
     def get_preview_resolution(self):
         """Retorna a resolução de preview configurada."""
@@ -98,13 +347,15 @@ class CameraModule:
     def cleanup(self):
         """Libera os recursos da câmera."""
         print("Liberando recursos da câmera...")
+        if self.grabber is not None:
+            self.grabber.stop()
         self.picam2.stop()
 
 # Exemplo de uso (para testes)
 if __name__ == "__main__":
     camera = None
     try:
-        camera = CameraModule()
+        camera = CameraModule(*CAMERA_PREVIEW_RESOLUTION)
         print(f"Resolução do preview: {camera.get_preview_resolution()}")
         print("Capturando um frame de teste...")
         
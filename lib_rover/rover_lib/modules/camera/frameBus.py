@@ -0,0 +1,269 @@
+import multiprocessing
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+# Layout do bloco de memória compartilhada:
+#   [0, 64)     campos int64: versão, nº de slots, altura, largura, canais, último seq
+#   [64, 80)    dtype dos frames (string ASCII)
+#   [128, ...)  seq de cada slot (int64), instante de cada slot (float64), frames
+# Cada slot usa um seqlock: o seq fica negativo durante a escrita e recebe o número do
+# frame ao final, então leitores detectam sem lock um slot sobrescrito durante a leitura.
+_VERSION = 1
+_META_FIELDS = 8
+_DTYPE_OFFSET = 64
+_DTYPE_SIZE = 16
+_SLOTS_OFFSET = 128
+_ALIGNMENT = 64
+
+_N_SLOTS, _HEIGHT, _WIDTH, _CHANNELS, _LATEST = 1, 2, 3, 4, 5
+
+# Barramentos criados neste processo (já registrados no resource_tracker local)
+_published = set()
+
+
+def _align(value):
+    return (value + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class _FrameRing:
+    """Views numpy sobre o bloco de memória compartilhada do barramento"""
+
+    def __init__(self, shm, n_slots, shape, dtype):
+        self.shm = shm
+        self.n_slots = n_slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+        buf = shm.buf
+        self.meta = np.ndarray((_META_FIELDS,), dtype=np.int64, buffer=buf)
+        self.slot_seq = np.ndarray((n_slots,), dtype=np.int64, buffer=buf, offset=_SLOTS_OFFSET)
+        self.slot_stamp = np.ndarray((n_slots,), dtype=np.float64, buffer=buf, offset=_SLOTS_OFFSET + 8 * n_slots)
+
+        frames_offset = _align(_SLOTS_OFFSET + 16 * n_slots)
+        self.frames = np.ndarray((n_slots,) + self.shape, dtype=self.dtype, buffer=buf, offset=frames_offset)
+
+    @staticmethod
+    def size(n_slots, shape, dtype):
+        """Tamanho em bytes do bloco para a configuração dada"""
+        frame_size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        return _align(_SLOTS_OFFSET + 16 * n_slots) + n_slots * frame_size
+
+    def release(self):
+        """Descarta as views para permitir o fechamento do bloco"""
+        self.meta = self.slot_seq = self.slot_stamp = self.frames = None
+
+
+class FramePublisher:
+    """
+    Publica frames em um anel de slots em memória compartilhada para que outros processos
+    (seguidor de linha, detector TFLite, display, gravação) os leiam sem cópia e sem disputar o GIL.
+    """
+
+    def __init__(self, name, shape, dtype=np.uint8, n_slots=4):
+        """
+        Args:
+            name (str): Nome do barramento, usado pelos FrameSubscriber para se conectar.
+            shape (tuple): Formato dos frames, ex: (480, 640, 3).
+            dtype (optional): Tipo dos pixels. Defaults to numpy.uint8.
+            n_slots (int, optional): Quantidade de slots do anel. Defaults to 4.
+        """
+        if len(shape) not in (2, 3):
+            raise ValueError("O frame deve ter formato (altura, largura) ou (altura, largura, canais)")
+
+        self.name = name
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=_FrameRing.size(n_slots, shape, dtype))
+        self.ring = _FrameRing(self.shm, n_slots, shape, dtype)
+        self.shape = self.ring.shape
+        self.dtype = self.ring.dtype
+
+        height, width = shape[:2]
+        channels = shape[2] if len(shape) == 3 else 0
+        self.ring.meta[:] = [_VERSION, n_slots, height, width, channels, 0, 0, 0]
+        self.ring.slot_seq[:] = 0
+
+        dtype_str = np.dtype(dtype).str.encode("ascii")
+        self.shm.buf[_DTYPE_OFFSET:_DTYPE_OFFSET + _DTYPE_SIZE] = dtype_str.ljust(_DTYPE_SIZE, b"\0")
+
+        self.seq = 0  # Número do último frame publicado
+        _published.add(name)
+
+    def publish(self, frame, timestamp=None):
+        """
+        Copia um frame para o próximo slot do anel.
+
+        Args:
+            frame (numpy array): Frame no formato configurado.
+            timestamp (float, optional): Instante de captura. Defaults to time.monotonic().
+
+        Returns:
+            int: Número de sequência do frame publicado.
+        """
+        ring = self.ring
+        seq = self.seq + 1
+        slot = seq % ring.n_slots
+
+        ring.slot_seq[slot] = -seq  # Slot em escrita
+        np.copyto(ring.frames[slot], frame)
+        ring.slot_stamp[slot] = time.monotonic() if timestamp is None else timestamp
+        ring.slot_seq[slot] = seq
+        ring.meta[_LATEST] = seq
+
+        self.seq = seq
+        return seq
+
+    def close(self):
+        """Fecha e remove o barramento."""
+        if self.ring is None:
+            return
+        self.ring.release()
+        self.ring = None
+        self.shm.close()
+        self.shm.unlink()
+        _published.discard(self.name)
+
+
+class FrameSubscriber:
+    """
+    Lê, sem lock e sem cópia, o frame mais recente publicado por um FramePublisher de outro processo.
+
+    As views retornadas apontam direto para a memória compartilhada. Depois de processar um frame,
+    use is_valid(seq) para confirmar que o slot não foi reutilizado durante o processamento.
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Nome do barramento criado pelo FramePublisher.
+        """
+        self.name = name
+        self.shm = _attach(name)
+
+        meta = np.ndarray((_META_FIELDS,), dtype=np.int64, buffer=self.shm.buf)
+        if meta[0] != _VERSION:
+            raise ValueError(f"Versão do barramento de frames incompatível: {meta[0]}")
+
+        n_slots, height, width, channels = (int(v) for v in meta[_N_SLOTS:_LATEST])
+        shape = (height, width, channels) if channels else (height, width)
+        dtype = bytes(self.shm.buf[_DTYPE_OFFSET:_DTYPE_OFFSET + _DTYPE_SIZE]).rstrip(b"\0").decode("ascii")
+        del meta
+
+        self.ring = _FrameRing(self.shm, n_slots, shape, dtype)
+        self.shape = self.ring.shape
+        self.dtype = self.ring.dtype
+
+        self.last_seq = 0
+        self.frames_read = 0
+        self.missed_frames = 0  # Frames publicados que este leitor nunca viu
+        self.overruns = 0  # Frames lidos que o publicador sobrescreveu durante o processamento (um por seq)
+        self._last_overrun = 0  # Último seq contado em overruns
+
+    def latest_seq(self):
+        """Número de sequência do último frame publicado."""
+        return int(self.ring.meta[_LATEST])
+
+    def get_latest(self, copy=False):
+        """
+        Retorna o frame mais recente.
+
+        Args:
+            copy (bool, optional): Copia o frame para fora da memória compartilhada, repetindo a leitura
+                                   se o slot for sobrescrito durante a cópia. Defaults to False.
+
+        Returns:
+            tuple: (seq, frame, timestamp), ou (0, None, None) se nada foi publicado ainda.
+        """
+        ring = self.ring
+
+        while True:
+            seq = int(ring.meta[_LATEST])
+            if seq == 0:
+                return 0, None, None
+
+            slot = seq % ring.n_slots
+            frame = ring.frames[slot]
+            timestamp = float(ring.slot_stamp[slot])
+
+            if copy:
+                frame = frame.copy()
+
+            if ring.slot_seq[slot] == seq:
+                break
+
+            # O publicador deu a volta no anel durante a leitura: o frame nunca foi entregue, e entra
+            # em missed_frames quando o mais novo for lido
+
+        if seq > self.last_seq:
+            self.missed_frames += max(0, seq - self.last_seq - 1) if self.last_seq else 0
+            self.frames_read += 1
+            self.last_seq = seq
+
+        return seq, frame, timestamp
+
+    def wait_next(self, timeout=1.0, poll=0.001, copy=False):
+        """
+        Aguarda um frame mais novo que o último lido.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera em segundos. Defaults to 1.0.
+            poll (float, optional): Intervalo entre verificações em segundos. Defaults to 0.001.
+            copy (bool, optional): Ver get_latest. Defaults to False.
+
+        Returns:
+            tuple: (seq, frame, timestamp), ou (0, None, None) se o tempo esgotar.
+        """
+        deadline = time.monotonic() + timeout
+        while self.latest_seq() <= self.last_seq:
+            if time.monotonic() > deadline:
+                return 0, None, None
+            time.sleep(poll)
+
+        return self.get_latest(copy)
+
+    def is_valid(self, seq):
+        """
+        Indica se o slot do frame seq ainda contém esse frame. Se retornar False, o frame foi
+        sobrescrito durante o processamento e o resultado deve ser descartado.
+        """
+        valid = self.ring.slot_seq[seq % self.ring.n_slots] == seq
+        if not valid and seq > self._last_overrun:
+            # Cada frame sobrescrito conta uma vez, mesmo verificado mais de uma vez
+            self.overruns += 1
+            self._last_overrun = seq
+        return bool(valid)
+
+    def get_stats(self):
+        """Retorna os contadores do leitor."""
+        return {
+            "frames_read": self.frames_read,
+            "missed_frames": self.missed_frames,
+            "overruns": self.overruns,
+            "latest_seq": self.latest_seq(),
+        }
+
+    def close(self):
+        """Desconecta do barramento (não remove o bloco compartilhado)."""
+        if self.ring is None:
+            return
+        self.ring.release()
+        self.ring = None
+        self.shm.close()
+
+
+def _attach(name):
+    """Conecta a um bloco existente sem que o resource_tracker do leitor o remova ao sair"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        pass
+
+    shm = shared_memory.SharedMemory(name=name)
+
+    # O processo do publicador e seus filhos do multiprocessing compartilham o resource_tracker que
+    # já registrou o bloco. Um leitor independente tem o próprio tracker, que removeria o bloco ao
+    # terminar, então o registro feito na conexão é desfeito.
+    if name not in _published and multiprocessing.parent_process() is None:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+    return shm
@@ -0,0 +1,160 @@
+import threading
+import time
+from .frameMeta import FrameMeta
+
+
+class FrameGrabber:
+    """
+    Captura frames em uma thread dedicada e mantém sempre o frame mais recente
+    disponível para o consumidor, sem bloquear o loop de controle.
+
+    Usa um buffer triplo (escrita, pronto, leitura): a thread de captura escreve
+    sempre no slot de escrita e troca com o slot pronto ao terminar; o consumidor
+    troca o slot pronto com o de leitura ao pedir um frame. Assim a captura nunca
+    sobrescreve o frame que está sendo processado.
+    """
+
+    def __init__(self, capture, name="FrameGrabber"):
+        """
+        Args:
+            capture (callable): Função de captura com a assinatura ``capture(out)``. Deve escrever o
+                                frame em ``out`` quando possível (``out`` pode ser None) e retornar
+                                ``(frame, meta)``, onde ``meta`` é um FrameMeta ou None.
+            name (str, optional): Nome da thread de captura. Defaults to "FrameGrabber".
+        """
+        self._capture = capture
+        self._name = name
+
+        # Buffer triplo: frames e metadados de cada slot
+        self._slots = [None, None, None]
+        self._metas = [None, None, None]
+        self._write, self._ready, self._read = 0, 1, 2
+        self._fresh = False  # Existe frame pronto ainda não entregue
+
+        self._lock = threading.Lock()
+        self._first_frame = threading.Event()
+        self._thread = None
+        self._running = False
+        self._frame_meta = None  # Metadados do último frame entregue
+
+        # Contadores
+        self.frames_captured = 0  # Frames lidos da câmera
+        self.frames_delivered = 0  # Frames novos entregues ao consumidor
+        self.dropped_frames = 0  # Frames sobrescritos antes de serem consumidos
+        self.repeated_frames = 0  # Leituras que devolveram um frame já entregue
+        self.error = None  # Exceção que encerrou a thread de captura
+
+    def start(self, timeout=2.0):
+        """
+        Inicia a thread de captura e aguarda o primeiro frame.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera pelo primeiro frame em segundos. Defaults to 2.0.
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+        if not self._first_frame.wait(timeout):
+            self.stop()
+            raise TimeoutError("Nenhum frame recebido da câmera no tempo limite")
+
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        """Loop da thread de captura."""
+        while self._running:
+            try:
+                frame, meta = self._capture(self._slots[self._write])
+            except Exception as e:
+                self.error = e
+                self._running = False
+                self._first_frame.set()  # Libera quem estiver aguardando o primeiro frame
+                break
+
+            if meta is None:
+                meta = FrameMeta(self.frames_captured, time.monotonic())
+
+            with self._lock:
+                self._slots[self._write] = frame
+                self._metas[self._write] = meta
+
+                if self._fresh:  # O frame pronto anterior nunca foi consumido
+                    self.dropped_frames += 1
+
+                self._write, self._ready = self._ready, self._write
+                self._fresh = True
+                self.frames_captured += 1
+
+            self._first_frame.set()
+
+    def get_frame(self):
+        """
+        Retorna o frame mais recente sem bloquear.
+
+        O array retornado permanece válido até a próxima chamada de ``get_frame``.
+
+        Returns:
+            numpy array: Último frame capturado, ou None se a captura ainda não começou.
+        """
+        return self.get_frame_with_meta()[0]
+
+    def get_frame_with_meta(self):
+        """
+        Retorna o frame mais recente e seus metadados sem bloquear.
+
+        Returns:
+            tuple: (frame, FrameMeta), ou (None, None) se a captura ainda não começou.
+
+        Raises:
+            Exception: A exceção que encerrou a thread de captura, depois que o último frame pronto foi entregue.
+        """
+        with self._lock:
+            if self.error is not None and not self._fresh:
+                # A thread morreu: o último frame ficaria sendo repetido para sempre
+                raise self.error
+
+            if self._fresh:
+                self._read, self._ready = self._ready, self._read
+                self._fresh = False
+                self.frames_delivered += 1
+            elif self._slots[self._read] is not None:
+                self.repeated_frames += 1
+
+            frame = self._slots[self._read]
+            self._frame_meta = self._metas[self._read]
+
+        return frame, self._frame_meta
+
+    def frame_age(self):
+        """
+        Retorna a idade, em segundos, do último frame entregue por ``get_frame``.
+        """
+        if self._frame_meta is None:
+            return None
+        return self._frame_meta.age()
+
+    def get_stats(self):
+        """Retorna os contadores da captura."""
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_delivered": self.frames_delivered,
+            "dropped_frames": self.dropped_frames,
+            "repeated_frames": self.repeated_frames,
+            "frame_age": self.frame_age(),
+        }
+
+    def is_running(self):
+        """Indica se a thread de captura está ativa."""
+        return self._running
+
+    def stop(self):
+        """Encerra a thread de captura."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
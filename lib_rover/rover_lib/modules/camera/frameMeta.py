@@ -0,0 +1,38 @@
+import time
+
+
+class FrameMeta:
+    """
+    Metadados de um frame capturado, retornados junto com o frame por get_frame_with_meta.
+
+    Atributos:
+        seq (int): Número de sequência do frame na fonte.
+        timestamp (float): Instante de captura em time.monotonic() (segundos).
+        sensor_timestamp (float): Instante reportado pelo sensor/driver em segundos, quando disponível.
+        exposure (float): Tempo de exposição em microssegundos, quando disponível.
+        gain (float): Ganho analógico, quando disponível.
+    """
+
+    __slots__ = ("seq", "timestamp", "sensor_timestamp", "exposure", "gain")
+
+    def __init__(self, seq, timestamp, sensor_timestamp=None, exposure=None, gain=None):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.sensor_timestamp = sensor_timestamp
+        self.exposure = exposure
+        self.gain = gain
+
+    def age(self, now=None):
+        """
+        Retorna a idade do frame em segundos.
+
+        Args:
+            now (float, optional): Instante de referência em time.monotonic(). Defaults to agora.
+        """
+        if now is None:
+            now = time.monotonic()
+        return now - self.timestamp
+
+    def __repr__(self):
+        return (f"FrameMeta(seq={self.seq}, timestamp={self.timestamp:.6f}, sensor_timestamp={self.sensor_timestamp}, "
+                f"exposure={self.exposure}, gain={self.gain})")
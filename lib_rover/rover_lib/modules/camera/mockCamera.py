@@ -0,0 +1,149 @@
+import time
+import cv2
+import numpy as np
+from .syntheticScene import SyntheticScene
+
+# Área ativa do sensor simulado (IMX219)
+SENSOR_SIZE = (3280, 2464)
+
+
+class MockPicamera2:
+    """
+    Simulação da Picamera2 para desenvolvimento e benchmarks fora da Raspberry Pi.
+
+    Implementa a parte da API usada pelo CameraModule (create_preview_configuration, configure,
+    set_controls, start, capture_array, capture_request e stop), incluindo o recorte do
+    sensor pelo controle ScalerCrop. Os frames vêm de uma SyntheticScene e são
+    gerados uma única vez na configuração; cada captura apenas copia o próximo frame do banco.
+
+    Segue a convenção da libcamera para a ordem dos bytes: "RGB888" entrega [B, G, R] em
+    memória e "BGR888" entrega [R, G, B].
+    """
+
+    def __init__(self, scene=None, n_frames=30, frame_rate=None):
+        """
+        Args:
+            scene (SyntheticScene, optional): Cena simulada. Defaults to um fundo em gradiente.
+            n_frames (int, optional): Tamanho do banco de frames. Defaults to 30.
+            frame_rate (float, optional): Limita a taxa de captura para simular a leitura do sensor.
+                                          None captura sem espera. Defaults to None.
+        """
+        self.is_mock = True
+        self.scene = scene or SyntheticScene()
+        self.n_frames = n_frames
+        self.frame_rate = frame_rate
+        self.controls = {}
+        self.camera_properties = {
+            "PixelArraySize": SENSOR_SIZE,
+            "ScalerCropMaximum": (0, 0) + SENSOR_SIZE,
+        }
+
+        self.config = None
+        self._banks = {}
+        self._counters = {}
+        self._next_time = 0.0
+
+    def create_preview_configuration(self, main=None, lores=None, controls=None, **kwargs):
+        """Cria a configuração dos streams no mesmo formato de dicionário da picamera2"""
+        config = {"main": dict(main or {"size": (640, 480), "format": "RGB888"})}
+        if lores is not None:
+            config["lores"] = dict(lores)
+        config["controls"] = dict(controls or {})
+        return config
+
+    def _render(self, phase, width, height):
+        """Desenha um frame do tamanho de saída, aplicando o recorte do sensor (ScalerCrop)"""
+        crop = self.controls.get("ScalerCrop")
+        if crop is None:
+            return self.scene.render(phase, width, height)
+
+        # A região recortada do sensor é escalada para o tamanho de saída
+        sensor_w, sensor_h = SENSOR_SIZE
+        x, y, w, h = crop
+        full_w, full_h = round(width * sensor_w / w), round(height * sensor_h / h)
+        x0, y0 = round(full_w * x / sensor_w), round(full_h * y / sensor_h)
+
+        frame = self.scene.render(phase, full_w, full_h)
+        return np.ascontiguousarray(frame[y0:y0 + height, x0:x0 + width])
+
+    def configure(self, config):
+        """Gera o banco de frames de cada stream configurado"""
+        self.config = config
+        self.controls.update(config.get("controls", {}))
+        self._banks = {}
+        self._counters = {}
+
+        main = config["main"]
+        width, height = main["size"]
+        frames = np.stack([self._render(i / self.n_frames, width, height) for i in range(self.n_frames)])
+
+        if main.get("format", "RGB888") == "BGR888":
+            frames = np.ascontiguousarray(frames[..., ::-1])
+        self._banks["main"] = frames
+
+        if "lores" in config:
+            lores_width, lores_height = config["lores"]["size"]
+            self._banks["lores"] = np.stack([
+                cv2.cvtColor(self._render(i / self.n_frames, lores_width, lores_height), cv2.COLOR_BGR2YUV_I420)
+                for i in range(self.n_frames)
+            ])
+
+    def set_controls(self, controls):
+        self.controls.update(controls)
+
+    def start(self):
+        self._next_time = time.monotonic()
+
+    def _wait_frame(self):
+        """Simula o intervalo entre frames do sensor"""
+        if self.frame_rate is None:
+            return
+
+        delay = self._next_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_time = max(self._next_time, time.monotonic()) + 1.0 / self.frame_rate
+
+    def _next_array(self, name):
+        """Retorna uma cópia do próximo frame do banco do stream"""
+        if self.config is None:
+            self.configure(self.create_preview_configuration())
+
+        bank = self._banks[name]
+        index = self._counters.get(name, 0)
+        self._counters[name] = index + 1
+        return bank[index % len(bank)].copy()
+
+    def capture_array(self, name="main"):
+        """Retorna uma cópia do próximo frame do stream"""
+        self._wait_frame()
+        return self._next_array(name)
+
+    def capture_request(self):
+        """Retorna um request com os arrays dos streams e os metadados do frame"""
+        self._wait_frame()
+        return _MockRequest(self, {
+            "SensorTimestamp": time.monotonic_ns(),
+            "ExposureTime": self.controls.get("ExposureTime", 20000),
+            "AnalogueGain": self.controls.get("AnalogueGain", 1.0),
+        })
+
+    def stop(self):
+        pass
+
+
+class _MockRequest:
+    """Request simulado, com a mesma interface do CompletedRequest da picamera2"""
+
+    def __init__(self, camera, metadata):
+        self._camera = camera
+        self._metadata = metadata
+
+    def make_array(self, name="main"):
+        return self._camera._next_array(name)
+
+    def get_metadata(self):
+        return dict(self._metadata)
+
+    def release(self):
+        pass
@@ -0,0 +1,211 @@
+import json
+import os
+import struct
+import time
+import numpy as np
+from .frameMeta import FrameMeta
+
+# Formato do arquivo de gravação:
+#   MAGIC (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON | registros
+# O cabeçalho é completado com espaços para que os registros comecem em um múltiplo de ALIGNMENT.
+# Cada registro tem tamanho fixo: timestamp (float64) seguido dos bytes do frame.
+MAGIC = b"ROVERRAW"
+ALIGNMENT = 64
+
+
+def _record_dtype(shape, dtype):
+    """Tipo estruturado de um registro (timestamp + frame)"""
+    return np.dtype([("timestamp", "<f8"), ("frame", np.dtype(dtype), tuple(shape))])
+
+
+class FrameRecorder:
+    """
+    Grava frames e seus instantes de captura em um arquivo bruto de registros de tamanho fixo,
+    que pode ser lido sem cópia pela ReplayCamera.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Caminho do arquivo de gravação. O formato dos frames é definido pelo primeiro frame gravado.
+        """
+        self.path = str(path)
+        self.shape = None
+        self.dtype = None
+        self.count = 0
+        self._file = open(self.path, "wb")
+
+    def _write_header(self, frame):
+        """Escreve o cabeçalho com o formato dos frames"""
+        self.shape = frame.shape
+        self.dtype = frame.dtype
+
+        header = json.dumps({"shape": list(frame.shape), "dtype": frame.dtype.str}).encode()
+        prefix = len(MAGIC) + 4
+        padding = -(prefix + len(header)) % ALIGNMENT
+        header += b" " * padding
+
+        self._file.write(MAGIC)
+        self._file.write(struct.pack("<I", len(header)))
+        self._file.write(header)
+
+    def write(self, frame, timestamp=None):
+        """
+        Grava um frame.
+
+        Args:
+            frame (numpy array): Frame a gravar, com o mesmo formato de todos os anteriores.
+            timestamp (float, optional): Instante de captura em segundos. Defaults to time.monotonic().
+        """
+        if self.shape is None:
+            self._write_header(frame)
+        elif frame.shape != self.shape or frame.dtype != self.dtype:
+            raise ValueError(f"Frame {frame.shape}/{frame.dtype} diferente do formato gravado {self.shape}/{self.dtype}")
+
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        self._file.write(struct.pack("<d", timestamp))
+        self._file.write(np.ascontiguousarray(frame).data)
+        self.count += 1
+
+    def record_from(self, camera, n_frames):
+        """
+        Grava n_frames de uma câmera com a interface get_frame (CameraModule, Webcam, ...).
+
+        Args:
+            camera: Fonte de frames.
+            n_frames (int): Quantidade de frames a gravar.
+        """
+        for _ in range(n_frames):
+            frame = camera.get_frame()
+            if frame is None:
+                break
+            self.write(frame)
+
+    def close(self):
+        """Fecha o arquivo de gravação."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayCamera:
+    """
+    Câmera que reproduz uma gravação feita pelo FrameRecorder, com a mesma interface do
+    CameraModule e da Webcam (get_frame / cleanup).
+
+    O arquivo é mapeado em memória (numpy.memmap): cada frame retornado é uma view somente
+    leitura do arquivo, sem cópia nem decodificação.
+    """
+
+    def __init__(self, path, loop=False, realtime=False, copy=False):
+        """
+        Args:
+            path (str): Caminho do arquivo gravado pelo FrameRecorder.
+            loop (bool, optional): Recomeça a reprodução ao chegar no fim. Defaults to False.
+            realtime (bool, optional): Respeita os intervalos gravados entre os frames. Por padrão os frames
+                                       são entregues o mais rápido possível. Defaults to False.
+            copy (bool, optional): Retorna cópias graváveis dos frames, para quem desenha sobre eles. Defaults to False.
+        """
+        self.path = str(path)
+        self.loop = loop
+        self.realtime = realtime
+        self.copy = copy
+
+        with open(self.path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Arquivo de gravação inválido: {self.path}")
+            (header_size,) = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(header_size))
+
+        self.shape = tuple(header["shape"])
+        self.dtype = np.dtype(header["dtype"])
+
+        record = _record_dtype(self.shape, self.dtype)
+        offset = len(MAGIC) + 4 + header_size
+
+        # Registros incompletos no fim (gravação interrompida) são ignorados
+        count = (os.path.getsize(self.path) - offset) // record.itemsize
+        self._records = np.memmap(self.path, dtype=record, mode="r", offset=offset, shape=(count,))
+
+        self.frames = self._records["frame"]
+        self.timestamps = self._records["timestamp"]
+
+        self._index = 0
+        self._timestamp = None
+        self._start_wall = None
+        self._start_stamp = None
+
+    def __len__(self):
+        return 0 if self._records is None else len(self._records)
+
+    def get_frame(self):
+        """
+        Retorna o próximo frame da gravação.
+
+        Retorna:
+            np.array: View do frame gravado, ou None ao fim da gravação (sem loop).
+        """
+        return self.get_frame_with_meta()[0]
+
+    def get_frame_with_meta(self):
+        """
+        Retorna o próximo frame da gravação e seus metadados. O instante de captura é o gravado,
+        e o número de sequência é o índice do frame no arquivo.
+
+        Retorna:
+            tuple: (frame, FrameMeta), ou (None, None) ao fim da gravação (sem loop).
+        """
+        if self._records is None:
+            raise RuntimeError(f"Gravação {self.path} já liberada por cleanup")
+
+        if self._index >= len(self._records):
+            if not self.loop or len(self._records) == 0:
+                return None, None
+            self._index = 0
+            self._start_wall = None
+
+        index = self._index
+        self._index += 1
+        self._timestamp = float(self.timestamps[index])
+
+        if self.realtime:
+            self._wait(self._timestamp)
+
+        frame = self.frames[index]
+        if self.copy:
+            frame = frame.copy()
+
+        return frame, FrameMeta(index, self._timestamp)
+
+    def _wait(self, stamp):
+        """Aguarda até o instante relativo do frame na gravação"""
+        now = time.monotonic()
+        if self._start_wall is None:
+            self._start_wall, self._start_stamp = now, stamp
+            return
+
+        delay = (stamp - self._start_stamp) - (now - self._start_wall)
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_timestamp(self):
+        """Retorna o instante de captura gravado do último frame entregue."""
+        return self._timestamp
+
+    def seek(self, index):
+        """Posiciona a reprodução no frame de índice index."""
+        self._index = index
+        self._start_wall = None
+
+    def cleanup(self):
+        """Libera o mapeamento do arquivo."""
+        self._records = None
+        self.frames = None
+        self.timestamps = None
@@ -0,0 +1,132 @@
+import cv2
+import numpy as np
+
+
+class SyntheticScene:
+    """
+    Gerador de cenas sintéticas para simular a câmera fora da Raspberry Pi.
+
+    Desenha linhas brancas com curvatura, bolas e obstáculos vermelhos sobre um fundo em
+    gradiente, com ruído e variação de iluminação. Os frames são gerados uma única vez
+    (precompute) e depois apenas reaproveitados, então o custo de simulação por frame é
+    desprezível perto do custo da visão.
+
+    Formato dos elementos:
+        lines: [{"x": 0.5, "heading": 0.0, "curvature": 0.0, "thickness": 20, "color": (255, 255, 255)}]
+            x é a posição horizontal da linha na base da imagem (fração da largura), heading o
+            deslocamento horizontal até o topo e curvature o termo quadrático, ambos em frações da largura.
+        balls: [{"center": (x, y), "radius": r, "color": (0, 0, 200)}]
+        obstacles: [{"rect": (x, y, w, h), "color": (0, 0, 220)}]
+    """
+
+    def __init__(self, width=640, height=480, lines=None, balls=None, obstacles=None,
+                 noise=0.0, lighting=1.0, lighting_variation=0.0, sway=0.0, seed=0):
+        """
+        Args:
+            width (int, optional): Largura dos frames. Defaults to 640.
+            height (int, optional): Altura dos frames. Defaults to 480.
+            lines (list, optional): Linhas a desenhar. Defaults to None.
+            balls (list, optional): Bolas a desenhar. Defaults to None.
+            obstacles (list, optional): Obstáculos retangulares a desenhar. Defaults to None.
+            noise (float, optional): Desvio padrão do ruído gaussiano (níveis de cinza). Defaults to 0.0.
+            lighting (float, optional): Ganho de iluminação global. Defaults to 1.0.
+            lighting_variation (float, optional): Amplitude relativa da variação de iluminação ao longo dos frames. Defaults to 0.0.
+            sway (float, optional): Amplitude do deslocamento lateral das linhas ao longo dos frames (fração da largura). Defaults to 0.0.
+            seed (int, optional): Semente do gerador de ruído. Defaults to 0.
+        """
+        self.width = width
+        self.height = height
+        self.lines = lines or []
+        self.balls = balls or []
+        self.obstacles = obstacles or []
+        self.noise = noise
+        self.lighting = lighting
+        self.lighting_variation = lighting_variation
+        self.sway = sway
+        self.seed = seed
+
+    def _background(self, width, height):
+        """Fundo em gradiente vertical, gerado sem loop por linha"""
+        ramp = np.linspace(0.0, 1.0, height, endpoint=False, dtype=np.float32)[:, None]
+
+        background = np.empty((height, width, 3), dtype=np.uint8)
+        background[:, :, 0] = (255 * ramp).astype(np.uint8)
+        background[:, :, 1] = (255 * (1 - ramp)).astype(np.uint8)
+        background[:, :, 2] = 100
+        return background
+
+    def line_points(self, line, width, height, offset=0.0):
+        """
+        Retorna os pontos (x, y) do eixo central de uma linha.
+
+        Args:
+            line (dict): Especificação da linha.
+            width (int): Largura do frame.
+            height (int): Altura do frame.
+            offset (float, optional): Deslocamento lateral extra (fração da largura). Defaults to 0.0.
+        """
+        ys = np.arange(height, -1, -4, dtype=np.float32)
+        u = (height - ys) / height  # 0 na base, 1 no topo
+
+        xs = line.get("x", 0.5) + offset + line.get("heading", 0.0) * u + line.get("curvature", 0.0) * u ** 2
+        return np.stack([xs * width, ys], axis=1)
+
+    def render(self, phase=0.0, width=None, height=None):
+        """
+        Desenha um frame da cena.
+
+        Args:
+            phase (float, optional): Fase da animação em [0, 1), controla o deslocamento das linhas e a iluminação. Defaults to 0.0.
+            width (int, optional): Largura do frame. Defaults to a largura da cena.
+            height (int, optional): Altura do frame. Defaults to a altura da cena.
+
+        Returns:
+            numpy array: Frame no formato BGR.
+        """
+        width = width or self.width
+        height = height or self.height
+
+        # Escala das coordenadas da cena para a resolução pedida
+        sx, sy = width / self.width, height / self.height
+
+        frame = self._background(width, height)
+        offset = self.sway * np.sin(2 * np.pi * phase)
+
+        for line in self.lines:
+            points = self.line_points(line, width, height, offset)
+            cv2.polylines(frame, [np.round(points).astype(np.int32)], False, line.get("color", (255, 255, 255)),
+                          max(1, int(line.get("thickness", 20) * sx)))
+
+        for obstacle in self.obstacles:
+            x, y, w, h = obstacle["rect"]
+            cv2.rectangle(frame, (int(x * sx), int(y * sy)), (int((x + w) * sx), int((y + h) * sy)),
+                          obstacle.get("color", (0, 0, 220)), -1)
+
+        for ball in self.balls:
+            x, y = ball["center"]
+            cv2.circle(frame, (int(x * sx), int(y * sy)), int(ball["radius"] * sx), ball.get("color", (0, 0, 200)), -1)
+
+        gain = self.lighting * (1 + self.lighting_variation * np.sin(2 * np.pi * phase))
+        if gain != 1.0:
+            frame = cv2.convertScaleAbs(frame, alpha=gain)
+
+        if self.noise > 0:
+            rng = np.random.default_rng(self.seed + int(phase * 1000))
+            noisy = frame.astype(np.float32) + rng.normal(0, self.noise, frame.shape).astype(np.float32)
+            frame = np.clip(noisy, 0, 255).astype(np.uint8)
+
+        return frame
+
+    def precompute(self, n_frames=30, width=None, height=None):
+        """
+        Gera um banco de frames da cena, percorrendo um ciclo completo da animação.
+
+        Args:
+            n_frames (int, optional): Quantidade de frames. Defaults to 30.
+            width (int, optional): Largura dos frames. Defaults to a largura da cena.
+            height (int, optional): Altura dos frames. Defaults to a altura da cena.
+
+        Returns:
+            numpy array: Array (n_frames, altura, largura, 3) em BGR.
+        """
+        return np.stack([self.render(i / n_frames, width, height) for i in range(n_frames)])
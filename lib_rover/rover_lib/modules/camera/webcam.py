@@ -1,18 +1,131 @@
+import sys
+import time
 import cv2 as openCv
- 
+from .frameGrabber import FrameGrabber
+from .frameMeta import FrameMeta
+
 class Webcam:
     """
-        Usa o webcam para ler frames
+        Usa o webcam para ler frames.
+
+        Configurada para baixa latência: fila interna do driver com um único buffer e formato MJPEG
+        negociado no tamanho pedido. Com threaded=True a leitura/decodificação passa para uma thread
+        dedicada, de modo que get_frame retorna sempre o frame mais recente sem bloquear.
     """
-    
-    def __init__(self, height, width):
-        self.camera = openCv.VideoCapture(0)
-        self.camera.set(openCv.CAP_PROP_FRAME_HEIGHT, height) # definindo altura do frame
+
+    def __init__(self, height, width, device=0, fps=30, mjpeg=True, threaded=False):
+        """
+        Args:
+            height (int): Altura desejada do frame.
+            width (int): Largura desejada do frame.
+            device (int, optional): Índice do dispositivo de vídeo. Defaults to 0.
+            fps (int, optional): Taxa de quadros desejada. Defaults to 30.
+            mjpeg (bool, optional): Negocia o formato MJPEG, que permite resoluções e taxas maiores pela USB. Defaults to True.
+            threaded (bool, optional): Lê e decodifica os frames em uma thread dedicada, como no CameraModule.
+                                       A inicialização aguarda o primeiro frame e lança TimeoutError se o
+                                       dispositivo não entregar nenhum. Defaults to False.
+        """
+        self.camera = self._open(device)
+
+        if mjpeg:
+            self.camera.set(openCv.CAP_PROP_FOURCC, openCv.VideoWriter_fourcc(*"MJPG"))
+
+        # O V4L2 negocia o formato a cada propriedade, a largura é definida antes da altura
         self.camera.set(openCv.CAP_PROP_FRAME_WIDTH, width) # definindo largura
-        
+        self.camera.set(openCv.CAP_PROP_FRAME_HEIGHT, height) # definindo altura do frame
+        self.camera.set(openCv.CAP_PROP_FPS, fps)
+
+        # Mantém apenas um frame na fila do driver, evitando entregar frames atrasados
+        self.camera.set(openCv.CAP_PROP_BUFFERSIZE, 1)
+
+        # Configuração efetivamente negociada com o dispositivo
+        self.resolution = (
+            int(self.camera.get(openCv.CAP_PROP_FRAME_WIDTH)),
+            int(self.camera.get(openCv.CAP_PROP_FRAME_HEIGHT)),
+        )
+        self.fps = self.camera.get(openCv.CAP_PROP_FPS)
+        fourcc = int(self.camera.get(openCv.CAP_PROP_FOURCC))
+        self.fourcc = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+
+        print(f"Webcam inicializada: {self.resolution[0]}x{self.resolution[1]} @ {self.fps:.0f} FPS ({self.fourcc})")
+
+        self._seq = 0
+        self.grabber = None
+        if threaded:
+            self.grabber = FrameGrabber(self._read, name="WebcamGrabber")
+            self.grabber.start(timeout=5.0)
+
+    @staticmethod
+    def _open(device):
+        """Abre o dispositivo, preferindo o backend V4L2 no Linux"""
+        if sys.platform.startswith("linux"):
+            camera = openCv.VideoCapture(device, openCv.CAP_V4L2)
+            if camera.isOpened():
+                return camera
+            camera.release()
+
+        return openCv.VideoCapture(device)
+
+    def _read(self, out=None):
+        """Lê e decodifica um frame, reaproveitando o buffer out quando possível"""
+        ret, frame = self.camera.read(out)
+        if not ret:
+            raise RuntimeError("Falha ao ler frame da webcam")
+        return frame, self._make_meta()
+
+    def _make_meta(self):
+        """Monta os metadados do frame recém lido"""
+        self._seq += 1
+        sensor_msec = self.camera.get(openCv.CAP_PROP_POS_MSEC)  # Instante do buffer do driver
+        exposure = self.camera.get(openCv.CAP_PROP_EXPOSURE)
+        gain = self.camera.get(openCv.CAP_PROP_GAIN)
+
+        return FrameMeta(
+            self._seq,
+            time.monotonic(),
+            sensor_timestamp=sensor_msec / 1000 if sensor_msec > 0 else None,
+            exposure=exposure if exposure >= 0 else None,
+            gain=gain if gain >= 0 else None,
+        )
+
     def get_frame(self):
+        return self.get_frame_with_meta()[0]
+
+    def get_frame_with_meta(self):
+        """
+        Retorna o frame junto com seus metadados (sequência, instante de captura, exposição e ganho).
+
+        Retorna:
+            tuple: (frame, FrameMeta), ou (None, None) se a leitura falhar.
+        """
+        if self.grabber is not None:
+            if not self.grabber.is_running():
+                return None, None
+            return self.grabber.get_frame_with_meta()
+
         ret, frame =  self.camera.read()
-        return frame
-    
+        if not ret:
+            return None, None
+        return frame, self._make_meta()
+
+    def get_resolution(self):
+        """Retorna a resolução (largura, altura) negociada com o dispositivo."""
+        return self.resolution
+
+    def get_fps(self):
+        """Retorna a taxa de quadros negociada com o dispositivo."""
+        return self.fps
+
+    def get_capture_stats(self):
+        """
+        Retorna os contadores da captura em thread (frames descartados, idade do frame, etc.).
+        Retorna None se a webcam não estiver no modo com thread.
+        """
+        if self.grabber is None:
+            return None
+        return self.grabber.get_stats()
+
     def cleanup(self):
-        self.camera.release() # libera o objeto camera
\ No newline at end of file
+        if self.grabber is not None:
+            self.grabber.stop()
+        self.camera.release() # libera o objeto camera
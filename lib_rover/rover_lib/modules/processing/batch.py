@@ -0,0 +1,208 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy
+from .processing_image import ProcessingImage
+from ..vision.visionModule import VisionModule
+
+# Módulos de visão de cada processo, por resolução (criados uma vez por processo)
+_vision_modules = {}
+
+
+def _vision(frame):
+    """VisionModule (headless) para a resolução do frame, reaproveitado entre frames do mesmo processo"""
+    resolution = (frame.shape[1], frame.shape[0])
+    vision = _vision_modules.get(resolution)
+    if vision is None:
+        vision = VisionModule(resolution, headless=True)
+        _vision_modules[resolution] = vision
+    return vision
+
+
+def line_task(frame):
+    """Seguidor de linha: (desvio, centroide x, centroide y), com o centroide NaN sem linha"""
+    vision = _vision(frame)
+    desvio, _ = vision.process_frame_for_line_following(frame)
+    centroid = vision.last_line["centroid"] or (numpy.nan, numpy.nan)
+    return desvio, centroid[0], centroid[1]
+
+
+def circle_task(frame, pyramid=0, fused=False, quality="full"):
+    """
+    Bola: (x, y, r) do houghCircleDetect sobre o color_dual_segmentation, NaN sem círculo. As coordenadas
+    são as da máscara 640x640 da segmentação dupla, como no examples/folowCircle.
+    """
+    mask = ProcessingImage.color_dual_segmentation(frame, fused=fused, quality=quality)
+    circle, _ = VisionModule.houghCircleDetect(mask, pyramid=pyramid)
+    return (numpy.nan,) * 3 if circle is None else circle
+
+
+def obstacle_task(frame, min_area_threshold=5000, color_range=None):
+    """Obstáculo: (detectado 0/1, área, bbox x, y, largura, altura), com a área e a bbox NaN sem obstáculo"""
+    vision = _vision(frame)
+    detected, _ = vision.detect_obstacle(frame, min_area_threshold, color_range)
+    if not detected:
+        return (0.0,) + (numpy.nan,) * 5
+    return (1.0, vision.last_obstacle["area"], *vision.last_obstacle["bbox"])
+
+
+# Tarefas prontas: nome -> (função, colunas do resultado)
+TASKS = {
+    "line": (line_task, ("desvio", "centroid_x", "centroid_y")),
+    "circle": (circle_task, ("x", "y", "r")),
+    "obstacle": (obstacle_task, ("detected", "area", "bbox_x", "bbox_y", "bbox_w", "bbox_h")),
+}
+
+
+def _attach(name):
+    """Abre um bloco de memória compartilhada criado pelo processo principal, que é quem o remove no final"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        # Os processos do pool usam o mesmo resource_tracker do processo principal, o registro repetido não tem efeito
+        return shared_memory.SharedMemory(name=name)
+
+
+def _run_chunk(function, n_columns, params, frames, start, stop):
+    """Aplica a função aos frames [start, stop), retornando uma linha de resultado por frame"""
+    rows = numpy.full((stop - start, n_columns), numpy.nan)
+    for i in range(start, stop):
+        rows[i - start] = function(frames[i], **params)
+    return rows
+
+
+def _run_shared_chunk(shm_name, shape, dtype, function, n_columns, params, start, stop):
+    """Executado nos processos do pool: lê os frames direto da memória compartilhada, sem cópia"""
+    shm = _attach(shm_name)
+    frames = numpy.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        return _run_chunk(function, n_columns, params, frames, start, stop)
+    finally:
+        del frames  # A visão precisa ser liberada antes de fechar o bloco
+        shm.close()
+
+
+def _blocks(frames, block_size):
+    """Divide um array (N, H, W, 3) ou um iterador de frames em blocos de até block_size frames"""
+    if isinstance(frames, numpy.ndarray):
+        for start in range(0, len(frames), block_size):
+            yield frames[start:start + block_size]
+        return
+
+    block = []
+    for frame in frames:
+        block.append(frame)
+        if len(block) == block_size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def process_batch(frames, task, workers=None, chunk_size=None, block_size=512, block_bytes=16 * 2 ** 20, **params):
+    """
+    Processa uma pilha de frames gravados em paralelo, para ajuste de parâmetros offline.
+
+    Os frames são copiados, um bloco por vez, para memória compartilhada; cada processo do
+    pool recebe só o nome do bloco e um intervalo de índices (chunk) e lê os frames sem cópia, devolvendo
+    uma linha de resultado por frame. Dois blocos se alternam: enquanto um é processado, o próximo é preenchido.
+
+    Args:
+        frames (numpy array | iterable): Array (N, H, W, 3) BGR (ex: ReplayCamera(...).frames, sem cópia)
+                                         ou iterador de frames de mesmo formato.
+        task (str | tuple): Nome de uma tarefa de TASKS ("line", "circle", "obstacle") ou (função, colunas),
+                            com uma função de nível de módulo frame -> valores das colunas.
+        workers (int, optional): Processos do pool; 0 ou 1 processa no próprio processo. Defaults to os.cpu_count().
+        chunk_size (int, optional): Frames por tarefa enviada ao pool. Defaults to ~4 tarefas por processo e bloco.
+        block_size (int, optional): Máximo de frames por bloco de memória compartilhada. Defaults to 512.
+        block_bytes (int, optional): Máximo de bytes por bloco; os dois blocos ficam no /dev/shm. Defaults to
+                                     16 MB, dentro dos 64 MB do /dev/shm padrão de um container Docker.
+        **params: Parâmetros repassados à função da tarefa (ex: pyramid=1, min_area_threshold=3000).
+
+    Returns:
+        dict: Coluna -> numpy array (float64, NaN onde não há resultado), mais "frame" com o índice de cada frame.
+    """
+    function, columns = TASKS[task] if isinstance(task, str) else task
+    n_columns = len(columns)
+    workers = os.cpu_count() if workers is None else workers
+
+    results = []
+    if workers <= 1:
+        for block in _blocks(frames, block_size):
+            results.append(_run_chunk(function, n_columns, params, block, 0, len(block)))
+    else:
+        results = _process_shared(frames, function, n_columns, params, workers, chunk_size, block_size, block_bytes)
+
+    rows = numpy.concatenate(results) if results else numpy.empty((0, n_columns))
+    output = {"frame": numpy.arange(len(rows))}
+    for i, name in enumerate(columns):
+        output[name] = rows[:, i]
+    return output
+
+
+def _process_shared(frames, function, n_columns, params, workers, chunk_size, block_size, block_bytes):
+    """Distribui os blocos pelo pool usando dois blocos de memória compartilhada alternados"""
+    # Formato dos blocos a partir do primeiro frame
+    if isinstance(frames, numpy.ndarray):
+        if len(frames) == 0:
+            return []
+        first = frames[0]
+    else:
+        iterator = iter(frames)
+        try:
+            first = numpy.asarray(next(iterator))
+        except StopIteration:
+            return []
+        n_frames = len(frames) if hasattr(frames, "__len__") else None
+        frames = itertools.chain([first], iterator)
+
+    # Blocos limitados em bytes e, com o total conhecido, ao número de frames
+    block_size = max(1, min(block_size, block_bytes // max(1, first.nbytes)))
+    if isinstance(frames, numpy.ndarray):
+        block_size = min(block_size, len(frames))
+    elif n_frames is not None:
+        block_size = max(1, min(block_size, n_frames))
+
+    shape = (block_size,) + first.shape
+    memories, arrays = [], []  # Os dois blocos e os arrays sobre eles
+    results = []
+    pending = []  # Tarefas do bloco em processamento
+
+    try:
+        for _ in range(2):
+            memories.append(shared_memory.SharedMemory(create=True, size=int(numpy.prod(shape)) * first.itemsize))
+            arrays.append(numpy.ndarray(shape, dtype=first.dtype, buffer=memories[-1].buf))
+        del first
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for index, block in enumerate(_blocks(frames, block_size)):
+                # O bloco usado dois blocos atrás só é sobrescrito depois que suas tarefas terminam
+                if len(pending) == 2:
+                    results.extend(future.result() for future in pending.pop(0))
+
+                shared = arrays[index % 2]
+                n = len(block)
+                if isinstance(block, numpy.ndarray):
+                    shared[:n] = block
+                else:
+                    for i, frame in enumerate(block):
+                        shared[i] = frame
+
+                size = chunk_size or max(1, -(-n // (4 * workers)))
+                pending.append([
+                    pool.submit(_run_shared_chunk, memories[index % 2].name, shared.shape, shared.dtype, function,
+                                n_columns, params, start, min(n, start + size))
+                    for start in range(0, n, size)
+                ])
+                del shared
+
+            for futures in pending:
+                results.extend(future.result() for future in futures)
+    finally:
+        arrays.clear()  # Os arrays precisam ser liberados antes de fechar os blocos
+        for shm in memories:
+            shm.close()
+            shm.unlink()
+
+    return results
@@ -0,0 +1,177 @@
+import copy
+import hashlib
+import json
+import os
+import cv2 as openCv
+import numpy
+from ...utils.buffers import reuse_buffer
+from ...utils.npcache import load_or_build
+
+# Diretório padrão do cache das tabelas em disco
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "rover_lib", "color_lut")
+
+# Versão do formato da tabela (muda a chave do cache quando a construção muda)
+_LUT_VERSION = 1
+
+
+class ColorClassifier:
+    """
+    Classificador de cores por tabela de consulta (LUT) 3D: substitui cvtColor(BGR2HSV) + inRange
+    por uma única consulta vetorizada por pixel.
+
+    O espaço BGR é quantizado em 2^bits níveis por canal (64³ caixas por padrão). Na construção, o centro de
+    cada caixa é convertido para HSV e testado contra os intervalos de cada classe; a tabela guarda, por caixa,
+    uma máscara de bits com as classes a que ela pertence (até 8 classes). A classificação de um frame calcula o
+    índice da caixa de cada pixel e consulta a tabela, gerando as máscaras de todas as classes em uma passada.
+
+    Pixels perto da borda de um intervalo podem ser classificados de forma diferente da conversão exata,
+    pois a caixa inteira recebe a classe do seu centro.
+
+    Um intervalo pode trazer um gamma (lower, upper, gamma): ele é testado na cor após o ajuste de brilho
+    ProcessingImage.ligh_adjustment(gamma), sem que o frame precise ser ajustado e convertido de novo.
+
+    Exemplo:
+        classifier = ColorClassifier({
+            "linha": [((0, 0, 200), (180, 25, 255))],
+            "vermelho": [((0, 100, 100), (10, 255, 255)), ((160, 100, 100), (180, 255, 255))],
+        })
+        masks = classifier.masks(frame)  # {"linha": mask, "vermelho": mask}
+    """
+
+    def __init__(self, classes, bits=6, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Args:
+            classes (dict): Nome da classe -> lista de intervalos HSV (lower, upper) ou (lower, upper, gamma),
+                            inclusivos como no inRange.
+            bits (int, optional): Bits por canal da quantização (tabela com 2^(3*bits) entradas). Defaults to 6.
+            cache_dir (str, optional): Diretório do cache da tabela em disco. None desabilita o cache.
+                                       Defaults to ~/.cache/rover_lib/color_lut.
+        """
+        if not 1 <= len(classes) <= 8:
+            raise ValueError("O classificador suporta de 1 a 8 classes")
+        if not 1 <= bits <= 8:
+            raise ValueError("bits deve estar entre 1 e 8")
+
+        # Normaliza os intervalos para listas de inteiros (chave estável para o cache)
+        self.classes = {
+            name: [(list(map(int, r[0])), list(map(int, r[1]))) + tuple(float(g) for g in r[2:3]) for r in ranges]
+            for name, ranges in classes.items()
+        }
+        self.bits = bits
+        self.bit = {name: 1 << i for i, name in enumerate(self.classes)}  # Bit de cada classe no rótulo
+
+        self._shift = 8 - bits
+        self._weights = numpy.array([[1 << (2 * bits), 1 << bits, 1]], dtype=numpy.float64)  # Índice = b, g, r
+        self._buffers = {}
+
+        # Tabelas 256 -> máscara (0/255) de cada classe, aplicadas sobre os rótulos com openCv.LUT
+        labels = numpy.arange(256)
+        self._mask_tables = {
+            name: numpy.where(labels & bit, 255, 0).astype(numpy.uint8)
+            for name, bit in self.bit.items()
+        }
+
+        self.lut = self._load_or_build(cache_dir)
+
+    def cache_key(self):
+        """Hash que identifica a tabela (intervalos, quantização e versão do formato)."""
+        description = json.dumps({"classes": self.classes, "bits": self.bits, "version": _LUT_VERSION}, sort_keys=True)
+        return hashlib.sha1(description.encode()).hexdigest()
+
+    def _load_or_build(self, cache_dir):
+        """Carrega a tabela do cache em disco ou a constrói (e grava no cache)"""
+        path = None if cache_dir is None else os.path.join(cache_dir, f"{self.cache_key()}.npy")
+        size = 1 << (3 * self.bits)
+        # Mapeada em memória: os processos que usam o mesmo cache compartilham as páginas da tabela
+        return load_or_build(path, self.build_lut, lambda lut: lut.shape == (size,) and lut.dtype == numpy.uint8,
+                             mmap_mode="r")
+
+    def build_lut(self):
+        """
+        Constrói a tabela BGR quantizado -> rótulo.
+
+        Returns:
+            numpy array: Tabela uint8 com 2^(3*bits) entradas, indexada por (b << 2*bits) | (g << bits) | r.
+        """
+        n = 1 << self.bits
+        centers = (numpy.arange(n) << self._shift) + ((1 << self._shift) >> 1)
+
+        # Imagem com o centro de todas as caixas, na ordem do índice da tabela
+        b, g, r = numpy.meshgrid(centers, centers, centers, indexing="ij")
+        bgr = numpy.stack([b, g, r], axis=-1).astype(numpy.uint8).reshape(n * n, n, 3)
+
+        # HSV das caixas, uma conversão por gamma usado nos intervalos
+        from .processing_image import ProcessingImage  # Import local: processing_image importa este módulo
+        hsv = {None: openCv.cvtColor(bgr, openCv.COLOR_BGR2HSV)}
+
+        lut = numpy.zeros((n * n, n), dtype=numpy.uint8)
+        for name, ranges in self.classes.items():
+            for lower, upper, *gamma in ranges:
+                gamma = gamma[0] if gamma else None
+                if gamma not in hsv:
+                    hsv[gamma] = openCv.cvtColor(ProcessingImage.ligh_adjustment(bgr, gamma), openCv.COLOR_BGR2HSV)
+                inside = openCv.inRange(hsv[gamma], numpy.array(lower), numpy.array(upper))
+                lut[inside > 0] |= self.bit[name]
+
+        return lut.reshape(-1)
+
+    def thread_copy(self):
+        """
+        Cópia que compartilha a tabela (somente leitura) mas tem os próprios buffers, para classificar em outra
+        thread sem construir ou carregar a tabela de novo.
+        """
+        clone = copy.copy(self)
+        clone._buffers = {}
+        return clone
+
+    def _buffer(self, name, shape, dtype=numpy.uint8):
+        """Retorna um buffer reaproveitado entre chamadas, realocando apenas se o formato mudar"""
+        return reuse_buffer(self._buffers, name, shape, dtype)
+
+    def classify(self, frame):
+        """
+        Classifica todos os pixels do frame com uma consulta à tabela.
+
+        Args:
+            frame (numpy array): Frame BGR (ou uma faixa dele).
+
+        Returns:
+            numpy array: Rótulos uint8 (máscara de bits das classes) de cada pixel. O buffer é reaproveitado
+                         na próxima chamada.
+        """
+        # Nível quantizado de cada canal
+        quantized = self._buffer("quantized", frame.shape)
+        numpy.right_shift(frame, self._shift, out=quantized)
+
+        # Índice da caixa: b << 2*bits | g << bits | r, em uma única passada
+        wide = self._buffer("wide", frame.shape, numpy.int32)
+        numpy.copyto(wide, quantized)
+        index = openCv.transform(wide, self._weights, dst=self._buffer("index", frame.shape[:2], numpy.int32))
+
+        labels = self._buffer("labels", frame.shape[:2])
+        numpy.take(self.lut, index, out=labels)
+        return labels
+
+    def mask(self, labels, name):
+        """
+        Extrai a máscara (0/255, como a do inRange) de uma classe a partir dos rótulos de classify.
+
+        Args:
+            labels (numpy array): Rótulos retornados por classify.
+            name (str): Nome da classe.
+        """
+        return openCv.LUT(labels, self._mask_tables[name])
+
+    def masks(self, frame, names=None):
+        """
+        Classifica o frame e retorna as máscaras das classes.
+
+        Args:
+            frame (numpy array): Frame BGR (ou uma faixa dele).
+            names (list, optional): Classes desejadas. Defaults to todas.
+
+        Returns:
+            dict: Nome da classe -> máscara uint8 (0/255).
+        """
+        labels = self.classify(frame)
+        return {name: self.mask(labels, name) for name in (names or self.classes)}
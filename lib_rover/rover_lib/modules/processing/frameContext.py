@@ -0,0 +1,161 @@
+import cv2 as openCv
+import numpy
+from ...utils.buffers import reuse_buffer
+
+
+class FrameContext:
+    """
+    Cache das representações derivadas de um frame (HSV, escala de cinza, redimensionado, borrado),
+    compartilhado entre os detectores que processam o mesmo frame.
+
+    Cada representação é calculada só na primeira vez que algum detector a pede e reaproveitada
+    pelos demais. O cache é identificado pelo número de sequência do frame e descartado quando
+    update recebe o próximo frame. Os arrays retornados usam buffers reaproveitados entre frames,
+    então só são válidos até o próximo update.
+
+    Exemplo:
+        ctx = FrameContext()
+        frame, meta = camera.get_frame_with_meta()
+        ctx.update(frame, meta.seq)
+        vision.detect_obstacle(frame, ctx=ctx)
+        vision.process_frame_for_line_following(frame, ctx=ctx)  # reaproveita o HSV da detecção de obstáculos
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.seq = None
+        self._cache = {}  # Representações do frame atual, por chave
+        self._buffers = {}  # Buffers reaproveitados entre frames, por chave
+
+        # Contadores
+        self.hits = 0  # Pedidos atendidos pelo cache
+        self.misses = 0  # Representações calculadas
+
+    def update(self, frame, seq=None):
+        """
+        Define o frame atual, descartando as representações do frame anterior.
+
+        Args:
+            frame (numpy array): Frame BGR (ou plano de um canal).
+            seq (int, optional): Número de sequência do frame (FrameMeta.seq). Se for o mesmo do frame atual,
+                                 o cache é mantido. Defaults to None (sempre considera um frame novo).
+
+        Returns:
+            FrameContext: O próprio contexto.
+        """
+        if seq is not None and seq == self.seq and frame is self.frame:
+            return self
+
+        self.frame = frame
+        self.seq = seq
+        self._cache.clear()
+        return self
+
+    def _buffer(self, key, shape, dtype=numpy.uint8):
+        """Retorna o buffer da chave, realocando apenas se o formato mudar"""
+        return reuse_buffer(self._buffers, key, shape, dtype)
+
+    def _get(self, key):
+        """Retorna a representação em cache, ou None"""
+        value = self._cache.get(key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+    def _put(self, key, value):
+        """Guarda uma representação recém calculada"""
+        self.misses += 1
+        self._cache[key] = value
+        return value
+
+    def _source(self, size):
+        """Frame de origem: o original ou a versão redimensionada"""
+        return self.frame if size is None else self.resized(size)
+
+    def hsv(self, y0=0, size=None):
+        """
+        Retorna o frame em HSV a partir da linha y0.
+
+        Se alguma faixa que começa acima de y0 (ou o frame inteiro) já foi convertida, retorna uma view dela
+        sem nova conversão. Por isso, quando vários detectores usam o mesmo frame, o que usa a maior área
+        deve ser chamado primeiro.
+
+        Args:
+            y0 (int, optional): Primeira linha da faixa convertida. Defaults to 0 (frame inteiro).
+            size (tuple, optional): Converte a versão redimensionada (largura, altura) do frame. Defaults to None.
+        """
+        size = None if size is None else tuple(size)
+        for key, value in self._cache.items():
+            if key[0] == "hsv" and key[2] == size and key[1] <= y0:
+                self.hits += 1
+                return value[y0 - key[1]:]
+
+        band = self._source(size)[y0:]
+        hsv = self._buffer(("hsv", y0, size), band.shape)
+        openCv.cvtColor(band, openCv.COLOR_BGR2HSV, dst=hsv)
+        return self._put(("hsv", y0, size), hsv)
+
+    def gray(self, size=None):
+        """
+        Retorna o frame em escala de cinza.
+
+        Args:
+            size (tuple, optional): Converte a versão redimensionada (largura, altura) do frame. Defaults to None.
+        """
+        size = None if size is None else tuple(size)
+        key = ("gray", size)
+        gray = self._get(key)
+        if gray is not None:
+            return gray
+
+        source = self._source(size)
+        if source.ndim == 2:  # Frame já tem um canal
+            return self._put(key, source)
+
+        gray = self._buffer(key, source.shape[:2])
+        openCv.cvtColor(source, openCv.COLOR_BGR2GRAY, dst=gray)
+        return self._put(key, gray)
+
+    def resized(self, size, interpolation=openCv.INTER_LINEAR):
+        """
+        Retorna o frame redimensionado.
+
+        Args:
+            size (tuple): Tamanho (largura, altura) desejado.
+            interpolation (int, optional): Interpolação do openCv. Defaults to INTER_LINEAR (padrão do openCv.resize).
+        """
+        size = tuple(size)
+        if size == (self.frame.shape[1], self.frame.shape[0]):
+            return self.frame
+
+        key = ("resized", size, interpolation)
+        resized = self._get(key)
+        if resized is not None:
+            return resized
+
+        resized = self._buffer(key, (size[1], size[0]) + self.frame.shape[2:], self.frame.dtype)
+        openCv.resize(self.frame, size, dst=resized, interpolation=interpolation)
+        return self._put(key, resized)
+
+    def blurred(self, ksize=(5, 5), sigma=0, gray=False):
+        """
+        Retorna o frame suavizado por um filtro gaussiano.
+
+        Args:
+            ksize (tuple, optional): Tamanho do kernel. Defaults to (5, 5).
+            sigma (float, optional): Desvio padrão do kernel (0 calcula a partir do tamanho). Defaults to 0.
+            gray (bool, optional): Suaviza a versão em escala de cinza. Defaults to False.
+        """
+        key = ("blurred", tuple(ksize), sigma, gray)
+        blurred = self._get(key)
+        if blurred is not None:
+            return blurred
+
+        source = self.gray() if gray else self.frame
+        blurred = self._buffer(key, source.shape, source.dtype)
+        openCv.GaussianBlur(source, tuple(ksize), sigma, dst=blurred)
+        return self._put(key, blurred)
+
+    def get_stats(self):
+        """Retorna os contadores do cache."""
+        return {"seq": self.seq, "hits": self.hits, "misses": self.misses}
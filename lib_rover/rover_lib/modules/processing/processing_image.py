@@ -1,11 +1,39 @@
+import threading
 import cv2 as openCv
 import numpy
+from .colorClassifier import ColorClassifier
+from ...utils.buffers import reuse_buffer
 
 class ProcessingImage:
     """
         Modulo reposavel pelo pre-processamento de imagens, com metodos para aplicacao de filtros, segmentacao 
         entre outras ferramentas de pre-processamento
     """
+
+    _gamma_tables = {} # Tabelas de gamma ja calculadas, por valor de gamma
+    _local = threading.local() # Estado de cada thread: mascaras intermediarias e classificadores da segmentacao fundida
+    _dual_classifiers = {} # Classificadores da segmentacao fundida, por intervalos: a tabela de 16 MB e unica no processo
+    _dual_lock = threading.Lock()
+
+    # Kernels da limpeza das mascaras (resolucao original e metade)
+    _KERNEL_OPEN = numpy.ones((5, 5), numpy.uint8)
+    _KERNEL_CLOSE = numpy.ones((15, 15), numpy.uint8)
+    _KERNEL_OPEN_HALF = numpy.ones((3, 3), numpy.uint8)
+    _KERNEL_CLOSE_HALF = numpy.ones((7, 7), numpy.uint8)
+
+    @classmethod
+    def gamma_table(cls, gamma):
+        """
+            Retorna a tabela de correcao (0-255) do gamma, calculada uma unica vez por valor de gamma
+        """
+        table = cls._gamma_tables.get(gamma)
+        if table is None:
+            table = numpy.array([
+                ((i / 255.0) ** gamma) * 255
+                for i in range(256)
+            ]).astype("uint8")
+            cls._gamma_tables[gamma] = table
+        return table
     
     @classmethod 
     def ligh_adjustment(cls, img, gamma=1.9):
@@ -19,10 +47,7 @@ class ProcessingImage:
         """
         
         # tabela de correção (0–255), faz uma nova quantização das cores
-        table = numpy.array([
-            ((i / 255.0) ** gamma) * 255
-            for i in range(256)
-        ]).astype("uint8")
+        table = cls.gamma_table(gamma)
 
         # Aplica a nova quantização aos pixels do frame
         corrected = openCv.LUT(img, table)
@@ -30,7 +55,7 @@ class ProcessingImage:
         return corrected
     
     @classmethod
-    def color_segmentation(cls, img, low_color1=(0, 120, 70), upper_color1=(10, 255, 255), low_color2=(170, 120, 70), upper_color2=(180, 255, 255)):
+    def color_segmentation(cls, img, low_color1=(0, 120, 70), upper_color1=(10, 255, 255), low_color2=(170, 120, 70), upper_color2=(180, 255, 255), hsv=None, quality="full", dst=None):
         """
             Aplica segmentacao por cor, utilizando os tons de cores passados como parametro.
             Por padrão segmenta a cor vemelha
@@ -40,49 +65,119 @@ class ProcessingImage:
             upper_color1 (tuple, optional): Nivel altor da cor. Defaults to (10, 255, 255).
             low_color2 (tuple, optional): Nivel baixo da cor. Defaults to (170, 120, 70).
             upper_color2 (tuple, optional): Nivel alto da cor. Defaults to (180, 255, 255).
+            hsv (numpy array, optional): Imagem ja convertida para HSV (ex: FrameContext.hsv()), evita nova conversao. Defaults to None.
+            quality (str, optional): Qualidade da limpeza da mascara, "full", "balanced" ou "fast" (ver _clean_mask). Defaults to "full".
+            dst (numpy array, optional): Buffer de saida (uint8, do tamanho da imagem). Defaults to None (nova mascara).
         
         return (numpy array): imagem com a cor segmentada.
         """
         
         # Converte a escala de por par HSV
-        color_hsv = openCv.cvtColor(img, openCv.COLOR_BGR2HSV)
+        color_hsv = openCv.cvtColor(img, openCv.COLOR_BGR2HSV) if hsv is None else hsv
+        shape = color_hsv.shape[:2]
         
         # Cria mascara com os cores passadas por parâmetro
-        mask1 = openCv.inRange(color_hsv, numpy.array(low_color1), numpy.array(upper_color1))
-        mask2 = openCv.inRange(color_hsv, numpy.array(low_color2), numpy.array(upper_color2))
+        mask1 = openCv.inRange(color_hsv, numpy.array(low_color1), numpy.array(upper_color1), dst=cls._buffer("mask1", shape))
+        mask2 = openCv.inRange(color_hsv, numpy.array(low_color2), numpy.array(upper_color2), dst=cls._buffer("mask2", shape))
         
         # Mecla as duas mascaras
-        red_mask = openCv.bitwise_or(mask1, mask2)
-        
-        # limpa o ruido das mascaras
-        red_mask = openCv.morphologyEx(red_mask, openCv.MORPH_OPEN, numpy.ones((5, 5), numpy.uint8))
-        
-        # Preenche buracos internos na mascara
-        kernel_close = numpy.ones((15, 15), numpy.uint8)
-        mask_close = openCv.morphologyEx(red_mask, openCv.MORPH_CLOSE, kernel_close)
-        
-        # preparando preenchimento de regioes por meio do floodfil
-        fil = mask_close.copy()
-        h, w = fil.shape[:2]
-        
-        # Mascara de preenchimento
-        flood_mask = numpy.zeros((h + 2, w + 2), numpy.uint8)
-        openCv.floodFill(fil, flood_mask, (0, 0), 255)
-        fil_inv = openCv.bitwise_not(fil)
-        
-        # aplica floodfil na mascara
-        mask_fil = mask_close | fil_inv # type: ignore
-        
-        # Borra imagem 
-        mask_fil = openCv.GaussianBlur(mask_fil, (9, 9), 2)
-        
-        return mask_fil
+        red_mask = openCv.bitwise_or(mask1, mask2, dst=cls._buffer("red", shape))
+
+        return cls._clean_mask(red_mask, quality, dst)
+
+    @classmethod
+    def _thread_state(cls, name):
+        """Dicionario name da thread atual, criado na primeira chamada da thread"""
+        state = getattr(cls._local, name, None)
+        if state is None:
+            state = {}
+            setattr(cls._local, name, state)
+        return state
+
+    @classmethod
+    def _buffer(cls, name, shape, dtype=numpy.uint8):
+        """Retorna um buffer da thread atual reaproveitado entre chamadas, realocando apenas se o formato mudar"""
+        return reuse_buffer(cls._thread_state("buffers"), name, shape, dtype)
+
+    @classmethod
+    def _clean_mask(cls, red_mask, quality="full", dst=None):
+        """
+            Limpa o ruido, preenche os buracos e suaviza a mascara segmentada.
+
+            "full": abertura 5x5, fechamento 15x15, preenchimento por floodFill a partir do canto e blur 9x9.
+            "balanced": abertura e fechamento na metade da resolucao (kernels 3x3 e 7x7), buracos preenchidos
+                        desenhando os contornos externos cheios e blur 9x9.
+            "fast": como balanced, mas tudo na metade da resolucao e sem blur (mascara binaria), para quem
+                    usa contornos ou momentos da mascara.
+
+            O preenchimento pelos contornos nao fecha regioes cercadas pela borda da imagem, como o floodFill fecha.
+        """
+        h, w = red_mask.shape[:2]
+        if dst is None:
+            dst = numpy.empty((h, w), numpy.uint8)
+
+        if quality == "full":
+            # limpa o ruido das mascaras
+            red_mask = openCv.morphologyEx(red_mask, openCv.MORPH_OPEN, cls._KERNEL_OPEN, dst=cls._buffer("open", (h, w)))
+            
+            # Preenche buracos internos na mascara
+            mask_close = openCv.morphologyEx(red_mask, openCv.MORPH_CLOSE, cls._KERNEL_CLOSE, dst=cls._buffer("close", (h, w)))
+            
+            # preparando preenchimento de regioes por meio do floodfil
+            fil = cls._buffer("fill", (h, w))
+            numpy.copyto(fil, mask_close)
+            
+            # Mascara de preenchimento
+            flood_mask = cls._buffer("flood", (h + 2, w + 2))
+            flood_mask.fill(0)
+            openCv.floodFill(fil, flood_mask, (0, 0), 255)
+            fil_inv = openCv.bitwise_not(fil, dst=fil)
+            
+            # aplica floodfil na mascara
+            mask_fil = openCv.bitwise_or(mask_close, fil_inv, dst=fil)
+            
+            # Borra imagem 
+            return openCv.GaussianBlur(mask_fil, (9, 9), 2, dst=dst)
+
+        if quality not in ("balanced", "fast"):
+            raise ValueError(f"Qualidade desconhecida: {quality}")
+
+        # Abertura e fechamento na metade da resolucao, com os kernels reduzidos na mesma escala
+        half = (max(1, w // 2), max(1, h // 2))
+        small = openCv.resize(red_mask, half, dst=cls._buffer("small", half[::-1]), interpolation=openCv.INTER_NEAREST)
+        openCv.morphologyEx(small, openCv.MORPH_OPEN, cls._KERNEL_OPEN_HALF, dst=small)
+        openCv.morphologyEx(small, openCv.MORPH_CLOSE, cls._KERNEL_CLOSE_HALF, dst=small)
+
+        if quality == "fast":
+            # Preenche os buracos ainda na metade da resolucao e so amplia o resultado
+            contours, _ = openCv.findContours(small, openCv.RETR_EXTERNAL, openCv.CHAIN_APPROX_SIMPLE)
+            filled = cls._buffer("filled_small", half[::-1])
+            filled.fill(0)
+            openCv.drawContours(filled, contours, -1, 255, openCv.FILLED)
+            return openCv.resize(filled, (w, h), dst=dst, interpolation=openCv.INTER_NEAREST)
+
+        mask_close = openCv.resize(small, (w, h), dst=cls._buffer("close", (h, w)), interpolation=openCv.INTER_LINEAR)
+        openCv.threshold(mask_close, 127, 255, openCv.THRESH_BINARY, dst=mask_close)
+
+        # Contornos externos cheios: a regiao mais os buracos dentro dela
+        contours, _ = openCv.findContours(mask_close, openCv.RETR_EXTERNAL, openCv.CHAIN_APPROX_SIMPLE)
+        filled = cls._buffer("fill", (h, w))
+        filled.fill(0)
+        openCv.drawContours(filled, contours, -1, 255, openCv.FILLED)
+
+        return openCv.GaussianBlur(filled, (9, 9), 2, dst=dst)
     
     @classmethod
-    def color_dual_segmentation(cls, img, gamma=2.3, low_color1=(0, 120, 70), upper_color1=(10, 255, 255), low_color2=(170, 120, 70), upper_color2=(180, 255, 255)):
+    def color_dual_segmentation(cls, img, gamma=2.3, low_color1=(0, 120, 70), upper_color1=(10, 255, 255), low_color2=(170, 120, 70), upper_color2=(180, 255, 255), ctx=None, fused=False, quality="full"):
         """
             Aplica segmentacao por cor, utilizando os tons de cores passados como parametro.
             Por padrão segmenta a cor vemelha. Realiza segmentacao dupla, para diferentes niveis de brilho de acordo com o gamma passado.
+
+            Com fused=True as duas classificacoes de cor viram uma so: uma tabela 3D (ColorClassifier) com as
+            classes "normal" e "escura" (intervalos testados na imagem escurecida) gera as duas mascaras em uma
+            unica consulta, sem o ajuste de brilho e as conversoes para HSV. A tabela usa as cores sem quantizacao
+            (16 MB, guardada em cache no disco), e cada mascara e limpa separadamente antes da uniao, entao o
+            resultado e o mesmo da segmentacao dupla (ver benchmark_dual_segmentation).
         Args:
             img (_type_): _description_
             gamma (float, optional): _description_. Defaults to 2.3.
@@ -90,18 +185,56 @@ class ProcessingImage:
             upper_color1 (tuple, optional): _description_. Defaults to (10, 255, 255).
             low_color2 (tuple, optional): _description_. Defaults to (170, 120, 70).
             upper_color2 (tuple, optional): _description_. Defaults to (180, 255, 255).
+            ctx (FrameContext, optional): Contexto do frame img, reaproveita o redimensionamento e o HSV ja calculados. Defaults to None.
+            fused (bool, optional): Segmentacao fundida em uma passada. Defaults to False.
+            quality (str, optional): Qualidade da limpeza das mascaras, ver color_segmentation. Defaults to "full".
 
         Returns:
             _type_: _description_
         """
-        
-        frame = openCv.resize(img, (640, 640))
+        # O escurecimento usa gamma 2.5 fixo (o parametro gamma nao e usado)
+        dark_gamma = 2.5
+
+        if fused:
+            frame = openCv.resize(img, (640, 640)) if ctx is None else ctx.resized((640, 640))
+            # Intervalos como tuplas de inteiros: chave do cache tambem quando vem listas ou arrays
+            ranges = tuple(tuple(tuple(int(v) for v in limit) for limit in pair)
+                           for pair in ((low_color1, upper_color1), (low_color2, upper_color2)))
+
+            # A tabela e compartilhada pelas threads; cada thread usa uma copia com os proprios buffers do classify
+            classifiers = cls._thread_state("dual_classifiers")
+            classifier = classifiers.get(ranges)
+            if classifier is None:
+                with cls._dual_lock:
+                    shared = cls._dual_classifiers.get(ranges)
+                    if shared is None:
+                        # Sem quantizacao (8 bits por canal): a tabela reproduz exatamente o cvtColor + inRange
+                        shared = ColorClassifier({
+                            "normal": list(ranges),
+                            "escura": [(lower, upper, dark_gamma) for lower, upper in ranges],
+                        }, bits=8)
+                        cls._dual_classifiers[ranges] = shared
+                classifier = shared.thread_copy()
+                classifiers[ranges] = classifier
+
+            # As duas mascaras saem da mesma consulta e sao limpas separadamente, como na segmentacao dupla
+            labels = classifier.classify(frame)
+            mask_red_dark = cls._clean_mask(classifier.mask(labels, "escura"), quality)
+            mask_red_normal = cls._clean_mask(classifier.mask(labels, "normal"), quality)
+            return openCv.bitwise_or(mask_red_dark, mask_red_normal)
+
+        if ctx is None:
+            frame = openCv.resize(img, (640, 640))
+            hsv = None
+        else:
+            frame = ctx.resized((640, 640))
+            hsv = ctx.hsv(size=(640, 640))
         
         # Aplica filtro para escurecer a imagem
-        dark = ProcessingImage.ligh_adjustment(frame, 2.5)
+        dark = ProcessingImage.ligh_adjustment(frame, dark_gamma)
 
-        mask_red_dark = ProcessingImage.color_segmentation(dark) # Aplica segmentação por cor na mascara escurecida
-        mask_red_normal = ProcessingImage.color_segmentation(frame) # Aplica segmentação por cor na mascara normal
+        mask_red_dark = ProcessingImage.color_segmentation(dark, quality=quality) # Aplica segmentação por cor na mascara escurecida
+        mask_red_normal = ProcessingImage.color_segmentation(frame, hsv=hsv, quality=quality) # Aplica segmentação por cor na mascara normal
         
         # Mescla as duas mascaras
         mask_final = openCv.bitwise_or(mask_red_dark, mask_red_normal)
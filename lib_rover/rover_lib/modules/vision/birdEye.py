@@ -0,0 +1,137 @@
+import hashlib
+import os
+import cv2 as openCv
+import numpy
+from ...utils.npcache import load_or_build
+
+# Diretório padrão do cache dos mapas em disco
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "rover_lib", "bird_eye")
+
+# Versão do formato dos mapas (muda a chave do cache quando a construção muda)
+_MAPS_VERSION = 1
+
+
+class BirdEyeView:
+    """
+    Vista de cima (perspectiva inversa) do chão à frente do Rover, para medir a linha em distâncias
+    no chão em vez de pixels da imagem, que não são lineares com a distância.
+
+    A homografia leva um retângulo do chão, visto na imagem, para uma grade métrica de pixels_per_meter.
+    Os mapas do remap equivalentes ao warpPerspective são calculados uma única vez com
+    initUndistortRectifyMap (que também remove a distorção da lente, se a calibração for informada),
+    convertidos para ponto fixo (CV_16SC2) e guardados em disco. Cada frame custa um único remap, e só
+    as linhas da imagem a partir de roi_start_y são lidas.
+    """
+
+    def __init__(self, src_points, ground_size, resolution, pixels_per_meter=200, roi_start_y=None,
+                 camera_matrix=None, dist_coeffs=None, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Args:
+            src_points (list): Quatro pontos (x, y) da imagem, em pixels do frame recebido, com os cantos de um
+                               retângulo no chão: inferior esquerdo, inferior direito, superior direito, superior esquerdo.
+            ground_size (tuple): Dimensões (largura, profundidade) do retângulo no chão, em metros.
+            resolution (tuple): Resolução (largura, altura) dos frames de entrada.
+            pixels_per_meter (float, optional): Resolução da grade de cima. Defaults to 200 (5 mm por pixel).
+            roi_start_y (int, optional): Primeira linha da imagem usada pelo remap. Defaults to a linha do ponto
+                                         mais alto de src_points.
+            camera_matrix (numpy array, optional): Matriz intrínseca K da câmera (ver modules/camera/calibration.py).
+                                                   Com ela, src_points são coordenadas da imagem sem distorção.
+                                                   Defaults to None.
+            dist_coeffs (numpy array, optional): Coeficientes de distorção da lente. Defaults to None.
+            cache_dir (str, optional): Diretório do cache dos mapas. None desabilita o cache.
+                                       Defaults to ~/.cache/rover_lib/bird_eye.
+        """
+        self.src_points = numpy.asarray(src_points, dtype=numpy.float32).reshape(4, 2)
+        self.ground_size = (float(ground_size[0]), float(ground_size[1]))
+        self.resolution = (int(resolution[0]), int(resolution[1]))
+        self.pixels_per_meter = float(pixels_per_meter)
+        self.camera_matrix = None if camera_matrix is None else numpy.asarray(camera_matrix, dtype=numpy.float64)
+        self.dist_coeffs = None if dist_coeffs is None else numpy.asarray(dist_coeffs, dtype=numpy.float64).ravel()
+
+        if roi_start_y is None:
+            roi_start_y = int(numpy.floor(self.src_points[:, 1].min()))
+        self.roi_start_y = max(0, min(int(roi_start_y), self.resolution[1] - 1))
+
+        # Grade de cima: origem no canto superior esquerdo, o Rover abaixo da borda inferior
+        self.size = (
+            max(1, int(round(self.ground_size[0] * self.pixels_per_meter))),
+            max(1, int(round(self.ground_size[1] * self.pixels_per_meter))),
+        )
+        width, height = self.size
+        dst_points = numpy.float32([[0, height - 1], [width - 1, height - 1], [width - 1, 0], [0, 0]])
+        self.homography = openCv.getPerspectiveTransform(self.src_points, dst_points)
+
+        self.map1, self.map2 = self._load_or_build(cache_dir)
+        self._output = None
+
+    def cache_key(self):
+        """Hash que identifica os mapas (homografia, calibração, resolução, grade e faixa usada)."""
+        digest = hashlib.sha1()
+        digest.update(repr((_MAPS_VERSION, self.resolution, self.size, self.roi_start_y)).encode())
+        for array in (self.homography, self.camera_matrix, self.dist_coeffs):
+            if array is not None:
+                digest.update(numpy.ascontiguousarray(array, dtype=numpy.float64).tobytes())
+        return digest.hexdigest()
+
+    def _load_or_build(self, cache_dir):
+        """Carrega os mapas do cache em disco ou os calcula (e grava no cache)"""
+        path = None if cache_dir is None else os.path.join(cache_dir, f"{self.cache_key()}.npz")
+        return load_or_build(path, self.build_maps, lambda maps: len(maps) == 2)
+
+    def build_maps(self):
+        """
+        Calcula os mapas do remap em ponto fixo.
+
+        Para cada pixel (u, v) da grade, initUndistortRectifyMap calcula K * distorce(R⁻¹ [u v 1]). Com
+        R = homografia * K (ou só a homografia, sem calibração), R⁻¹ [u v 1] é o ponto da imagem sem distorção
+        em coordenadas normalizadas, e o resultado é o pixel da imagem original, como no warpPerspective.
+
+        Returns:
+            tuple: (map1, map2) nos formatos CV_16SC2 e CV_16UC1, relativos à faixa a partir de roi_start_y.
+        """
+        if self.camera_matrix is None:
+            camera_matrix, dist_coeffs = numpy.eye(3), None
+            rotation = self.homography
+        else:
+            camera_matrix, dist_coeffs = self.camera_matrix, self.dist_coeffs
+            rotation = self.homography @ self.camera_matrix
+
+        map_x, map_y = openCv.initUndistortRectifyMap(
+            camera_matrix, dist_coeffs, rotation, numpy.eye(3), self.size, openCv.CV_32FC1
+        )
+
+        # Coordenadas relativas à faixa lida pelo remap
+        map_y -= self.roi_start_y
+
+        return openCv.convertMaps(map_x, map_y, openCv.CV_16SC2)
+
+    def apply(self, frame, dst=None):
+        """
+        Gera a vista de cima do frame.
+
+        Args:
+            frame (numpy array): Frame recebido, na resolução informada na construção.
+            dst (numpy array, optional): Buffer de saída. Defaults to um buffer interno reaproveitado
+                                         (válido até a próxima chamada).
+
+        Returns:
+            numpy array: Imagem da grade de cima, com tamanho size.
+        """
+        if dst is None:
+            shape = (self.size[1], self.size[0]) + frame.shape[2:]
+            if self._output is None or self._output.shape != shape or self._output.dtype != frame.dtype:
+                self._output = numpy.empty(shape, dtype=frame.dtype)
+            dst = self._output
+
+        band = frame[self.roi_start_y:]
+        openCv.remap(band, self.map1, self.map2, openCv.INTER_LINEAR, dst=dst, borderMode=openCv.BORDER_CONSTANT)
+        return dst
+
+    def to_ground(self, x, y):
+        """
+        Converte um pixel da grade de cima para coordenadas no chão em metros: (lateral, à frente), com
+        a lateral medida a partir do centro da grade e a distância a partir da borda inferior do retângulo.
+        """
+        lateral = (x - (self.size[0] - 1) / 2) / self.pixels_per_meter
+        forward = (self.size[1] - 1 - y) / self.pixels_per_meter
+        return lateral, forward
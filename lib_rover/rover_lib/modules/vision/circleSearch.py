@@ -0,0 +1,66 @@
+import numpy
+
+
+class CircleSearchWindow:
+    """
+    Janela de busca para a detecção de círculos (houghCircleDetect e circleCannyDetect) quando a bola já
+    foi encontrada.
+
+    A posição vem da previsão de um CircleTracker (o único estimador do movimento): a cada frame o rastreador
+    é avançado com predict antes da detecção, e apenas um recorte em torno da posição prevista é examinado,
+    com folga proporcional ao raio e à incerteza da previsão. Como a incerteza cresce a cada frame sem
+    detecção, a janela cresce junto; depois de max_misses falhas seguidas do rastreador, a busca volta ao
+    frame inteiro.
+
+    Exemplo:
+        tracker = CircleTracker()
+        search = CircleSearchWindow(tracker, (640, 640))
+        tracker.predict()
+        det = VisionModule.circleCannyDetect(mask, roi=search.roi())
+        circle = tracker.correct(det)
+    """
+
+    def __init__(self, tracker, frame_size, margin=1.5, n_sigma=3.0, padding=16, max_misses=5):
+        """
+        Args:
+            tracker (CircleTracker): Rastreador que fornece a posição prevista e a sua incerteza.
+            frame_size (tuple): Tamanho (largura, altura) da imagem onde os círculos são procurados.
+            margin (float, optional): Meia largura da janela em raios do círculo. Defaults to 1.5.
+            n_sigma (float, optional): Folga em desvios padrão da inovação do centro (incerteza da previsão
+                                       mais o ruído do detector). Defaults to 3.0, pouco além do portão de 95%
+                                       do CircleTracker.
+            padding (int, optional): Folga fixa da janela em pixels. Defaults to 16.
+            max_misses (int, optional): Falhas seguidas do rastreador antes de voltar à busca completa. Defaults to 5.
+        """
+        self.tracker = tracker
+        self.frame_size = (int(frame_size[0]), int(frame_size[1]))
+        self.margin = margin
+        self.n_sigma = n_sigma
+        self.padding = padding
+        self.max_misses = max_misses
+
+    @property
+    def locked(self):
+        """True enquanto a busca fica restrita à janela em volta da previsão."""
+        return self.tracker.tracking and self.tracker.misses <= self.max_misses
+
+    def roi(self):
+        """
+        Retorna o recorte (x0, y0, x1, y1) a examinar no frame atual, ou None para o frame inteiro. Usa o
+        estado do rastreador, então deve ser chamado depois do predict do frame.
+        """
+        if not self.locked:
+            return None
+
+        x, y, r = self.tracker.state[:3]
+        S = self.tracker.innovation_covariance()
+        half = self.margin * max(r, 0.0) + self.n_sigma * numpy.sqrt(max(S[0, 0], S[1, 1])) + self.padding
+
+        width, height = self.frame_size
+        x0, y0 = max(0, int(x - half)), max(0, int(y - half))
+        x1, y1 = min(width, int(x + half) + 1), min(height, int(y + half) + 1)
+        if x1 - x0 >= width and y1 - y0 >= height:
+            return None
+        if x1 <= x0 or y1 <= y0:  # Previsão fora do frame
+            return None
+        return x0, y0, x1, y1
@@ -0,0 +1,168 @@
+import numpy
+
+# Quantil 95% da chi-quadrado com 3 graus de liberdade (x, y, r)
+GATE_95 = 7.81
+
+
+class CircleTracker:
+    """
+    Rastreia um círculo (a bola) com um filtro de Kalman de velocidade constante sobre (x, y, r).
+
+    O estado é (x, y, r, vx, vy, vr), com as velocidades em pixels por passo. Cada detecção é comparada com a
+    previsão pela distância de Mahalanobis (que considera a incerteza atual da previsão); detecções fora do
+    portão (gate) são tratadas como falha, em vez de puxar a estimativa para outro objeto. Depois de
+    max_misses falhas seguidas o rastreamento é descartado e a próxima detecção o reinicia.
+
+    predict avança a estimativa sem medição, para obter a posição a cada ciclo de controle rodando o
+    detector (caro) só em alguns frames. Para buscar a bola em volta da previsão (CircleSearchWindow), o
+    frame é previsto com predict antes da detecção e corrigido depois com correct; update faz os dois passos.
+    """
+
+    def __init__(self, process_noise=2.0, measurement_noise=4.0, gate=GATE_95, max_misses=10, initial_velocity_std=30.0):
+        """
+        Args:
+            process_noise (float, optional): Desvio da aceleração (pixels por passo²), quanto a bola pode mudar de
+                                             velocidade. Defaults to 2.0.
+            measurement_noise (float, optional): Desvio do erro do detector em pixels. Defaults to 4.0.
+            gate (float, optional): Distância de Mahalanobis² máxima para aceitar uma detecção. Defaults to 7.81
+                                    (95% para 3 graus de liberdade).
+            max_misses (int, optional): Falhas seguidas antes de descartar o rastreamento. Defaults to 10.
+            initial_velocity_std (float, optional): Desvio da velocidade desconhecida na primeira detecção
+                                                    (pixels por passo). Defaults to 30.0.
+        """
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.gate = gate
+        self.max_misses = max_misses
+        self.initial_velocity_std = initial_velocity_std
+
+        self.H = numpy.hstack((numpy.eye(3), numpy.zeros((3, 3))))  # Mede apenas (x, y, r)
+        self.R = numpy.eye(3) * measurement_noise ** 2
+        self.reset()
+
+    def reset(self):
+        """Descarta o rastreamento."""
+        self.state = None  # (x, y, r, vx, vy, vr)
+        self.covariance = None
+        self.misses = 0
+        self.hits = 0  # Detecções aceitas desde o início do rastreamento
+        self.last_distance = None  # Distância de Mahalanobis² da última detecção comparada
+
+    @property
+    def tracking(self):
+        """True enquanto há uma estimativa."""
+        return self.state is not None
+
+    @property
+    def circle(self):
+        """Estimativa atual (x, y, r) em pixels inteiros, ou None."""
+        if self.state is None:
+            return None
+        x, y, r = self.state[:3]
+        return int(round(x)), int(round(y)), max(0, int(round(r)))
+
+    @property
+    def velocity(self):
+        """Velocidade estimada (vx, vy) do centro em pixels por passo, ou None."""
+        if self.state is None:
+            return None
+        return float(self.state[3]), float(self.state[4])
+
+    def _transition(self, dt):
+        """Matrizes F e Q do modelo de velocidade constante para um passo dt"""
+        F = numpy.eye(6)
+        F[:3, 3:] = numpy.eye(3) * dt
+
+        # Aceleração aleatória constante durante o passo (ruído branco discretizado)
+        q = self.process_noise ** 2
+        Q = numpy.zeros((6, 6))
+        Q[:3, :3] = numpy.eye(3) * q * dt ** 4 / 4
+        Q[:3, 3:] = Q[3:, :3] = numpy.eye(3) * q * dt ** 3 / 2
+        Q[3:, 3:] = numpy.eye(3) * q * dt ** 2
+        return F, Q
+
+    def _start(self, circle):
+        """Inicia o rastreamento na detecção, com velocidade desconhecida"""
+        self.state = numpy.array([*map(float, circle), 0.0, 0.0, 0.0])
+        self.covariance = numpy.diag([self.measurement_noise ** 2] * 3 + [self.initial_velocity_std ** 2] * 3)
+        self.misses = 0
+        self.hits = 1
+        self.last_distance = None
+
+    def predict(self, dt=1.0):
+        """
+        Avança a estimativa dt passos sem medição (não conta como falha).
+
+        Returns:
+            tuple: Estimativa prevista (x, y, r), ou None sem rastreamento.
+        """
+        if self.state is None:
+            return None
+
+        F, Q = self._transition(dt)
+        self.state = F @ self.state
+        self.covariance = F @ self.covariance @ F.T + Q
+        return self.circle
+
+    def innovation_covariance(self):
+        """Covariância (3x3) da diferença esperada entre a detecção e a estimativa atual de (x, y, r), ou None."""
+        if self.state is None:
+            return None
+        return self.H @ self.covariance @ self.H.T + self.R
+
+    def distance(self, circle):
+        """Distância de Mahalanobis² entre uma detecção (x, y, r) e a estimativa atual, ou None sem rastreamento."""
+        if self.state is None:
+            return None
+
+        innovation = numpy.asarray(circle, dtype=numpy.float64) - self.H @ self.state
+        return float(innovation @ numpy.linalg.solve(self.innovation_covariance(), innovation))
+
+    def update(self, circle, dt=1.0):
+        """
+        Avança a estimativa dt passos e corrige com a detecção do frame.
+
+        Args:
+            circle (tuple): Círculo (x, y, r) detectado, ou None se o detector falhou.
+            dt (float, optional): Passos desde a última chamada (ex: 2 se o frame anterior foi só previsto).
+                                  Defaults to 1.0.
+
+        Returns:
+            tuple: Estimativa (x, y, r) após a correção, ou None sem rastreamento.
+        """
+        if self.state is not None:
+            self.predict(dt)
+        return self.correct(circle)
+
+    def correct(self, circle):
+        """
+        Corrige a estimativa atual, já prevista para o frame com predict, com a detecção do frame.
+
+        Args:
+            circle (tuple): Círculo (x, y, r) detectado, ou None se o detector falhou (conta como falha).
+
+        Returns:
+            tuple: Estimativa (x, y, r) após a correção, ou None sem rastreamento.
+        """
+        if self.state is None:
+            if circle is not None:
+                self._start(circle)
+            return self.circle
+
+        if circle is not None:
+            self.last_distance = self.distance(circle)
+            if self.last_distance <= self.gate:
+                z = numpy.asarray(circle, dtype=numpy.float64)
+                S = self.innovation_covariance()
+                K = self.covariance @ self.H.T @ numpy.linalg.inv(S)
+                self.state = self.state + K @ (z - self.H @ self.state)
+                self.covariance = (numpy.eye(6) - K @ self.H) @ self.covariance
+                self.misses = 0
+                self.hits += 1
+                return self.circle
+
+        # Sem detecção ou detecção fora do portão
+        self.misses += 1
+        if self.misses > self.max_misses:
+            self.reset()
+        return self.circle
@@ -0,0 +1,119 @@
+import numpy
+
+
+class LineLocalizer:
+    """
+    Localiza a linha pelo histograma de colunas da máscara, em vez do centroide de todos os pixels brancos.
+
+    O histograma (soma de cada coluna da faixa) é suavizado por uma janela do tamanho da largura esperada da
+    linha, usando a soma acumulada (imagem integral 1D), e cada pico é um candidato a linha. Uma segunda
+    linha, um cruzamento ou um reflexo viram picos separados em vez de deslocar o centroide.
+
+    Enquanto a linha está travada, apenas uma janela em torno da última posição é examinada (search_window),
+    e o pico escolhido é o mais próximo da posição anterior. Depois de max_misses frames sem um pico
+    confiável, a busca volta a varrer a largura inteira.
+    """
+
+    def __init__(self, line_width, window=None, min_confidence=0.2, max_misses=5):
+        """
+        Args:
+            line_width (int): Largura esperada da linha em pixels (tamanho da janela de suavização).
+            window (int, optional): Meia largura da janela de busca com a linha travada. Defaults to 2 * line_width.
+            min_confidence (float, optional): Confiança mínima para aceitar um pico. Defaults to 0.2.
+            max_misses (int, optional): Frames seguidos sem detecção antes de voltar à busca completa. Defaults to 5.
+        """
+        self.line_width = max(1, int(line_width))
+        self.window = int(window) if window is not None else 2 * self.line_width
+        self.min_confidence = min_confidence
+        self.max_misses = max_misses
+        self.reset()
+
+    def reset(self):
+        """Descarta o rastreamento, a próxima busca varre a largura inteira."""
+        self.x = None  # Última posição da linha (coluna, em pixels)
+        self.confidence = 0.0
+        self.locked = False
+        self.misses = 0
+        self.peaks = []  # Picos (coluna, confiança) da última busca
+
+    def search_window(self, width):
+        """
+        Retorna o intervalo de colunas [x0, x1) a examinar no próximo frame.
+
+        Args:
+            width (int): Largura do frame.
+        """
+        if not self.locked:
+            return 0, width
+        x = int(round(self.x))
+        return max(0, x - self.window), min(width, x + self.window + 1)
+
+    def _find_peaks(self, columns, band_height):
+        """Picos do histograma suavizado: lista de (coluna refinada, confiança), sem laço por coluna"""
+        w = min(self.line_width, len(columns))
+
+        # Imagens integrais 1D da contagem e do momento de cada coluna
+        counts = numpy.zeros(len(columns) + 1, dtype=numpy.float64)
+        numpy.cumsum(columns, out=counts[1:])
+        moments = numpy.zeros(len(columns) + 1, dtype=numpy.float64)
+        numpy.cumsum(columns * numpy.arange(len(columns)), out=moments[1:])
+
+        # Soma de cada janela [i, i + w)
+        box = counts[w:] - counts[:-w]
+        confidence = box / (255.0 * band_height * w)
+
+        # Máximos locais acima da confiança mínima (o último ponto de um platô conta como máximo)
+        padded = numpy.concatenate(([-1.0], box, [-1.0]))
+        is_peak = (box >= padded[:-2]) & (box > padded[2:]) & (confidence >= self.min_confidence)
+        starts = numpy.flatnonzero(is_peak)
+        if len(starts) == 0:
+            return []
+
+        # Supressão de picos a menos de uma largura de linha de um pico mais forte
+        order = starts[numpy.argsort(-box[starts])]
+        kept = []
+        for start in order:
+            if all(abs(int(start) - k) >= w for k in kept):
+                kept.append(int(start))
+
+        # Posição refinada pelo centroide em torno da janela do pico (cobre linhas mais largas que w)
+        peaks = []
+        for start in kept:
+            lo, hi = max(0, start - w // 2), min(len(columns), start + w + w // 2)
+            mass = counts[hi] - counts[lo]
+            x = (moments[hi] - moments[lo]) / mass if mass > 0 else start + w / 2
+            peaks.append((float(x), min(1.0, float(confidence[start]))))
+
+        return peaks
+
+    def update(self, columns, offset, band_height):
+        """
+        Atualiza a posição da linha com o histograma de colunas da janela examinada.
+
+        Args:
+            columns (numpy array): Soma de cada coluna da máscara (0/255) nas colunas [offset, offset + len).
+            offset (int): Primeira coluna do histograma (x0 de search_window).
+            band_height (int): Altura da faixa somada.
+
+        Returns:
+            tuple: (x, confiança). x é a coluna da linha (a última conhecida se este frame falhou, ou None)
+                   e a confiança é 0.0 quando nenhum pico confiável foi encontrado.
+        """
+        self.peaks = [(x + offset, c) for x, c in self._find_peaks(numpy.asarray(columns, dtype=numpy.float64), band_height)]
+
+        if not self.peaks:
+            self.misses += 1
+            self.confidence = 0.0
+            if self.misses > self.max_misses:
+                self.locked = False  # Volta à busca completa, mantendo x como referência
+            return self.x, 0.0
+
+        # Com referência, o pico mais próximo dela; sem referência, o mais próximo do centro da janela
+        reference = self.x if self.x is not None else offset + len(columns) / 2
+        x, confidence = min(self.peaks, key=lambda peak: abs(peak[0] - reference))
+
+        self.x = x
+        self.confidence = confidence
+        self.locked = True
+        self.misses = 0
+        return x, confidence
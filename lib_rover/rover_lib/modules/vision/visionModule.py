@@ -1,27 +1,82 @@
 import cv2 as openCv
 import numpy 
 from ..processing.processing_image import ProcessingImage
+from .lineLocalizer import LineLocalizer
+from ...utils.buffers import reuse_buffer
+
+# Registro de cada objeto (blob) retornado por detect_obstacles
+OBSTACLE_DTYPE = numpy.dtype([
+    ("bbox", numpy.int32, (4,)),  # x, y, largura, altura
+    ("area", numpy.int32),  # contagem de pixels do objeto (não a contourArea de detect_obstacle)
+    ("centroid", numpy.float64, (2,)),  # x, y
+])
 
 class VisionModule:
     """
     Módulo responsável por processar frames da câmera e extrair informações
     para a navegação do Rover.
     """
-    def __init__(self, resolution):
+    # Início (fração da altura) da faixa inferior usada pelo seguidor de linha
+    LINE_ROI_START = 0.8
+
+    # Intervalo HSV da linha (Exemplo: Linha Branca)
+    LOWER_WHITE = numpy.array([0, 0, 200], dtype=numpy.uint8)
+    UPPER_WHITE = numpy.array([180, 25, 255], dtype=numpy.uint8)
+
+    def __init__(self, resolution, capture_roi=None, headless=False, bird_eye=None):
         """
         Inicializa o módulo de visão.
         Args:
             resolution (tuple): Resolução (largura, altura) dos frames de entrada.
+            capture_roi (float, optional): Fração da altura a partir da qual a câmera recorta os frames
+                                           (CameraModule(..., roi=...)). Os frames recebidos passam a conter
+                                           só a faixa inferior, e as coordenadas são ajustadas. Defaults to None.
+            headless (bool, optional): Modo de produção: os detectores retornam apenas o resultado numérico
+                                       (frame_processado = None), sem copiar o frame nem desenhar marcações.
+                                       As marcações podem ser geradas depois com draw_line_debug e
+                                       draw_obstacle_debug. Pode ser sobrescrito por chamada com debug=.
+                                       Defaults to False.
+            bird_eye (BirdEyeView, optional): Vista de cima do chão. Com ela, os detectores de linha do frame
+                                              principal trabalham na grade de cima (a grade inteira é a região
+                                              de interesse) e o desvio passa a ser proporcional à distância
+                                              lateral no chão. Defaults to None.
         """
         self.width, self.height = resolution[0], resolution[1]
+        self.capture_roi = capture_roi
+        self.headless = headless
+        self.bird_eye = bird_eye
+        self._buffers = {}  # Buffers reaproveitados entre frames, por nome
+
+        # Último resultado de cada detector, usado para desenhar as marcações sob demanda
+        self.last_line = None
+        self.last_obstacle = None
+
+        # Rastreamento da linha pelo histograma de colunas (locate_line)
+        line_view_width = self.width if bird_eye is None else bird_eye.size[0]
+        self.line_localizer = LineLocalizer(line_width=max(3, line_view_width // 20))
         print(f"Módulo de Visão inicializado. Resolução esperada: {self.width}x{self.height}")
         
     @classmethod
-    def houghCircleDetect(cls, img, dp=1.3, minDist=50, canny=100, accumulation=40, minRadius=5, maxRadius=300):
+    def houghCircleDetect(cls, img, dp=1.3, minDist=50, canny=100, accumulation=40, minRadius=5, maxRadius=300, roi=None, pyramid=0):
         """
             Transformada de hough mais completa ultilizando alguns filtros para aproximar ilipses de ciculos
+
+            roi (x0, y0, x1, y1) restringe a busca a um recorte da imagem (ver CircleSearchWindow); o circulo
+            retornado fica em coordenadas da imagem inteira e a segmentacao, do recorte.
+
+            pyramid > 0 procura os candidatos na imagem reduzida 2**pyramid vezes e refina cada um em uma janela
+            da imagem original (ver houghCirclePyramid).
         """
-        
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            circle, edges_ellipse = cls.houghCircleDetect(img[y0:y1, x0:x1], dp, minDist, canny, accumulation, minRadius, maxRadius, pyramid=pyramid)
+            if circle is not None:
+                circle = (int(circle[0]) + x0, int(circle[1]) + y0, int(circle[2]))
+            return circle, edges_ellipse
+
+        if pyramid > 0:
+            return cls.houghCirclePyramid(img, pyramid, dp, minDist, canny, accumulation, minRadius, maxRadius)
+
         edges = ProcessingImage.edge_filter(img) # Aplica filtro de segmentacao de bordas
         
         # Cria uma mascara para formas elipticas
@@ -48,161 +103,701 @@ class VisionModule:
             return tuple(circles[0]), edges_ellipse # retorna os dados do circulo e segmentação
 
         return None, edges_ellipse
-    
+
     @classmethod
-    def circleCannyDetect(cls, img, MINRADIUS=3, MINAREA=300, canny=(70, 150)):
-        """Deteccao de circulos via contorno e coeficiente de circularidade, por meio das bordas"""
-        
-        # Aplica canny para reconhecimento de bordas
-        edges = openCv.Canny(img, canny[0], canny[1])
-        contornos, _ = openCv.findContours(edges, openCv.RETR_EXTERNAL, openCv.CHAIN_APPROX_SIMPLE)
+    def houghCirclePyramid(cls, img, levels=1, dp=1.3, minDist=50, canny=100, accumulation=40, minRadius=5, maxRadius=300, min_support=0.4):
+        """
+            Deteccao em piramide: a transformada de hough roda na imagem reduzida 2**levels vezes, com distancias
+            e raios reduzidos na mesma escala, e cada candidato e refinado na imagem original (_refineCircle) com
+            as bordas de uma janela em volta dele. O acumulador da imagem inteira, que domina o custo, fica
+            4**levels vezes menor.
+
+            Como no houghCircleDetect, o raio minimo efetivo e minDist e o circulo retornado e o maior dos
+            confirmados na resolucao original; candidatos sem bordas suficientes sao descartados.
+
+            O resultado nao e identico ao da transformada na resolucao original: nas cenas do
+            benchmark_circle_pyramid os dois diferem em ate 3-6 px, mas o erro mediano em relacao a bola real e
+            0 px (maximo 4-6 px em 1/4), contra 1-2 px (maximo 3-5 px) da transformada na resolucao original.
+
+        Args:
+            min_support (float, optional): Fracao minima da circunferencia coberta por bordas para confirmar um candidato. Defaults to 0.4.
+
+        Returns:
+            tuple: (maior circulo (x, y, r) em pixels da imagem original ou None, segmentacao da imagem reduzida)
+        """
+        scale = 2 ** levels
+        height, width = img.shape[:2]
+        small = openCv.resize(img, (max(1, width // scale), max(1, height // scale)), interpolation=openCv.INTER_AREA)
+
+        edges = ProcessingImage.edge_filter(small)
+
+        # Mesmo fechamento eliptico, com o kernel reduzido (minimo 3x3)
+        size = max(3, (7 // scale) | 1)
+        kernel = openCv.getStructuringElement(openCv.MORPH_ELLIPSE, (size, size))
+        edges_ellipse = openCv.morphologyEx(edges, openCv.MORPH_CLOSE, kernel)
+
+        # Os votos por centro caem menos que a escala (medido nas cenas do benchmark_circle_pyramid): limiar / sqrt(escala)
+        circles = openCv.HoughCircles(
+            edges_ellipse,
+            openCv.HOUGH_GRADIENT,
+            dp=dp,
+            minDist=minDist / scale,
+            param1=canny,
+            param2=max(1, accumulation / numpy.sqrt(scale)),
+            minRadius=int(minDist / scale),
+            maxRadius=int(numpy.ceil(maxRadius / scale))
+        )
 
-        # Ciculo com maior cicularidade detectado
-        bestCircle = None
-        bestScore = 999
+        if circles is None:
+            return None, edges_ellipse
 
-        for cnt in contornos:
-            area = openCv.contourArea(cnt)
-            if area < MINAREA: # Descarta circulos muito pequenos
+        best = None
+        confirmed = []
+        for x, y, r in circles[0] * scale: # Em ordem decrescente de votos
+            # Candidato com centro dentro de um circulo ja confirmado: a mesma bola (ou um falso positivo dentro dela)
+            if any((x - cx) ** 2 + (y - cy) ** 2 < cr ** 2 for cx, cy, cr in confirmed):
                 continue
 
-            # Detecta ciculos
-            (x, y), r = openCv.minEnclosingCircle(cnt)
-            r = int(r)
+            # Folga para o erro de posicao e raio da escala reduzida
+            circle = cls._refineCircle(img, (x, y, r), 2 * scale + 0.1 * r, min_support)
+            if circle is None or not minDist <= circle[2] <= maxRadius:
+                continue
+
+            confirmed.append(circle)
+            if best is None or circle[2] > best[2]:
+                best = circle
+
+        return best, edges_ellipse
+
+    @classmethod
+    def _refineCircle(cls, img, circle, tolerance, min_support=0.4):
+        """
+            Ajusta um circulo aproximado (x, y, r) as bordas da imagem original: pega as bordas a menos de
+            tolerance pixels da circunferencia, em uma janela em volta dela, e faz o ajuste algebrico por
+            minimos quadrados (x² + y² + Dx + Ey + F = 0), duas vezes, estreitando a faixa.
+
+            Retorna o circulo ajustado (x, y, r) em inteiros, ou None se as bordas cobrirem menos de
+            min_support da circunferencia.
+        """
+        height, width = img.shape[:2]
+        x, y, r = circle
+        half = r + 2 * tolerance
+        x0, y0 = max(0, int(x - half)), max(0, int(y - half))
+        x1, y1 = min(width, int(x + half) + 1), min(height, int(y + half) + 1)
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        points = openCv.findNonZero(ProcessingImage.edge_filter(img[y0:y1, x0:x1]))
+        if points is None:
+            return None
+
+        # Coordenadas relativas ao centro aproximado (melhor condicionamento do ajuste)
+        points = points.reshape(-1, 2).astype(numpy.float64)
+        px = points[:, 0] + (x0 - x)
+        py = points[:, 1] + (y0 - y)
+        cx, cy = 0.0, 0.0
+
+        for band in (tolerance, max(2.0, tolerance / 2)):
+            near = numpy.abs(numpy.hypot(px - cx, py - cy) - r) <= band
+            if numpy.count_nonzero(near) < min_support * 2 * numpy.pi * r:
+                return None
+
+            u, v = px[near], py[near]
+            A = numpy.column_stack((u, v, numpy.ones_like(u)))
+            (D, E, F), *_ = numpy.linalg.lstsq(A, -(u * u + v * v), rcond=None)
+            cx, cy = -D / 2, -E / 2
+            r = numpy.sqrt(max(cx * cx + cy * cy - F, 0.0))
+
+        return int(round(x + cx)), int(round(y + cy)), int(round(r))
+    
+    @classmethod
+    def circleCannyDetect(cls, img, MINRADIUS=3, MINAREA=300, canny=(70, 150), roi=None, top_k=None):
+        """
+            Deteccao de circulos via contorno e coeficiente de circularidade, a partir dos componentes da mascara
+
+            Os componentes conexos sao rotulados de uma vez (connectedComponentsWithStats) e os pequenos ou alongados
+            demais para serem circulos sao descartados pelas estatisticas; findContours e minEnclosingCircle so rodam
+            no recorte de cada componente que sobra. Com ruido na mascara isso evita avaliar milhares de contornos
+            de bordas, e os furos de ruido dentro da bola nao quebram o seu contorno externo.
+
+            canny: nao e mais usado (o contorno vem direto dos componentes), mantido pela assinatura
+
+            roi (x0, y0, x1, y1) restringe a busca a um recorte da imagem, o circulo retornado fica em
+            coordenadas da imagem inteira
 
+            top_k: None retorna o circulo mais circular (x, y, r) ou None; um inteiro retorna a lista dos ate
+            top_k circulos aceitos, do mais para o menos circular
+        """
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            found = cls.circleCannyDetect(img[y0:y1, x0:x1], MINRADIUS, MINAREA, canny, top_k=top_k)
+            if top_k is None:
+                return None if found is None else (found[0] + x0, found[1] + y0, found[2])
+            return [(x + x0, y + y0, r) for x, y, r in found]
+
+        _, labels, stats, _ = openCv.connectedComponentsWithStatsWithAlgorithm(img, 8, openCv.CV_32S, openCv.CCL_GRANA)
+
+        # A area do contorno e no maximo a da caixa e o circulo minimo tem diametro >= maior lado, entao
+        # area / area do circulo <= 4/pi * (menor lado / maior lado) e caixas alongadas nao chegam a circularidade aceitavel
+        width, height = stats[1:, openCv.CC_STAT_WIDTH], stats[1:, openCv.CC_STAT_HEIGHT]
+        candidates = numpy.flatnonzero((stats[1:, openCv.CC_STAT_AREA] >= MINAREA) &
+                                       (numpy.minimum(width, height) >= 0.4 * numpy.maximum(width, height))) + 1
+
+        scored = []
+        for label in candidates:
+            x, y, w, h = (int(v) for v in stats[label, :4])
+            blob = (labels[y:y + h, x:x + w] == label).view(numpy.uint8)
+            contornos, _ = openCv.findContours(blob, openCv.RETR_EXTERNAL, openCv.CHAIN_APPROX_SIMPLE, offset=(x, y))
+
+            area = openCv.contourArea(contornos[0])
+            if area < MINAREA:
+                continue
+            (cx, cy), r = openCv.minEnclosingCircle(contornos[0])
+            r = int(r)
             if r <= MINRADIUS: # Descarta raios muito pequenos
                 continue
-
             area_circ = numpy.pi * (r ** 2)
             erro = abs(area - area_circ) / area_circ
+            if erro < 0.35:
+                scored.append((erro, (int(cx), int(cy), r)))
+
+        # Do mais circular para o menos (ordem estavel, empate fica com o primeiro componente)
+        scored.sort(key=lambda item: item[0])
+        circles = [circle for _, circle in scored[:top_k]]
+
+        if top_k is None:
+            return circles[0] if circles else None
+        return circles
 
-            # circularidade aceitável
-            if erro < bestScore and erro < 0.35:
-                bestScore = erro
-                bestCircle = (int(x), int(y), r)
+    def _buffer(self, name, shape, dtype=numpy.uint8):
+        """Retorna um buffer reaproveitado entre chamadas, realocando apenas se o formato mudar"""
+        return reuse_buffer(self._buffers, name, shape, dtype)
 
-        return bestCircle
-            
+    def _debug(self, debug):
+        """Indica se a chamada deve gerar o frame de debug"""
+        return not self.headless if debug is None else debug
 
-    def process_frame_for_line_following(self, frame):
+    def draw_line_debug(self, frame, result=None):
+        """
+        Desenha as marcações do seguidor de linha sobre uma cópia do frame.
+
+        Args:
+            frame (numpy.array): Frame (BGR) ou plano Y de onde o resultado foi obtido. Com bird_eye,
+                                 a vista de cima do frame (bird_eye.apply(frame)).
+            result (dict, optional): Resultado a desenhar. Defaults to o último (self.last_line).
+
+        Retorna:
+            numpy.array: Frame BGR com as marcações, ou None se não houver resultado.
+        """
+        result = self.last_line if result is None else result
+        if frame is None or result is None:
+            return None
+
+        height, width = frame.shape[:2]
+        lores = frame.ndim == 2  # Plano Y do stream de baixa resolução: marcações menores
+        frame_processado = openCv.cvtColor(frame, openCv.COLOR_GRAY2BGR) if lores else frame.copy()
+        center_x = int(width / 2)
+
+        if result["centroid"] is not None:
+            openCv.circle(frame_processado, result["centroid"], 3 if lores else 5, (0, 255, 0), -1)
+
+        # Centroides de cada faixa do detector por faixas (process_frame_for_line_bands)
+        for point in result.get("centroids", ()):
+            openCv.circle(frame_processado, point, 2 if lores else 4, (0, 200, 255), -1)
+
+        # Janela de busca e picos candidatos do localizador por histograma (locate_line)
+        if "janela" in result:
+            x0, x1 = result["janela"]
+            openCv.rectangle(frame_processado, (x0, result["roi_start_y"]), (x1 - 1, height - 1), (255, 0, 255), 1)
+            for x, _ in result["picos"]:
+                openCv.drawMarker(frame_processado, (int(x), height - 5), (0, 200, 255), openCv.MARKER_TRIANGLE_UP, 10, 2)
+
+        # Desenhar a linha central para referência
+        openCv.line(frame_processado, (center_x, height), (center_x, result["roi_start_y"]), (255, 0, 0), 1 if lores else 2)
+
+        if lores:
+            openCv.putText(frame_processado, f"Desvio: {result['desvio']:.2f}", (5, 15), openCv.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+        else:
+            openCv.putText(frame_processado, f"Desvio: {result['desvio']:.2f}", (10, 30), openCv.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+
+        if "confianca" in result and not lores:
+            openCv.putText(frame_processado, f"Confianca: {result['confianca']:.2f}", (10, 120), openCv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+        if "angulo" in result and not lores:
+            openCv.putText(frame_processado, f"Angulo: {numpy.degrees(result['angulo']):.1f}  Curvatura: {result['curvatura']:.2f}",
+                           (10, 90), openCv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+        return frame_processado
+
+    def draw_obstacle_debug(self, frame, result=None):
+        """
+        Desenha as marcações da detecção de obstáculos sobre uma cópia do frame.
+
+        Args:
+            frame (numpy.array): Frame (BGR) de onde o resultado foi obtido, ou a máscara/plano V
+                                 no caso de detect_obstacle_lores.
+            result (dict, optional): Resultado a desenhar. Defaults to o último (self.last_obstacle).
+
+        Retorna:
+            numpy.array: Frame BGR com as marcações, ou None se não houver resultado.
+        """
+        result = self.last_obstacle if result is None else result
+        if frame is None or result is None:
+            return None
+
+        lores = frame.ndim == 2
+        frame_processado = openCv.cvtColor(frame, openCv.COLOR_GRAY2BGR) if lores else frame.copy()
+
+        if result["detected"]:
+            x, y, w, h = result["bbox"]
+            if lores:
+                openCv.rectangle(frame_processado, (x, y), (x + w, y + h), (0, 0, 255), 1)
+            else:
+                # Desenha o contorno e o retângulo delimitador no frame de debug
+                openCv.rectangle(frame_processado, (x, y), (x + w, y + h), (0, 0, 255), 2)
+                openCv.putText(frame_processado, "OBSTACULO", (x, y - 10), openCv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                openCv.putText(frame_processado, f"Area: {result['area']}", (x, y + h + 20), openCv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+
+        if not lores:
+            openCv.putText(frame_processado, f"Obstaculo: {result['detected']}", (10, 60), openCv.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+        return frame_processado
+
+    def _line_roi_start(self, frame_height, start=None):
+        """
+        Retorna a linha, nas coordenadas do frame recebido, onde começa a faixa do seguidor de linha.
+        Com capture_roi o frame recebido já é a faixa inferior recortada pela câmera.
+
+        Args:
+            start (float, optional): Início da faixa como fração da altura do frame completo. Defaults to LINE_ROI_START.
+        """
+        if start is None:
+            start = self.LINE_ROI_START
+
+        if self.capture_roi is None:
+            return int(frame_height * start)
+
+        # Altura do frame completo na escala do frame recebido e linhas recortadas acima dele
+        full_height = frame_height / (1 - self.capture_roi)
+        offset = full_height - frame_height
+        return max(0, int(full_height * start - offset))
+
+    def _line_view(self, frame, ctx=None, start=None):
+        """
+        Retorna a imagem onde os detectores de linha trabalham e a sua região de interesse:
+        (imagem, contexto, roi_start_y, center_x). Com bird_eye, a imagem é a vista de cima inteira
+        e o contexto do frame original não se aplica.
+        """
+        if self.bird_eye is None:
+            return frame, ctx, self._line_roi_start(frame.shape[0], start), self.width / 2
+
+        view = self.bird_eye.apply(frame)
+        return view, None, 0, view.shape[1] / 2
+
+    def _line_mask(self, view, roi_start_y, ctx=None, x0=0, x1=None):
+        """Segmenta a linha nas colunas [x0, x1) da faixa a partir de roi_start_y, convertendo só essa região para HSV"""
+        if ctx is not None:
+            hsv = ctx.hsv(roi_start_y)[:, x0:x1]
+        else:
+            band = view[roi_start_y:, x0:x1]
+            hsv = self._buffer("line_hsv", band.shape)
+            openCv.cvtColor(band, openCv.COLOR_BGR2HSV, dst=hsv)
+
+        mask = self._buffer("line_mask", hsv.shape[:2])
+        openCv.inRange(hsv, self.LOWER_WHITE, self.UPPER_WHITE, dst=mask)
+        return mask
+
+    def process_frame_for_line_following(self, frame, debug=None, ctx=None):
         """
         Processa o frame para detectar uma linha e calcular o desvio do centro.
 
         Args:
             frame (numpy.array): Frame de entrada no formato BGR.
+            debug (bool, optional): Gera o frame de debug. Defaults to o modo do módulo (not headless).
+            ctx (FrameContext, optional): Contexto do frame, para reaproveitar o HSV calculado por outros
+                                          detectores. Defaults to None.
 
         Retorna:
             tuple: (desvio, frame_processado)
                 desvio (float): Valor entre -1.0 (totalmente à esquerda) e 1.0 (totalmente à direita).
                                 0.0 significa que a linha está centralizada.
-                frame_processado (numpy.array): Frame com as marcações de processamento (opcional, para debug).
+                frame_processado (numpy.array): Frame (ou vista de cima, com bird_eye) com as marcações de
+                                                processamento (None sem debug).
         """
         if frame is None:
             return 0.0, None
 
-        # 1. Converter para HSV (Hue, Saturation, Value)
-        hsv = openCv.cvtColor(frame, openCv.COLOR_BGR2HSV)
-
-        # 2. Definir o intervalo de cor da linha (Exemplo: Linha Branca)
-        lower_white = numpy.array([0, 0, 200])
-        upper_white = numpy.array([180, 25, 255])
-        mask = openCv.inRange(hsv, lower_white, upper_white)
+        # 1. Recortar a região de interesse (ROI) antes de qualquer conversão, nas coordenadas do frame recebido
+        # (ou gerar a vista de cima, que já é a região de interesse)
+        view, ctx, roi_start_y, center_x = self._line_view(frame, ctx)
 
-        # 3. Aplicar uma região de interesse (ROI)
-        roi_start_y = int(self.height * 0.8)
-        mask[:roi_start_y, :] = 0
+        # 2. Converter a faixa para HSV (Hue, Saturation, Value) e 3. segmentar a cor da linha
+        mask = self._line_mask(view, roi_start_y, ctx)
         
         # 4. Encontrar o centroide (Momento) da linha detectada
-        M = openCv.moments(mask)
+        M = openCv.moments(mask, binaryImage=True)
 
         desvio = 0.0
-        cx = -1 # Coordenada X do centroide
-
-        frame_processado = frame.copy()
+        centroid = None
 
         if M["m00"] > 0:
             # Calcular o centroide
             cx = int(M["m10"] / M["m00"])
-            cy = int(M["m01"] / M["m00"])
-
-            openCv.circle(frame_processado, (cx, cy), 5, (0, 255, 0), -1)
+            cy = int(M["m01"] / M["m00"]) + roi_start_y
+            centroid = (cx, cy)
 
             # 5. Calcular o desvio
-            center_x = self.width / 2
             desvio = (cx - center_x) / center_x
-        
-        # Desenhar a linha central para referência
-        openCv.line(frame_processado, (int(self.width/2), self.height), (int(self.width/2), roi_start_y), (255, 0, 0), 2)
-        
-        openCv.putText(frame_processado, f"Desvio: {desvio:.2f}", (10, 30), openCv.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
 
-        return desvio, frame_processado
+        self.last_line = {"desvio": desvio, "centroid": centroid, "roi_start_y": roi_start_y}
+
+        if not self._debug(debug):
+            return desvio, None
 
-    def detect_obstacle(self, frame, min_area_threshold=5000, color_range=None):
+        return desvio, self.draw_line_debug(view)
+
+    def locate_line(self, frame, debug=None, ctx=None):
         """
-        Detecta um obstáculo na frente do Rover com base na cor e tamanho.
+        Localiza a linha pelo histograma de colunas da faixa inferior (ver LineLocalizer), rastreando o pico
+        escolhido de um frame para o outro. Uma segunda linha, um cruzamento ou um reflexo não deslocam o
+        resultado como no centroide de process_frame_for_line_following.
+
+        Com a linha travada, só a janela de busca em torno da posição anterior é convertida e segmentada.
 
         Args:
             frame (numpy.array): Frame de entrada no formato BGR.
-            min_area_threshold (int): Área mínima (em pixels) para considerar um objeto como obstáculo.
-            color_range (tuple, optional): Tupla (lower_hsv, upper_hsv) para a cor do obstáculo.
-                                           Padrão: Vermelho (cor comum para cones ou barreiras).
+            debug (bool, optional): Gera o frame de debug. Defaults to o modo do módulo (not headless).
+            ctx (FrameContext, optional): Contexto do frame, para reaproveitar o HSV calculado por outros
+                                          detectores. Defaults to None.
+
+        Retorna:
+            tuple: (desvio, confianca, frame_processado)
+                desvio (float): Valor entre -1.0 (totalmente à esquerda) e 1.0 (totalmente à direita).
+                                Sem detecção neste frame, é o último desvio conhecido (0.0 se nunca houve).
+                confianca (float): Fração da janela do pico ocupada pela linha, entre 0.0 e 1.0.
+                                   0.0 quando nenhum pico confiável foi encontrado neste frame.
+                frame_processado (numpy.array): Frame com as marcações de processamento (None sem debug).
+        """
+        if frame is None:
+            return 0.0, 0.0, None
+
+        view, ctx, roi_start_y, center_x = self._line_view(frame, ctx)
+        x0, x1 = self.line_localizer.search_window(view.shape[1])
+
+        # Converte e segmenta apenas a janela de busca da faixa
+        mask = self._line_mask(view, roi_start_y, ctx, x0, x1)
+
+        # Histograma de colunas da faixa
+        columns = openCv.reduce(mask, 0, openCv.REDUCE_SUM, dtype=openCv.CV_32S).ravel()
+        x, confianca = self.line_localizer.update(columns, x0, mask.shape[0])
+
+        desvio = 0.0
+        centroid = None
+        if x is not None:
+            desvio = (x - center_x) / center_x
+            centroid = (int(x), (roi_start_y + view.shape[0]) // 2)
+
+        self.last_line = {
+            "desvio": desvio, "confianca": confianca, "centroid": centroid, "roi_start_y": roi_start_y,
+            "janela": (x0, x1), "picos": self.line_localizer.peaks,
+        }
+
+        if not self._debug(debug):
+            return desvio, confianca, None
+
+        return desvio, confianca, self.draw_line_debug(view)
+
+    def process_frame_for_line_bands(self, frame, n_bands=4, roi_start=None, min_pixels=0.01, debug=None, ctx=None):
+        """
+        Detecta a linha em N faixas horizontais da região de interesse e ajusta uma curva aos centroides,
+        estimando, além do desvio lateral, o ângulo e a curvatura da linha à frente do Rover.
+
+        Os centroides de todas as faixas saem de uma única redução do numpy (soma das colunas de cada faixa),
+        sem laço por faixa. A curva x(y) = c0 + c1*y + c2*y² é ajustada em coordenadas normalizadas pela
+        metade da largura: x como no desvio e y como distância acima da base da região de interesse.
+
+        Args:
+            frame (numpy.array): Frame de entrada no formato BGR.
+            n_bands (int, optional): Quantidade de faixas (no máximo uma por linha da região de interesse). Defaults to 4.
+            roi_start (float, optional): Início da região de interesse como fração da altura. Uma região maior melhora
+                                         a estimativa de ângulo e curvatura, ao custo de converter mais linhas.
+                                         Ignorado com bird_eye, que usa a grade de cima inteira.
+                                         Defaults to LINE_ROI_START (mesmo custo de process_frame_for_line_following).
+            min_pixels (float, optional): Fração mínima de pixels da linha em uma faixa para usá-la no ajuste. Defaults to 0.01.
+            debug (bool, optional): Gera o frame de debug. Defaults to o modo do módulo (not headless).
+            ctx (FrameContext, optional): Contexto do frame, para reaproveitar o HSV calculado por outros
+                                          detectores. Defaults to None.
+
+        Retorna:
+            tuple: (desvio, angulo, curvatura, frame_processado)
+                desvio (float): Posição da linha na faixa inferior, entre -1.0 (esquerda) e 1.0 (direita).
+                angulo (float): Ângulo da linha em radianos em relação à vertical, positivo quando ela segue
+                                para a direita à frente do Rover. 0.0 com menos de duas faixas válidas.
+                curvatura (float): Curvatura da linha (positiva quando curva para a direita), em unidades de
+                                   1/meia largura do frame. 0.0 com menos de três faixas válidas.
+                frame_processado (numpy.array): Frame com as marcações de processamento (None sem debug).
+        """
+        if n_bands < 1:
+            raise ValueError("n_bands deve ser pelo menos 1")
+
+        if frame is None:
+            return 0.0, 0.0, 0.0, None
+
+        view, ctx, roi_start_y, center_x = self._line_view(frame, ctx, roi_start)
+        n_bands = min(n_bands, view.shape[0] - roi_start_y)  # Faixas de pelo menos uma linha
+        if n_bands < 1:
+            return 0.0, 0.0, 0.0, None
+
+        band_height = (view.shape[0] - roi_start_y) // n_bands
+        roi_start_y = view.shape[0] - band_height * n_bands  # Descarta o resto no topo para faixas iguais
+
+        # Segmentação da linha na região de interesse, igual à de process_frame_for_line_following
+        mask = self._line_mask(view, roi_start_y, ctx)
+
+        # Soma das colunas de cada faixa (n_bands x largura) e centroides de todas as faixas de uma vez
+        columns = mask.reshape(n_bands, band_height, -1).sum(axis=1, dtype=numpy.uint32).astype(numpy.float32)
+        totals = columns.sum(axis=1)
+        xs = numpy.arange(columns.shape[1], dtype=numpy.float32)
+        valid = totals >= 255 * min_pixels * band_height * columns.shape[1]
+
+        band_y = roi_start_y + (numpy.arange(n_bands) + 0.5) * band_height  # Centro de cada faixa
+        cx = (columns[valid] @ xs) / totals[valid]
+
+        # Coordenadas normalizadas: u (desvio) e v (distância acima da base da região), da faixa inferior para cima
+        u = ((cx - center_x) / center_x)[::-1]
+        v = ((view.shape[0] - band_y[valid]) / center_x)[::-1]
+
+        desvio, angulo, curvatura = 0.0, 0.0, 0.0
+        if len(u) == 1:
+            desvio = float(u[0])
+        elif len(u) > 1:
+            degree = min(2, len(u) - 1)
+            coefs = numpy.linalg.lstsq(numpy.vander(v, degree + 1, increasing=True), u, rcond=None)[0]
+            v0 = v[0]  # Faixa válida mais baixa
+            slope = coefs[1] + (2 * coefs[2] * v0 if degree == 2 else 0.0)
+            desvio = float(coefs[0] + coefs[1] * v0 + (coefs[2] * v0 ** 2 if degree == 2 else 0.0))
+            angulo = float(numpy.arctan(slope))
+            if degree == 2:
+                curvatura = float(2 * coefs[2] / (1 + slope ** 2) ** 1.5)
+
+        centroids = [(int(x), int(y)) for x, y in zip(cx, band_y[valid])]
+        self.last_line = {
+            "desvio": desvio, "angulo": angulo, "curvatura": curvatura,
+            "centroid": centroids[-1] if centroids else None, "centroids": centroids, "roi_start_y": roi_start_y,
+        }
+
+        if not self._debug(debug):
+            return desvio, angulo, curvatura, None
+
+        return desvio, angulo, curvatura, self.draw_line_debug(view)
+
+    def process_lores_for_line_following(self, y_plane, luma_threshold=200, debug=None):
+        """
+        Detecta a linha no plano de luminância (Y) do stream de baixa resolução e calcula o desvio do centro.
+
+        Equivalente a process_frame_for_line_following para uma linha branca, mas sem conversão de cor:
+        a linha é segmentada direto pelo brilho e apenas a faixa inferior do plano é processada.
+
+        Args:
+            y_plane (numpy.array): Plano Y do frame YUV420 (ver CameraModule.get_lores).
+            luma_threshold (int, optional): Luminância mínima para um pixel pertencer à linha. Defaults to 200.
+            debug (bool, optional): Gera o frame de debug. Defaults to o modo do módulo (not headless).
+
+        Retorna:
+            tuple: (desvio, frame_processado)
+                desvio (float): Valor entre -1.0 (totalmente à esquerda) e 1.0 (totalmente à direita).
+                frame_processado (numpy.array): Plano Y com as marcações de processamento (None sem debug).
+        """
+        if y_plane is None:
+            return 0.0, None
+
+        width = y_plane.shape[1]
+
+        # Processa somente a região de interesse (faixa inferior)
+        roi_start_y = self._line_roi_start(y_plane.shape[0])
+        _, mask = openCv.threshold(y_plane[roi_start_y:], luma_threshold - 1, 255, openCv.THRESH_BINARY)
+
+        M = openCv.moments(mask, binaryImage=True)
+
+        desvio = 0.0
+        centroid = None
+
+        if M["m00"] > 0:
+            cx = int(M["m10"] / M["m00"])
+            cy = int(M["m01"] / M["m00"]) + roi_start_y
+            centroid = (cx, cy)
+
+            center_x = width / 2
+            desvio = (cx - center_x) / center_x
+
+        self.last_line = {"desvio": desvio, "centroid": centroid, "roi_start_y": roi_start_y}
+
+        if not self._debug(debug):
+            return desvio, None
+
+        return desvio, self.draw_line_debug(y_plane)
+
+    def detect_obstacle_lores(self, v_plane, min_area_threshold=5000, cr_threshold=150, debug=None):
+        """
+        Detecta um obstáculo vermelho no plano de crominância V (Cr) do stream de baixa resolução.
+
+        Pixels vermelhos têm Cr alto, então a segmentação é um único limiar sobre o plano V, que tem
+        1/4 da resolução do stream lores. A área mínima é informada em pixels do frame principal
+        (resolução do módulo) e convertida para a escala do plano.
+
+        Args:
+            v_plane (numpy.array): Plano V do frame YUV420 (ver CameraModule.get_lores).
+            min_area_threshold (int): Área mínima (em pixels do frame principal) para considerar um obstáculo.
+            cr_threshold (int, optional): Valor mínimo de Cr para considerar um pixel vermelho. Defaults to 150.
+            debug (bool, optional): Gera o frame de debug. Defaults to o modo do módulo (not headless).
 
         Retorna:
             tuple: (obstacle_detected, frame_processado)
                 obstacle_detected (bool): True se um obstáculo for detectado.
-                frame_processado (numpy.array): Frame com as marcações de detecção (para debug).
+                frame_processado (numpy.array): Máscara com as marcações de detecção (None sem debug).
         """
-        if frame is None:
+        if v_plane is None:
             return False, None
 
+        # Converte a área mínima para a escala do plano V
+        plane_height = v_plane.shape[0]
+        if self.capture_roi is not None:
+            plane_height = plane_height / (1 - self.capture_roi)  # Altura do plano sem o recorte da câmera
+        scale = (plane_height * v_plane.shape[1]) / (self.width * self.height)
+        min_area = min_area_threshold * scale
+
+        _, mask = openCv.threshold(v_plane, cr_threshold - 1, 255, openCv.THRESH_BINARY)
+
+        # Aplica operações morfológicas para remover ruído
+        mask = openCv.erode(mask, None, iterations=1)
+        mask = openCv.dilate(mask, None, iterations=1)
+
+        self.last_obstacle = self._largest_obstacle(mask, min_area)
+        obstacle_detected = self.last_obstacle["detected"]
+
+        if not self._debug(debug):
+            return obstacle_detected, None
+
+        return obstacle_detected, self.draw_obstacle_debug(mask)
+
+    def _obstacle_mask(self, frame, color_range=None, ctx=None):
+        """Máscara (0/255) dos pixels com a cor do obstáculo, sem ruído, em um buffer reaproveitado"""
         # Cor padrão: Vermelho (pode ser ajustado para o TCC)
         if color_range is None:
             # Vermelho tem dois intervalos em HSV
-            lower_red1 = numpy.array([0, 100, 100])
-            upper_red1 = numpy.array([10, 255, 255])
-            lower_red2 = numpy.array([160, 100, 100])
-            upper_red2 = numpy.array([180, 255, 255])
+            ranges = [
+                (numpy.array([0, 100, 100]), numpy.array([10, 255, 255])),
+                (numpy.array([160, 100, 100]), numpy.array([180, 255, 255])),
+            ]
         else:
-            lower_hsv, upper_hsv = color_range
-            lower_red1 = lower_hsv
-            upper_red1 = upper_hsv
-            lower_red2 = numpy.array([0, 0, 0]) # Ignora o segundo intervalo se um range específico for fornecido
-            upper_red2 = numpy.array([0, 0, 0])
+            ranges = [tuple(numpy.asarray(limit) for limit in color_range)] # Um único intervalo
 
-        hsv = openCv.cvtColor(frame, openCv.COLOR_BGR2HSV)
+        hsv = ctx.hsv() if ctx is not None else openCv.cvtColor(frame, openCv.COLOR_BGR2HSV)
+        shape = hsv.shape[:2]
 
-        # Cria as máscaras para os dois intervalos de vermelho
-        mask1 = openCv.inRange(hsv, lower_red1, upper_red1)
-        mask2 = openCv.inRange(hsv, lower_red2, upper_red2)
-        mask = mask1 + mask2
+        # Cria as máscaras dos intervalos e as une (bitwise_or, sem estouro de uint8 como na soma)
+        mask = openCv.inRange(hsv, ranges[0][0], ranges[0][1], dst=self._buffer("obstacle_mask", shape))
+        for lower, upper in ranges[1:]:
+            extra = openCv.inRange(hsv, lower, upper, dst=self._buffer("obstacle_extra", shape))
+            openCv.bitwise_or(mask, extra, dst=mask)
 
         # Aplica operações morfológicas para remover ruído
-        mask = openCv.erode(mask, None, iterations=2)
-        mask = openCv.dilate(mask, None, iterations=2)
+        eroded = openCv.erode(mask, None, dst=self._buffer("obstacle_eroded", shape), iterations=2)
+        return openCv.dilate(eroded, None, dst=mask, iterations=2)
+
+    def _blobs(self, mask, min_area=0):
+        """
+        Objetos (componentes conectados, vizinhança 8) da máscara com área > min_area, em um array
+        OBSTACLE_DTYPE ordenado da maior para a menor área. Uma única chamada, sem copiar a máscara.
+        """
+        # Algoritmo de Grana (BBDT) explícito: o padrão, com estatísticas, mediu 2x mais lento (benchmark_obstacles)
+        _, _, stats, centroids = openCv.connectedComponentsWithStatsWithAlgorithm(
+            mask, 8, openCv.CV_32S, openCv.CCL_GRANA, labels=self._buffer("blob_labels", mask.shape, numpy.int32)
+        )
 
-        # Encontra contornos na máscara
-        contours, _ = openCv.findContours(mask.copy(), openCv.RETR_EXTERNAL, openCv.CHAIN_APPROX_SIMPLE)
+        # A linha 0 é o fundo
+        areas = stats[1:, openCv.CC_STAT_AREA]
+        keep = numpy.flatnonzero(areas > min_area)
+        keep = keep[numpy.argsort(-areas[keep], kind="stable")] + 1
+
+        blobs = numpy.empty(len(keep), dtype=OBSTACLE_DTYPE)
+        blobs["bbox"] = stats[keep, :4]
+        blobs["area"] = stats[keep, openCv.CC_STAT_AREA]
+        blobs["centroid"] = centroids[keep]
+        return blobs
+
+    @staticmethod
+    def _largest_obstacle(mask, min_area):
+        """
+        Resultado no formato de last_obstacle a partir do maior contorno externo da máscara, com a área do
+        contourArea. Para um único objeto o findContours custa menos que rotular a máscara inteira (_blobs),
+        que só compensa com centenas de objetos (benchmark_obstacles).
+        """
+        contours, _ = openCv.findContours(mask, openCv.RETR_EXTERNAL, openCv.CHAIN_APPROX_SIMPLE)
 
         obstacle_detected = False
-        frame_processado = frame.copy()
+        bbox, area = None, 0.0
 
         if len(contours) > 0:
-            # Encontra o maior contorno (assumindo que o obstáculo é o maior objeto)
             c = max(contours, key=openCv.contourArea)
             area = openCv.contourArea(c)
 
-            if area > min_area_threshold:
+            if area > min_area:
                 obstacle_detected = True
-                # Desenha o contorno e o retângulo delimitador no frame de debug
-                x, y, w, h = openCv.boundingRect(c)
-                openCv.rectangle(frame_processado, (x, y), (x + w, y + h), (0, 0, 255), 2)
-                openCv.putText(frame_processado, "OBSTACULO", (x, y - 10), openCv.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                openCv.putText(frame_processado, f"Area: {area}", (x, y + h + 20), openCv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+                bbox = openCv.boundingRect(c)
+
+        return {"detected": obstacle_detected, "bbox": bbox, "area": area}
+
+    def detect_obstacles(self, frame, min_area_threshold=5000, color_range=None, ctx=None):
+        """
+        Detecta todos os objetos com a cor de obstáculo e área acima do limiar.
+
+        Args:
+            frame (numpy.array): Frame de entrada no formato BGR.
+            min_area_threshold (int): Área mínima (contagem de pixels do objeto) para considerar um objeto como
+                                      obstáculo. Para formas sólidas fica 2-3% acima da contourArea usada
+                                      por detect_obstacle, que mede o polígono pelos centros dos pixels da borda.
+            color_range (tuple, optional): Tupla (lower_hsv, upper_hsv) para a cor do obstáculo.
+                                           Padrão: Vermelho.
+            ctx (FrameContext, optional): Contexto do frame, para reaproveitar o HSV. Defaults to None.
+
+        Retorna:
+            numpy.array: Array estruturado OBSTACLE_DTYPE (campos bbox, area, centroid), do maior para o menor.
+        """
+        if frame is None:
+            return numpy.empty(0, dtype=OBSTACLE_DTYPE)
+
+        return self._blobs(self._obstacle_mask(frame, color_range, ctx), min_area_threshold)
+
+    def detect_obstacle(self, frame, min_area_threshold=5000, color_range=None, debug=None, ctx=None):
+        """
+        Detecta um obstáculo na frente do Rover com base na cor e tamanho.
+
+        Args:
+            frame (numpy.array): Frame de entrada no formato BGR.
+            min_area_threshold (int): Área mínima (em pixels) para considerar um objeto como obstáculo.
+            color_range (tuple, optional): Tupla (lower_hsv, upper_hsv) para a cor do obstáculo.
+                                           Padrão: Vermelho (cor comum para cones ou barreiras).
+            debug (bool, optional): Gera o frame de debug. Defaults to o modo do módulo (not headless).
+            ctx (FrameContext, optional): Contexto do frame, para reaproveitar o HSV calculado por outros
+                                          detectores. Defaults to None.
+
+        Retorna:
+            tuple: (obstacle_detected, frame_processado)
+                obstacle_detected (bool): True se um obstáculo for detectado.
+                frame_processado (numpy.array): Frame com as marcações de detecção (None sem debug).
+        """
+        if frame is None:
+            return False, None
+
+        mask = self._obstacle_mask(frame, color_range, ctx)
+        self.last_obstacle = self._largest_obstacle(mask, min_area_threshold)
+        obstacle_detected = self.last_obstacle["detected"]
 
-        openCv.putText(frame_processado, f"Obstaculo: {obstacle_detected}", (10, 60), openCv.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        if not self._debug(debug):
+            return obstacle_detected, None
 
-        return obstacle_detected, frame_processado
+        return obstacle_detected, self.draw_obstacle_debug(frame)
 
 # exemplo de uso (para testes)
 if __name__ == "__main__":
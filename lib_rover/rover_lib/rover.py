@@ -1,25 +1,46 @@
 import time
 import cv2
 from .modules.movement.robot import Robot 
-from .modules.camera.cameraModule import CameraModule
+from .modules.camera.cameraModule import CameraModule, CAMERA_FPS
 from .modules.vision.visionModule import VisionModule
-from utils.config_manager import Config
+from .modules.processing.frameContext import FrameContext
+from .utils.config_manager import Config
 
 class Rover:
     
     # Classe principal da biblioteca Rover, responsável por inicializar e coordenar os módulos de Movimento, Câmera e Visão.
     
-    def __init__(self, pwm_frequency=1000):
+    def __init__(self, pwm_frequency=1000, threaded_camera=False, lores_size=None, roi_capture=False, bird_eye=None):
+        """
+        Args:
+            pwm_frequency (int, optional): Frequência do sinal PWM em Hz. Defaults to 1000.
+            threaded_camera (bool, optional): Captura os frames em uma thread dedicada, sobrepondo a leitura
+                                              do sensor ao processamento de visão. Defaults to False.
+            lores_size (tuple, optional): Habilita o stream de baixa resolução YUV420 (largura, altura). O seguidor
+                                          de linha e a detecção de obstáculos passam a usar os planos Y/V dele.
+                                          Defaults to None.
+            roi_capture (bool, optional): Recorta no sensor apenas a faixa inferior usada pelo seguidor de linha.
+                                          A detecção de obstáculos passa a enxergar somente essa faixa.
+                                          Defaults to False.
+            bird_eye (BirdEyeView, optional): Vista de cima do chão para o seguidor de linha do frame principal
+                                              (não se aplica ao stream lores). Defaults to None.
+        """
 
         pins_motors = Config.get("gpio")
+        preview_resolution = Config.get("camera")["preview_resolution"]
 
         print("inicializando Rover...")
         self.movement = Robot(left=pins_motors["motor_esquerdo"], right=pins_motors["motor_direito"], pwm_frequency=pwm_frequency)
-        self.camera = CameraModule()
-        self.vision = VisionModule(self.camera.get_preview_resolution())
+        roi = VisionModule.LINE_ROI_START if roi_capture else None
+        self.camera = CameraModule(preview_resolution[0], preview_resolution[1], threaded=threaded_camera, lores_size=lores_size, roi=roi)
+        # O loop de controle descarta os frames de debug, então as marcações não são desenhadas
+        self.vision = VisionModule(self.camera.get_preview_resolution(), capture_roi=roi, headless=True, bird_eye=bird_eye)
+        self.frame_context = FrameContext() # Representações do frame compartilhadas entre os detectores
+        self.last_latency = None # Latência captura -> motores da última iteração (segundos)
+        self.dropped_stale_frames = 0
         print("Rover inicializado com sucesso.")
 
-    def follow_line(self, base_speed=30, kp=0.7, max_turn_speed=25, duration=None):
+    def follow_line(self, base_speed=30, kp=0.7, max_turn_speed=25, duration=None, max_frame_age=None, max_stale_frames=30):
         
         # Algoritmo de Line Following usando a câmera.
         """
@@ -28,10 +49,16 @@ class Rover:
             kp (float): Ganho Proporcional (Kp) para o controle PID simplificado.
             max_turn_speed (int): Velocidade máxima de correção de curva.
             duration (float, optional): Duração da execução em segundos. Se None, executa indefinidamente.
+            max_frame_age (float, optional): Idade máxima (em segundos) de um frame para ser usado no controle.
+                                             Frames mais antigos são descartados e os motores param até chegar
+                                             um frame novo. Se None, todos são usados.
+            max_stale_frames (int, optional): Frames antigos seguidos tolerados antes de desistir com TimeoutError
+                                              (câmera travada). Defaults to 30.
         """
         print(f"Iniciando modo Seguir Linha. Velocidade base: {base_speed}, Kp: {kp}")
         
         start_time = time.time()
+        stale_frames = 0 # Frames antigos seguidos
         
         try:
             while True:
@@ -39,9 +66,30 @@ class Rover:
                     print("Tempo de execução concluído.")
                     break
 
-                frame = self.camera.capture_frame() # 1. Capturar o frame
+                if self.camera.has_lores():
+                    (y_plane, _, v_plane), meta = self.camera.get_lores_with_meta() # 1. Capturar o frame de baixa resolução
+                else:
+                    frame, meta = self.camera.get_frame_with_meta() # 1. Capturar o frame
+
+                if max_frame_age is not None and meta.age() > max_frame_age:
+                    self.dropped_stale_frames += 1 # Frame antigo demais para o controle
+                    stale_frames += 1
+
+                    # Sem frame recente o último comando dos motores não vale mais
+                    self.movement.stop()
+                    if stale_frames > max_stale_frames:
+                        raise TimeoutError(f"Câmera sem frames novos há {stale_frames} leituras")
+
+                    time.sleep(1.0 / CAMERA_FPS) # Aguarda o próximo frame em vez de reler o mesmo
+                    continue
+
+                stale_frames = 0
 
-                obstacle_detected, _ = self.vision.detect_obstacle(frame) # 2. Detecção de Obstáculos (Prioridade Máxima)
+                if self.camera.has_lores():
+                    obstacle_detected, _ = self.vision.detect_obstacle_lores(v_plane) # 2. Detecção de Obstáculos
+                else:
+                    self.frame_context.update(frame, meta.seq) # O HSV do frame é calculado uma vez para os dois detectores
+                    obstacle_detected, _ = self.vision.detect_obstacle(frame, ctx=self.frame_context) # 2. Detecção de Obstáculos (Prioridade Máxima)
                 
                 if obstacle_detected:
                     print("Obstáculo detectado! Parando.")
@@ -53,7 +101,10 @@ class Rover:
                     continue # Volta ao início do loop para reavaliar
 
                 
-                desvio, processed_frame = self.vision.process_frame_for_line_following(frame) # 3. Processar o frame e obter o desvio da linha
+                if self.camera.has_lores():
+                    desvio, _ = self.vision.process_lores_for_line_following(y_plane)
+                else:
+                    desvio, _ = self.vision.process_frame_for_line_following(frame, ctx=self.frame_context) # 3. Processar o frame e obter o desvio da linha
 
                 
                 turn_speed = desvio * kp * base_speed # 4. Calcular a correção de velocidade (Controle Proporcional P)
@@ -67,8 +118,11 @@ class Rover:
                 speed_right = max(0, min(100, speed_right))
 
                 self.movement.move(speed_left, speed_right)
+                self.last_latency = meta.age() # Latência entre a captura e o comando dos motores
                 
                 # Opcional: Mostrar o frame processado (apenas para debug na RPi com display)
+                # As marcações são desenhadas sob demanda a partir do último resultado do módulo de visão
+                # processed_frame = self.vision.draw_line_debug(y_plane if self.camera.has_lores() else frame)
                 # if processed_frame is not None:
                 #     cv2.imshow("Processed Frame", processed_frame)
                 #     if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -0,0 +1,13 @@
+import numpy
+
+
+def reuse_buffer(buffers, key, shape, dtype=numpy.uint8):
+    """
+    Retorna o buffer da chave no dicionário buffers, reaproveitado entre chamadas e realocado apenas se o
+    formato ou o tipo mudar.
+    """
+    buffer = buffers.get(key)
+    if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+        buffer = numpy.empty(shape, dtype=dtype)
+        buffers[key] = buffer
+    return buffer
@@ -0,0 +1,54 @@
+import os
+import numpy
+
+
+def load_or_build(path, build_fn, validate=None, mmap_mode=None):
+    """
+    Carrega arrays calculados uma única vez (tabelas de cor, mapas do remap) do cache em disco, ou os
+    calcula com build_fn e grava no cache.
+
+    Um arquivo .npy guarda um único array; um .npz guarda a tupla de arrays retornada por build_fn, na ordem.
+    A escrita é atômica (arquivo temporário + os.replace), então vários processos podem construir o mesmo
+    cache ao mesmo tempo. Se o diretório não puder ser escrito, o resultado é usado sem cache.
+
+    Args:
+        path (str): Arquivo do cache (.npy ou .npz). None desabilita o cache.
+        build_fn (callable): Calcula o array (ou a tupla de arrays) quando o cache não existe ou é inválido.
+        validate (callable, optional): Recebe o valor carregado e retorna False para descartá-lo. Defaults to None.
+        mmap_mode (str, optional): Modo do numpy.load para arquivos .npy. Com "r" o array é mapeado em memória
+                                   e os processos que usam o mesmo arquivo compartilham as páginas. Defaults to None.
+
+    Returns:
+        numpy array ou tuple: O valor carregado ou calculado.
+    """
+    if path is None:
+        return build_fn()
+
+    multiple = path.endswith(".npz")
+    try:
+        if multiple:
+            with numpy.load(path) as cached:
+                value = tuple(cached[name] for name in cached.files)
+        else:
+            value = numpy.load(path, mmap_mode=mmap_mode)
+        if validate is None or validate(value):
+            return value
+    except (OSError, KeyError, ValueError):
+        pass
+
+    value = build_fn()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            if multiple:
+                numpy.savez(file, *value)
+            else:
+                numpy.save(file, value)
+        os.replace(tmp_path, path)  # Escrita atômica, seguro com vários processos
+        if mmap_mode is not None and not multiple:
+            return numpy.load(path, mmap_mode=mmap_mode)
+    except (OSError, ValueError):
+        pass  # Sem cache (ex: sistema de arquivos somente leitura)
+
+    return value
@@ -0,0 +1,59 @@
+"""
+Mede o custo por frame da conversão RGB -> BGR que o CameraModule.get_frame deixou de fazer: o
+"RGB888" da picamera2 já está na ordem [B, G, R] em memória e o buffer é entregue sem conversão.
+
+Sem a picamera2 o script mede apenas a conversão sobre um frame sintético.
+Na Raspberry Pi mede também a captura real.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.camera.benchmark_bgr
+"""
+import time
+import cv2
+import numpy as np
+
+WIDTH, HEIGHT = 640, 480
+REPEAT = 500
+
+
+def medir(func, repeat=REPEAT):
+    """Retorna o tempo médio de execução de func em milissegundos"""
+    func()  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - inicio) * 1000 / repeat
+
+
+def benchmark_conversao():
+    frame = np.random.randint(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    buffer = np.empty_like(frame)
+
+    t_cvt = medir(lambda: cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+    t_cvt_dst = medir(lambda: cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=buffer))
+    t_nativo = medir(lambda: frame)
+
+    print(f"Frame {WIDTH}x{HEIGHT}")
+    print(f"  cvtColor (nova alocação) : {t_cvt:.3f} ms/frame")
+    print(f"  cvtColor (buffer reusado): {t_cvt_dst:.3f} ms/frame")
+    print(f"  BGR nativo               : {t_nativo:.3f} ms/frame")
+
+
+def benchmark_camera():
+    from lib_rover.rover_lib.modules.camera.cameraModule import CameraModule
+
+    camera = CameraModule(WIDTH, HEIGHT)
+    try:
+        t = medir(camera.get_frame, repeat=100)
+    finally:
+        camera.cleanup()
+    print(f"  CameraModule.get_frame   : {t:.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    benchmark_conversao()
+
+    try:
+        benchmark_camera()
+    except ModuleNotFoundError:
+        print("picamera2 não disponível, captura real não medida.")
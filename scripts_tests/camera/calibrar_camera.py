@@ -0,0 +1,40 @@
+"""
+Calibração offline da lente com fotos de um tabuleiro de xadrez.
+
+Fotografe o tabuleiro impresso (15 a 30 fotos) em posições, distâncias e inclinações variadas, cobrindo
+também as bordas da imagem, com scripts_tests/camera/captura_imagem_salvar.py. A calibração é salva em um
+.npz e as tabelas de correção da resolução de preview já ficam no cache, então o Rover só as carrega:
+
+    CameraModule(largura, altura, calibration="calibracao.npz")
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.camera.calibrar_camera "fotos/*.jpg" calibracao.npz [9x6] [0.025]
+"""
+import glob
+import sys
+from lib_rover.rover_lib.modules.camera.calibration import CameraCalibration, Undistorter
+from lib_rover.rover_lib.modules.camera.cameraModule import CAMERA_PREVIEW_RESOLUTION
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    fotos = sorted(glob.glob(sys.argv[1]))
+    caminho = sys.argv[2]
+    padrao = tuple(int(v) for v in sys.argv[3].split("x")) if len(sys.argv) > 3 else (9, 6)
+    quadrado = float(sys.argv[4]) if len(sys.argv) > 4 else 0.025
+
+    print(f"{len(fotos)} fotos, tabuleiro {padrao[0]}x{padrao[1]} cantos internos, quadrado de {quadrado * 1000:.0f} mm")
+    calibracao = CameraCalibration.from_checkerboard(fotos, padrao, quadrado)
+    calibracao.save(caminho)
+
+    print(f"Resolução: {calibracao.resolution[0]}x{calibracao.resolution[1]}")
+    print(f"Erro de reprojeção: {calibracao.rms:.3f} px")
+    print(f"K:\n{calibracao.camera_matrix}")
+    print(f"Distorção: {calibracao.dist_coeffs}")
+    print(f"Calibração salva em {caminho}")
+
+    # Pré-calcula as tabelas de correção da resolução usada pelo Rover
+    undistorter = Undistorter(calibracao, CAMERA_PREVIEW_RESOLUTION)
+    print(f"Tabelas de correção {CAMERA_PREVIEW_RESOLUTION[0]}x{CAMERA_PREVIEW_RESOLUTION[1]} em cache ({undistorter.cache_key()})")
@@ -0,0 +1,63 @@
+"""
+Demonstra o barramento de frames em memória compartilhada: o processo principal captura
+e publica os frames, e um segundo processo executa o seguidor de linha lendo-os sem cópia.
+
+Sem a picamera2 a câmera simulada é usada.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.camera.frame_bus_demo
+"""
+import time
+from multiprocessing import Process
+from lib_rover.rover_lib.modules.camera.cameraModule import CameraModule
+from lib_rover.rover_lib.modules.camera.frameBus import FramePublisher, FrameSubscriber
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+
+WIDTH, HEIGHT = 640, 480
+BUS_NAME = "rover_frames"
+DURACAO = 5  # segundos
+
+
+def seguidor_de_linha():
+    """Processo consumidor: calcula o desvio da linha para cada frame novo"""
+    bus = FrameSubscriber(BUS_NAME)
+    vision = VisionModule((WIDTH, HEIGHT))
+    fim = time.monotonic() + DURACAO
+
+    while time.monotonic() < fim:
+        seq, frame, stamp = bus.wait_next(timeout=0.5)
+        if frame is None:
+            continue
+
+        desvio, _ = vision.process_frame_for_line_following(frame)
+
+        if not bus.is_valid(seq):  # frame sobrescrito durante o processamento
+            continue
+
+    print(f"Seguidor de linha: {bus.get_stats()}")
+    bus.close()
+
+
+if __name__ == "__main__":
+    bus = FramePublisher(BUS_NAME, (HEIGHT, WIDTH, 3))
+
+    try:
+        camera = CameraModule(WIDTH, HEIGHT, frame_bus=bus)
+    except ModuleNotFoundError:
+        cena = SyntheticScene(WIDTH, HEIGHT, lines=[{"x": 0.4, "curvature": 0.2}])
+        camera = CameraModule(WIDTH, HEIGHT, scene=cena, frame_bus=bus)
+        camera.picam2.frame_rate = 30
+
+    consumidor = Process(target=seguidor_de_linha)
+    consumidor.start()
+
+    fim = time.monotonic() + DURACAO
+    while time.monotonic() < fim:
+        camera.get_frame()  # cada captura é publicada no barramento
+
+    consumidor.join()
+    print(f"Frames publicados: {bus.seq}")
+
+    camera.cleanup()
+    bus.close()
@@ -0,0 +1,29 @@
+"""
+Grava frames da câmera em um arquivo bruto para reprodução com a ReplayCamera.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.camera.gravar_frames gravacao.raw 300
+"""
+import sys
+from lib_rover.rover_lib.modules.camera.cameraModule import CameraModule
+from lib_rover.rover_lib.modules.camera.webcam import Webcam
+from lib_rover.rover_lib.modules.camera.replayCamera import FrameRecorder
+
+WIDTH = 640
+HEIGHT = 480
+
+if __name__ == "__main__":
+    caminho = sys.argv[1] if len(sys.argv) > 1 else "gravacao.raw"
+    n_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    try:
+        camera = CameraModule(WIDTH, HEIGHT)  # a picamera2 recebe o tamanho como (largura, altura)
+    except ModuleNotFoundError:
+        camera = Webcam(HEIGHT, WIDTH)
+
+    try:
+        with FrameRecorder(caminho) as recorder:
+            recorder.record_from(camera, n_frames)
+            print(f"{recorder.count} frames gravados em {caminho}")
+    finally:
+        camera.cleanup()
@@ -0,0 +1,49 @@
+"""
+Mede a vazão (frames/s) do processamento em lote (modules/processing/batch.py) com 1, 2, 4, ... processos,
+até o número de núcleos da máquina, para cada tarefa pronta.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.benchmark_batch [n_frames]
+"""
+import os
+import sys
+import time
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.processing.batch import TASKS, process_batch
+
+WIDTH, HEIGHT = 640, 480
+
+CENA = SyntheticScene(
+    WIDTH, HEIGHT,
+    lines=[{"x": 0.5, "heading": 0.1, "curvature": 0.2, "thickness": 30}],
+    balls=[{"center": (160, 200), "radius": 60}],
+    obstacles=[{"rect": (420, 120, 100, 100)}],
+    noise=8.0,
+    sway=0.2,
+)
+
+
+def processos():
+    """1, 2, 4, ... até o número de núcleos"""
+    total = os.cpu_count() or 1
+    n = 1
+    while n < total:
+        yield n
+        n *= 2
+    yield total
+
+
+if __name__ == "__main__":
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    frames = CENA.precompute(n_frames)
+
+    print(f"{n_frames} frames {WIDTH}x{HEIGHT}, {os.cpu_count()} nucleos")
+    print(f"{'Tarefa':<10} {'Processos':>9} {'frames/s':>10} {'escala':>7}")
+    for task in TASKS:
+        base = None
+        for workers in processos():
+            inicio = time.perf_counter()
+            process_batch(frames, task, workers=workers)
+            vazao = n_frames / (time.perf_counter() - inicio)
+            base = base or vazao
+            print(f"{task:<10} {workers:>9} {vazao:>10.1f} {vazao / base:>6.2f}x")
@@ -0,0 +1,71 @@
+"""
+Compara o circleCannyDetect anterior (Canny + findContours na máscara inteira, contornos avaliados um a um) com o
+atual (componentes conexos filtrados pelas estatísticas, contorno só dos candidatos), em máscaras com cada vez
+mais ruído, onde o número de contornos das bordas explode.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.benchmark_circle_canny
+"""
+import time
+import cv2
+import numpy as np
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+
+WIDTH, HEIGHT = 640, 480
+NOISE = [0, 10, 30, 60]
+N_REPEAT = 20
+
+
+def mascara(noise):
+    """Máscara crua (só inRange, sem limpeza) de uma cena com bolas vermelhas e ruído"""
+    cena = SyntheticScene(WIDTH, HEIGHT, balls=[{"center": (300, 240), "radius": 60}, {"center": (100, 100), "radius": 30}],
+                          obstacles=[{"rect": (400, 50, 50, 50)}], noise=noise, seed=1)
+    hsv = cv2.cvtColor(cena.render(), cv2.COLOR_BGR2HSV)
+    return cv2.inRange(hsv, (0, 80, 50), (12, 255, 255))
+
+
+def legado(img, MINRADIUS=3, MINAREA=300, canny=(70, 150)):
+    """Implementação anterior do circleCannyDetect"""
+    edges = cv2.Canny(img, canny[0], canny[1])
+    contornos, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    bestCircle = None
+    bestScore = 999
+    for cnt in contornos:
+        area = cv2.contourArea(cnt)
+        if area < MINAREA:
+            continue
+        (x, y), r = cv2.minEnclosingCircle(cnt)
+        r = int(r)
+        if r <= MINRADIUS:
+            continue
+        area_circ = np.pi * (r ** 2)
+        erro = abs(area - area_circ) / area_circ
+        if erro < bestScore and erro < 0.35:
+            bestScore = erro
+            bestCircle = (int(x), int(y), r)
+    return bestCircle
+
+
+def medir(etapa):
+    """Tempo médio (ms) de etapa"""
+    etapa()  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(N_REPEAT):
+        etapa()
+    return (time.perf_counter() - inicio) * 1000 / N_REPEAT
+
+
+if __name__ == "__main__":
+    print(f"{'Ruido':>6} {'contornos':>10} {'componentes':>12} {'legado (ms)':>12} {'atual (ms)':>11}  {'legado':<16} atual (top 3)")
+    for noise in NOISE:
+        mask = mascara(noise)
+        edges = cv2.Canny(mask, 70, 150)
+        n_contornos = len(cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0])
+        n_componentes = cv2.connectedComponents(mask)[0] - 1
+
+        t_legado = medir(lambda: legado(mask))
+        t_atual = medir(lambda: VisionModule.circleCannyDetect(mask))
+        print(f"{noise:>6} {n_contornos:>10} {n_componentes:>12} {t_legado:>12.2f} {t_atual:>11.2f}  "
+              f"{str(legado(mask)):<16} {VisionModule.circleCannyDetect(mask, top_k=3)}")
@@ -0,0 +1,95 @@
+"""
+Compara o houghCircleDetect na resolução original com o modo em pirâmide (candidatos na imagem reduzida
+1/2 ou 1/4, refinados na original), em várias resoluções: tempo, recall (maior bola encontrada dentro da
+tolerância), erro em relação à bola real (mediana e máximo, nos acertos) e diferença em relação à detecção na
+resolução original, quando esta acerta. A detecção na resolução original também erra alguns pixels, então a
+diferença entre as duas é maior que o erro da pirâmide.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.benchmark_circle_pyramid
+"""
+import time
+import numpy as np
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.processing.processing_image import ProcessingImage
+from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+
+RESOLUTIONS = [(480, 480), (640, 640), (960, 720), (1280, 960)]
+LEVELS = [0, 1, 2]
+N_SCENES = 40
+TOLERANCE = 0.15  # Erro máximo do centro e do raio, em frações do raio real
+
+
+def gerar_cenas(width, height, seed=0):
+    """Máscaras de cenas com uma ou duas bolas vermelhas e a maior bola de cada cena"""
+    rng = np.random.default_rng(seed)
+    min_r = max(55, int(0.08 * width))  # O raio mínimo efetivo do houghCircleDetect é minDist = 50
+    max_r = min(280, int(0.2 * width))
+
+    cenas = []
+    for i in range(N_SCENES):
+        balls = []
+        for _ in range(rng.integers(1, 3)):
+            r = int(rng.integers(min_r, max_r))
+            center = (int(rng.integers(r, width - r)), int(rng.integers(r, height - r)))
+            balls.append({"center": center, "radius": r, "color": (0, 0, 200)})
+
+        cena = SyntheticScene(width, height, balls=balls, noise=6.0, seed=i)
+        mascara = ProcessingImage.color_segmentation(cena.render())
+        maior = max(balls, key=lambda b: b["radius"])
+        cenas.append((mascara, (*maior["center"], maior["radius"])))
+    return cenas
+
+
+def acerto(det, real):
+    """Detecção dentro da tolerância em relação à bola real"""
+    if det is None:
+        return False
+    x, y, r = (int(v) for v in det)
+    rx, ry, rr = real
+    return np.hypot(x - rx, y - ry) <= TOLERANCE * rr and abs(r - rr) <= TOLERANCE * rr
+
+
+def medir(cenas, levels):
+    """Tempo médio (ms), detecções e recall do modo levels"""
+    VisionModule.houghCircleDetect(cenas[0][0], pyramid=levels)  # aquecimento
+    deteccoes, tempo = [], 0.0
+    for mascara, _ in cenas:
+        inicio = time.perf_counter()
+        det, _ = VisionModule.houghCircleDetect(mascara, pyramid=levels)
+        tempo += time.perf_counter() - inicio
+        deteccoes.append(det)
+
+    recall = np.mean([acerto(det, real) for det, (_, real) in zip(deteccoes, cenas)])
+    return tempo * 1000 / len(cenas), deteccoes, recall
+
+
+def erro(deteccoes, cenas):
+    """Mediana e máximo do maior erro (px) de centro e raio em relação à bola real, nos acertos"""
+    erros = [max(abs(int(v) - w) for v, w in zip(det, real)) for det, (_, real) in zip(deteccoes, cenas) if acerto(det, real)]
+    if not erros:
+        return float("nan"), float("nan")
+    return float(np.median(erros)), max(erros)
+
+
+def diferenca(deteccoes, referencia, cenas):
+    """Maior diferença (px) de centro e raio em relação à referência, nos frames em que a referência acertou"""
+    pares = [(a, b) for a, b, (_, real) in zip(deteccoes, referencia, cenas) if a is not None and acerto(b, real)]
+    if not pares:
+        return float("nan")
+    return max(max(abs(int(u) - int(v)) for u, v in zip(a, b)) for a, b in pares)
+
+
+if __name__ == "__main__":
+    print(f"{'Resolucao':<11} {'Escala':<7} {'ms/frame':>9} {'speedup':>8} {'recall':>7} {'erro med/max (px)':>18} "
+          f"{'dif. max (px)':>14}")
+    for width, height in RESOLUTIONS:
+        cenas = gerar_cenas(width, height)
+        base_ms, base = None, None
+        for levels in LEVELS:
+            ms, deteccoes, recall = medir(cenas, levels)
+            if base is None:  # LEVELS[0] = 0, a resolução original é a referência
+                base_ms, base = ms, deteccoes
+            mediana, maximo = erro(deteccoes, cenas)
+            print(f"{width}x{height:<7} 1/{2 ** levels:<5} {ms:>9.2f} {base_ms / ms:>7.1f}x {recall:>7.1%} "
+                  f"{f'{mediana:.0f}/{maximo}':>18} {diferenca(deteccoes, base, cenas):>14}")
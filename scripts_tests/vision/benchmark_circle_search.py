@@ -0,0 +1,71 @@
+"""
+Compara a detecção de círculos do examples/folowCircle (houghCircleDetect + circleCannyDetect no frame
+inteiro) com a busca rastreada da CircleSearchWindow, em tempo e erro em relação à posição real da bola.
+Nos dois modos a posição final é a estimativa do CircleTracker.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.benchmark_circle_search
+"""
+import time
+import numpy as np
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.processing.processing_image import ProcessingImage
+from lib_rover.rover_lib.modules.vision.circleSearch import CircleSearchWindow
+from lib_rover.rover_lib.modules.vision.circleTracker import CircleTracker
+from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+
+SIZE = 640  # Máscara do color_dual_segmentation
+N_FRAMES = 120
+RADIUS = 70
+
+
+def trajetoria(i):
+    """Centro da bola no frame i: ida e volta na horizontal com oscilação vertical"""
+    fase = 2 * np.pi * i / N_FRAMES
+    return (SIZE / 2 + 200 * np.sin(fase), SIZE / 2 + 60 * np.sin(2 * fase))
+
+
+def gerar_mascaras():
+    """Máscaras segmentadas de uma bola vermelha em movimento e os centros reais"""
+    mascaras, centros = [], []
+    for i in range(N_FRAMES):
+        centro = trajetoria(i)
+        cena = SyntheticScene(SIZE, SIZE, balls=[{"center": centro, "radius": RADIUS}], noise=6.0, seed=i)
+        mascaras.append(ProcessingImage.color_dual_segmentation(cena.render()))
+        centros.append(centro)
+    return mascaras, centros
+
+
+def detectar(mascara, roi=None):
+    """Mesma escolha do examples/folowCircle: hough e contorno, prioridade ao contorno"""
+    hough, _ = VisionModule.houghCircleDetect(mascara, roi=roi)
+    contorno = VisionModule.circleCannyDetect(mascara, roi=roi)
+    return contorno if contorno is not None else hough
+
+
+def rodar(mascaras, centros, rastrear):
+    """Tempo médio (ms), fração de frames com detecção e erro médio do centro (px)"""
+    tracker = CircleTracker()
+    search = CircleSearchWindow(tracker, (SIZE, SIZE))
+    erros, tempos = [], []
+    for mascara, (cx, cy) in zip(mascaras, centros):
+        inicio = time.perf_counter()
+        tracker.predict()
+        roi = search.roi() if rastrear else None
+        det = tracker.correct(detectar(mascara, roi))
+        tempos.append(time.perf_counter() - inicio)
+        if det is not None:
+            erros.append(np.hypot(det[0] - cx, det[1] - cy))
+
+    deteccao = len(erros) / len(mascaras)
+    erro = float(np.mean(erros)) if erros else float("nan")
+    return np.mean(tempos[1:]) * 1000, deteccao, erro
+
+
+if __name__ == "__main__":
+    mascaras, centros = gerar_mascaras()
+
+    print(f"{'Modo':<20} {'ms/frame':>10} {'deteccao':>10} {'erro (px)':>10}")
+    for nome, rastrear in (("frame inteiro", False), ("rastreado", True)):
+        ms, deteccao, erro = rodar(mascaras, centros, rastrear)
+        print(f"{nome:<20} {ms:>10.2f} {deteccao:>10.1%} {erro:>10.1f}")
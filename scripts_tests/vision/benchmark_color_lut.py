@@ -0,0 +1,92 @@
+"""
+Compara a segmentação por cor do pipeline atual (cvtColor BGR2HSV + inRange por intervalo) com o
+ColorClassifier (uma consulta à tabela 3D para todas as classes), em tempo e concordância das máscaras.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.benchmark_color_lut [gravacao.raw]
+"""
+import sys
+import time
+import cv2
+import numpy as np
+from lib_rover.rover_lib.modules.camera.replayCamera import ReplayCamera
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.processing.colorClassifier import ColorClassifier
+from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+
+WIDTH, HEIGHT = 640, 480
+N_FRAMES = 200
+
+# Intervalos HSV usados hoje pela biblioteca
+CLASSES = {
+    "linha": [(VisionModule.LOWER_WHITE, VisionModule.UPPER_WHITE)],  # VisionModule.process_frame_for_line_following
+    "obstaculo": [((0, 100, 100), (10, 255, 255)), ((160, 100, 100), (180, 255, 255))],  # VisionModule.detect_obstacle
+    "bola": [((0, 120, 70), (10, 255, 255)), ((170, 120, 70), (180, 255, 255))],  # ProcessingImage.color_segmentation
+}
+
+CENA = SyntheticScene(
+    WIDTH, HEIGHT,
+    lines=[{"x": 0.5, "heading": 0.1, "curvature": 0.2, "thickness": 30}],
+    balls=[{"center": (160, 200), "radius": 50}],
+    obstacles=[{"rect": (420, 120, 80, 80)}],
+    noise=8.0,
+    lighting_variation=0.2,
+)
+
+
+def medir(etapa, n_frames=N_FRAMES):
+    """Tempo médio (ms) de etapa"""
+    etapa()  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(n_frames):
+        etapa()
+    return (time.perf_counter() - inicio) * 1000 / n_frames
+
+
+def hsv_inrange(frame, classes=CLASSES):
+    """Pipeline atual: uma conversão HSV e um inRange por intervalo"""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    masks = {}
+    for name, ranges in classes.items():
+        mask = cv2.inRange(hsv, np.array(ranges[0][0]), np.array(ranges[0][1]))
+        for lower, upper in ranges[1:]:
+            mask = cv2.bitwise_or(mask, cv2.inRange(hsv, np.array(lower), np.array(upper)))
+        masks[name] = mask
+    return masks
+
+
+def iou(a, b):
+    """Interseção sobre união de duas máscaras (1.0 se ambas vazias)"""
+    union = np.count_nonzero(a | b)
+    return np.count_nonzero(a & b) / union if union else 1.0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        camera = ReplayCamera(sys.argv[1])
+        frame = camera.get_frame()
+    else:
+        frame = CENA.render(0.0)
+
+    inicio = time.perf_counter()
+    ColorClassifier(CLASSES, cache_dir=None)
+    print(f"Construção da tabela 64³        : {(time.perf_counter() - inicio) * 1000:7.2f} ms")
+
+    ColorClassifier(CLASSES)  # Garante a tabela no cache
+    inicio = time.perf_counter()
+    classifier = ColorClassifier(CLASSES)
+    print(f"Carga da tabela do cache         : {(time.perf_counter() - inicio) * 1000:7.2f} ms\n")
+
+    print(f"Frame {frame.shape[1]}x{frame.shape[0]}")
+    print(f"  {'classes':<22} {'cvtColor + inRange':>20} {'ColorClassifier':>18}")
+    for name in CLASSES:
+        classe = {name: CLASSES[name]}
+        single = ColorClassifier(classe)
+        print(f"  {name:<22} {medir(lambda: hsv_inrange(frame, classe)):14.3f} ms {medir(lambda: single.masks(frame)):12.3f} ms")
+    print(f"  {'todas (' + str(len(CLASSES)) + ')':<22} {medir(lambda: hsv_inrange(frame)):14.3f} ms {medir(lambda: classifier.masks(frame)):12.3f} ms\n")
+
+    ref = hsv_inrange(frame)
+    lut = classifier.masks(frame)
+    print("Concordância com a conversão exata (IoU):")
+    for name in CLASSES:
+        print(f"  {name:<10} {iou(ref[name] > 0, lut[name] > 0):.4f}")
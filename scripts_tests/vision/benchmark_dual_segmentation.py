@@ -0,0 +1,61 @@
+"""
+Compara a segmentação dupla do ProcessingImage.color_dual_segmentation (duas segmentações completas, na
+imagem original e na escurecida) com a versão fundida (fused=True), em tempo e concordância das máscaras.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.benchmark_dual_segmentation
+"""
+import time
+import numpy as np
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.processing.processing_image import ProcessingImage
+
+WIDTH, HEIGHT = 640, 480
+N_SCENES = 30
+N_REPEAT = 10
+
+
+def gerar_cena(seed):
+    """Duas bolas em tons de vermelho variados, um obstáculo e iluminação aleatória"""
+    rng = np.random.default_rng(seed)
+    balls = [
+        {
+            "center": (int(rng.integers(80, WIDTH - 80)), int(rng.integers(80, HEIGHT - 80))),
+            "radius": int(rng.integers(30, 90)),
+            "color": (int(rng.integers(0, 60)), int(rng.integers(0, 80)), int(rng.integers(90, 255))),
+        }
+        for _ in range(2)
+    ]
+    cena = SyntheticScene(WIDTH, HEIGHT, balls=balls, obstacles=[{"rect": (50, 50, 80, 60), "color": (30, 60, 200)}],
+                          noise=8.0, lighting=float(rng.uniform(0.6, 1.4)), seed=seed)
+    return cena.render()
+
+
+def iou(a, b):
+    """Interseção sobre união de duas máscaras (1.0 se ambas vazias)"""
+    a, b = a > 127, b > 127
+    union = np.count_nonzero(a | b)
+    return 1.0 if union == 0 else np.count_nonzero(a & b) / union
+
+
+def medir(frame, fused):
+    """Tempo médio (ms) de uma segmentação"""
+    ProcessingImage.color_dual_segmentation(frame, fused=fused)  # aquecimento (e construção da tabela)
+    inicio = time.perf_counter()
+    for _ in range(N_REPEAT):
+        ProcessingImage.color_dual_segmentation(frame, fused=fused)
+    return (time.perf_counter() - inicio) * 1000 / N_REPEAT
+
+
+if __name__ == "__main__":
+    ious, dupla, fundida = [], [], []
+    for seed in range(N_SCENES):
+        frame = gerar_cena(seed)
+        ious.append(iou(ProcessingImage.color_dual_segmentation(frame),
+                        ProcessingImage.color_dual_segmentation(frame, fused=True)))
+        dupla.append(medir(frame, False))
+        fundida.append(medir(frame, True))
+
+    print(f"Segmentacao dupla:   {np.mean(dupla):6.2f} ms")
+    print(f"Segmentacao fundida: {np.mean(fundida):6.2f} ms ({np.mean(dupla) / np.mean(fundida):.1f}x)")
+    print(f"IoU das mascaras: media {np.mean(ious):.3f}, mediana {np.median(ious):.3f}, minimo {np.min(ious):.3f}")
@@ -0,0 +1,88 @@
+"""
+Compara a detecção de obstáculos anterior (máscaras somadas, findContours e geometria de cada contorno em
+Python) com a atual em cenas com cada vez mais objetos vermelhos pequenos: detect_obstacle (maior objeto,
+ainda por findContours) e detect_obstacles (todos os objetos, por componentes conectados).
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.benchmark_obstacles
+"""
+import time
+import cv2
+import numpy as np
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+
+WIDTH, HEIGHT = 640, 480
+N_CLUTTER = [0, 50, 200, 800, 2000]
+N_REPEAT = 30
+
+
+def cena_poluida(n_objetos, seed=0):
+    """Um obstáculo grande e n_objetos quadrados vermelhos pequenos espalhados"""
+    rng = np.random.default_rng(seed)
+    obstacles = [{"rect": (250, 150, 140, 120)}]
+    for _ in range(n_objetos):
+        lado = int(rng.integers(6, 14))
+        obstacles.append({"rect": (int(rng.integers(0, WIDTH - lado)), int(rng.integers(0, HEIGHT - lado)), lado, lado)})
+    return SyntheticScene(WIDTH, HEIGHT, obstacles=obstacles, noise=6.0, seed=seed).render()
+
+
+def legado(frame, min_area_threshold=5000):
+    """Implementação anterior do detect_obstacle, sem as marcações de debug"""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    mask1 = cv2.inRange(hsv, np.array([0, 100, 100]), np.array([10, 255, 255]))
+    mask2 = cv2.inRange(hsv, np.array([160, 100, 100]), np.array([180, 255, 255]))
+    mask = mask1 + mask2
+    mask = cv2.erode(mask, None, iterations=2)
+    mask = cv2.dilate(mask, None, iterations=2)
+
+    contours, _ = cv2.findContours(mask.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if len(contours) > 0:
+        c = max(contours, key=cv2.contourArea)
+        if cv2.contourArea(c) > min_area_threshold:
+            return True, cv2.boundingRect(c), len(contours)
+    return False, None, len(contours)
+
+
+def legado_todos(frame, min_area_threshold=50):
+    """Todos os objetos com o método anterior: geometria de cada contorno em Python"""
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv, np.array([0, 100, 100]), np.array([10, 255, 255])) + \
+        cv2.inRange(hsv, np.array([160, 100, 100]), np.array([180, 255, 255]))
+    mask = cv2.dilate(cv2.erode(mask, None, iterations=2), None, iterations=2)
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    blobs = []
+    for c in contours:
+        area = cv2.contourArea(c)
+        if area > min_area_threshold:
+            M = cv2.moments(c)
+            blobs.append((cv2.boundingRect(c), area, (M["m10"] / M["m00"], M["m01"] / M["m00"])))
+    return sorted(blobs, key=lambda b: -b[1])
+
+
+def medir(etapa):
+    """Tempo médio (ms) de etapa"""
+    etapa()  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(N_REPEAT):
+        etapa()
+    return (time.perf_counter() - inicio) * 1000 / N_REPEAT
+
+
+if __name__ == "__main__":
+    vision = VisionModule((WIDTH, HEIGHT), headless=True)
+
+    print("Maior objeto (detect_obstacle) e todos os objetos com area > 50 (detect_obstacles), em ms")
+    print(f"{'Objetos':>8} {'contornos':>10} {'maior leg.':>11} {'maior atual':>12} {'todos leg.':>11} {'todos atual':>12} {'mesma bbox':>11}")
+    for n in N_CLUTTER:
+        frame = cena_poluida(n)
+        _, bbox_legado, n_contornos = legado(frame)
+        vision.detect_obstacle(frame)
+
+        t_legado = medir(lambda: legado(frame))
+        t_atual = medir(lambda: vision.detect_obstacle(frame))
+        t_todos_legado = medir(lambda: legado_todos(frame))
+        t_todos = medir(lambda: vision.detect_obstacles(frame, min_area_threshold=50))
+        print(f"{n:>8} {n_contornos:>10} {t_legado:>11.2f} {t_atual:>12.2f} {t_todos_legado:>11.2f} {t_todos:>12.2f} "
+              f"{str(bbox_legado == vision.last_obstacle['bbox']):>11}")
@@ -0,0 +1,55 @@
+"""
+Gera a vista de cima (BirdEyeView) de um frame e compara o seguidor de linha na imagem e na grade de cima.
+
+Os pontos de origem são os cantos, na imagem, de um retângulo marcado no chão (ex: fita no piso) com as
+dimensões de CHAO. Meça-os em um frame salvo com scripts_tests/camera/captura_imagem_salvar.py.
+
+Uso (a partir da raiz do repositório):
+    python3 -m scripts_tests.vision.bird_eye_demo [gravacao.raw]
+"""
+import sys
+import time
+import cv2
+from lib_rover.rover_lib.modules.camera.replayCamera import ReplayCamera
+from lib_rover.rover_lib.modules.camera.syntheticScene import SyntheticScene
+from lib_rover.rover_lib.modules.vision.birdEye import BirdEyeView
+from lib_rover.rover_lib.modules.vision.visionModule import VisionModule
+
+WIDTH, HEIGHT = 640, 480
+
+# Cantos do retângulo no chão: inferior esquerdo, inferior direito, superior direito, superior esquerdo
+PONTOS_IMAGEM = [(40, 470), (600, 470), (420, 300), (220, 300)]
+CHAO = (0.40, 0.50)  # largura e profundidade do retângulo em metros
+PIXELS_POR_METRO = 200
+
+CENA = SyntheticScene(WIDTH, HEIGHT, lines=[{"x": 0.5, "heading": 0.1, "curvature": 0.2, "thickness": 30}], noise=8.0)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        frame = ReplayCamera(sys.argv[1]).get_frame()
+        HEIGHT, WIDTH = frame.shape[:2]
+    else:
+        frame = CENA.render(0.0)
+
+    inicio = time.perf_counter()
+    bird_eye = BirdEyeView(PONTOS_IMAGEM, CHAO, (WIDTH, HEIGHT), pixels_per_meter=PIXELS_POR_METRO)
+    print(f"Mapas carregados/calculados em {(time.perf_counter() - inicio) * 1000:.2f} ms, grade {bird_eye.size[0]}x{bird_eye.size[1]}")
+
+    n = 500
+    inicio = time.perf_counter()
+    for _ in range(n):
+        bird_eye.apply(frame)
+    print(f"remap da faixa a partir da linha {bird_eye.roi_start_y}: {(time.perf_counter() - inicio) * 1000 / n:.3f} ms/frame")
+
+    imagem = VisionModule((WIDTH, HEIGHT))
+    cima = VisionModule((WIDTH, HEIGHT), bird_eye=bird_eye)
+
+    desvio, frame_imagem = imagem.process_frame_for_line_following(frame)
+    print(f"Desvio na imagem         : {desvio:+.3f}")
+    desvio, angulo, curvatura, frame_cima = cima.process_frame_for_line_bands(frame)
+    lateral, _ = bird_eye.to_ground(cima.last_line["centroid"][0], 0) if cima.last_line["centroid"] else (0.0, 0.0)
+    print(f"Desvio na vista de cima  : {desvio:+.3f} ({lateral * 100:+.1f} cm), ângulo {angulo:+.3f} rad, curvatura {curvatura:+.3f}")
+
+    cv2.imwrite("bird_eye_imagem.jpg", frame_imagem)
+    cv2.imwrite("bird_eye_cima.jpg", frame_cima)
+    print("Frames salvos em bird_eye_imagem.jpg e bird_eye_cima.jpg")